@@ -3,30 +3,54 @@ import json
 import os
 from models.user import User
 from models.recommender import AIInternshipRecommender
+from models.recommendation_store import RecommendationStore
+from models.catalog_query import CatalogQuery
+from models.capacity import CapacityTracker
+from models.candidate import profile_to_candidate
+from models.catalog import CatalogService
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'pm-internship-scheme-2024'
 
-# Initialize user management
-user_manager = User()
+# Shared internship catalog, reloaded when data/internships.json changes
+catalog = CatalogService(fallback=lambda: AIInternshipRecommender._create_enhanced_sample_data(None))
 
-# Initialize AI-based recommender
-ai_recommender = AIInternshipRecommender()
+# Live application and fill counters, shared by user management and the recommender; fills
+# take their quota bucket from the catalog
+capacity = CapacityTracker(catalog=catalog)
 
-# Load internship data (for explore, etc.)
-def load_internships():
-    with open('data/internships.json', 'r') as f:
-        return json.load(f)
+# Initialize user management; this seeds the counters from existing applications before the
+# recommender's warm-up copies them
+user_manager = User(capacity=capacity)
+
+# Initialize AI-based recommender; the model loads (or trains) on a background thread and
+# recommendations are rule-based until it is ready
+ai_recommender = AIInternshipRecommender(background=True, capacity=capacity, catalog=catalog)
+
+# Recommendations precomputed nightly by precompute_recommendations.py
+recommendation_store = RecommendationStore()
+
+# Query engine over the current catalog snapshot, rebuilt when the catalog reloads
+_catalog_query = None
+
+def get_catalog_query():
+    global _catalog_query
+    snapshot = catalog.snapshot()
+    query = _catalog_query
+    if query is None or query.snapshot is not snapshot:
+        query = _catalog_query = CatalogQuery(snapshot)
+    return query
+
+def _invalidate_replaced_profile(email, previous_profile, profile):
+    """Drop recommendations cached for a profile being replaced, whoever updates it"""
+    if previous_profile:
+        ai_recommender.invalidate_candidate(profile_to_candidate(previous_profile))
+
+user_manager.on_profile_update(_invalidate_replaced_profile)
 
 # Use AI-based recommender for all recommendations
 def get_internship_recommendations(candidate_data):
-    # Convert skills to list if string
-    skills = candidate_data.get('skills', '')
-    if isinstance(skills, str):
-        skills = [s.strip() for s in skills.split(',') if s.strip()]
-    candidate_data = candidate_data.copy()
-    candidate_data['skills'] = skills
-    return ai_recommender.get_ai_recommendations(candidate_data)
+    return ai_recommender.get_ai_recommendations(profile_to_candidate(candidate_data))
 
 def get_available_sectors():
     return ai_recommender.get_available_sectors()
@@ -56,7 +80,13 @@ def dashboard():
     # Get recommendations if profile is complete
     recommendations = []
     if user.get('profile_complete'):
-        recommendations = get_internship_recommendations(user['profile'])
+        # Prefer the nightly precomputed result; score live if it is missing or stale (profile,
+        # catalog or model changed since, or a recommended posting has filled up)
+        recommendations = recommendation_store.get(session['user_email'], RecommendationStore.profile_stamp(user),
+                                                   ai_recommender.get_internship, ai_recommender.serving_versions(),
+                                                   ai_recommender.get_available_positions)
+        if recommendations is None:
+            recommendations = get_internship_recommendations(user['profile'])
     
     # Hardcoded platform statistics for demo
     platform_stats = {
@@ -133,8 +163,10 @@ def explore():
     if 'user_email' not in session:
         return redirect(url_for('login'))
     
-    internships = load_internships()
-    return render_template('explore.html', internships=internships)
+    # Only the first page is rendered; filters, sorting and further pages come from /api/internships
+    page = get_catalog_query().query(limit=EXPLORE_PAGE_SIZE)
+    return render_template('explore.html', internships=page['internships'], page=page,
+                           page_size=EXPLORE_PAGE_SIZE)
 
 @app.route('/applications')
 def applications():
@@ -297,6 +329,80 @@ def api_save():
             'error': str(e)
         }), 500
 
+# Page sizes for catalog browsing
+EXPLORE_PAGE_SIZE = 9
+MAX_CATALOG_PAGE_SIZE = 100
+
+def _optional_float(name):
+    """Float query parameter, None when absent or empty"""
+    value = request.args.get(name, '')
+    return float(value) if value != '' else None
+
+@app.route('/api/internships', methods=['GET'])
+def api_internships():
+    """Filter, sort and page the internship catalog with facet counts"""
+    try:
+        limit = request.args.get('limit', EXPLORE_PAGE_SIZE, type=int)
+        if limit < 1 or limit > MAX_CATALOG_PAGE_SIZE:
+            return jsonify({'error': f'limit must be between 1 and {MAX_CATALOG_PAGE_SIZE}'}), 400
+        
+        filters = {facet: [value for value in request.args.getlist(facet) if value]
+                   for facet in CatalogQuery.FACETS}
+        try:
+            page = get_catalog_query().query(
+                q=request.args.get('q'),
+                filters=filters,
+                min_stipend=_optional_float('min_stipend'),
+                max_stipend=_optional_float('max_stipend'),
+                sort=request.args.get('sort', 'relevance'),
+                limit=limit,
+                cursor=request.args.get('cursor') or None
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        response = {'success': True}
+        response.update(page)
+        return jsonify(response)
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+MAX_SEARCH_RESULTS = 100
+
+@app.route('/api/search', methods=['GET'])
+def api_search():
+    """Full-text internship search"""
+    try:
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'error': 'Missing search query q'}), 400
+        
+        k = request.args.get('k', 10, type=int)
+        if k < 1 or k > MAX_SEARCH_RESULTS:
+            return jsonify({'error': f'k must be between 1 and {MAX_SEARCH_RESULTS}'}), 400
+        
+        results = ai_recommender.search_internships(
+            query, k=k,
+            sector=request.args.get('sector') or None,
+            location=request.args.get('location') or None
+        )
+        return jsonify({
+            'success': True,
+            'query': query,
+            'results': results,
+            'total_count': len(results)
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @app.route('/api/sectors', methods=['GET'])
 def get_sectors():
     """API endpoint to get available sectors"""
@@ -327,58 +433,140 @@ def get_locations():
             'error': str(e)
         }), 500
 
+# Limits shared by the AI matching endpoints
+MAX_PAGE_SIZE = 100
+MAX_BATCH_CANDIDATES = 1000
+
+def _validate_ai_candidate(candidate_data):
+    """Validate AI matching input and fill defaults; returns an error message or None"""
+    if not candidate_data or not isinstance(candidate_data, dict):
+        return 'No candidate data provided'
+    
+    # Enhanced validation for AI matching
+    required_fields = ['skills', 'education']
+    for field in required_fields:
+        if field not in candidate_data:
+            return f'Missing required field: {field}'
+    
+    # Field types the matching pipeline compares as text
+    skills = candidate_data['skills']
+    if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+        return 'skills must be a list of strings'
+    for field in ('education', 'location', 'sector'):
+        if field in candidate_data and not isinstance(candidate_data[field], str):
+            return f'{field} must be a string'
+    
+    # Set default values for optional AI features
+    candidate_data.setdefault('social_category', 'General')
+    candidate_data.setdefault('district_type', 'Urban')
+    candidate_data.setdefault('past_participation', False)
+    candidate_data.setdefault('expected_stipend', 15000)
+    candidate_data.setdefault('experience_months', 0)
+    candidate_data.setdefault('certifications', [])
+    candidate_data.setdefault('cgpa', 7.0)
+    return None
+
+def _paging_args():
+    """Read k/offset paging parameters from the query string"""
+    k = request.args.get('k', 5, type=int)
+    offset = request.args.get('offset', 0, type=int)
+    if k < 1 or k > MAX_PAGE_SIZE or offset < 0:
+        return None, None, f'k must be between 1 and {MAX_PAGE_SIZE} and offset must be non-negative'
+    return k, offset, None
+
+def _format_ai_page(page):
+    """Format one page of AI recommendations with matching details"""
+    formatted_recommendations = []
+    for rec in page['recommendations']:
+        formatted_rec = rec.copy()
+        formatted_rec['matching_details'] = {
+            'ai_match_score': rec.get('ai_match_score', 0),
+            'rule_based_score': rec.get('rule_score', 0),
+            'affirmative_action_applied': rec.get('affirmative_action_priority', 0) > 0,
+            'available_positions': rec.get('available_positions', 0),
+            'capacity_utilization': rec.get('capacity_utilization', 0)
+        }
+        formatted_recommendations.append(formatted_rec)
+    
+    return {
+        'ai_recommendations': formatted_recommendations,
+        'total_matches': len(formatted_recommendations),
+        'offset': page['offset'],
+        'k': page['k'],
+        'total_available': page['total'],
+        'has_more': page['has_more'],
+        'next_offset': page['offset'] + page['k'] if page['has_more'] else None,
+        'scoring': 'ai' if ai_recommender.model_ready else 'rule_based'
+    }
+
+AI_MATCHING_FEATURES = [
+    'Skills-based matching',
+    'Affirmative action consideration', 
+    'Capacity constraint checking',
+    'Diversity optimization',
+    'Machine learning scoring'
+]
+
 @app.route('/api/ai-match', methods=['POST'])
 def ai_match_internships():
     """AI-Based Smart Allocation API endpoint"""
     try:
         candidate_data = request.get_json()
         
-        if not candidate_data:
-            return jsonify({'error': 'No candidate data provided'}), 400
+        error = _validate_ai_candidate(candidate_data)
+        if error:
+            return jsonify({'error': error}), 400
         
-        # Enhanced validation for AI matching
-        required_fields = ['skills', 'education']
-        for field in required_fields:
-            if field not in candidate_data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
-        
-        # Set default values for optional AI features
-        candidate_data.setdefault('social_category', 'General')
-        candidate_data.setdefault('district_type', 'Urban')
-        candidate_data.setdefault('past_participation', False)
-        candidate_data.setdefault('expected_stipend', 15000)
-        candidate_data.setdefault('experience_months', 0)
-        candidate_data.setdefault('certifications', [])
-        candidate_data.setdefault('cgpa', 7.0)
+        # Paging ("show more") - follow-up pages reuse the recently scored result
+        k, offset, error = _paging_args()
+        if error:
+            return jsonify({'error': error}), 400
         
         # Get AI-based recommendations
-        ai_recommendations = ai_recommender.get_ai_recommendations(candidate_data)
-        
-        # Format response with AI matching details
-        formatted_recommendations = []
-        for rec in ai_recommendations:
-            formatted_rec = rec.copy()
-            formatted_rec['matching_details'] = {
-                'ai_match_score': rec.get('ai_match_score', 0),
-                'rule_based_score': rec.get('rule_score', 0),
-                'affirmative_action_applied': rec.get('affirmative_action_priority', 0) > 0,
-                'available_positions': rec.get('available_positions', 0),
-                'capacity_utilization': rec.get('capacity_utilization', 0)
-            }
-            formatted_recommendations.append(formatted_rec)
+        page = ai_recommender.get_ai_recommendation_page(candidate_data, k=k, offset=offset)
+        
+        response = {'success': True}
+        response.update(_format_ai_page(page))
+        response['matching_algorithm'] = 'AI-Based Smart Allocation Engine'
+        response['features_applied'] = AI_MATCHING_FEATURES
+        return jsonify(response)
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/ai-match/batch', methods=['POST'])
+def ai_match_internships_batch():
+    """Bulk AI matching for a cohort of candidates"""
+    try:
+        data = request.get_json()
+        candidates = data.get('candidates') if isinstance(data, dict) else None
+        
+        if not isinstance(candidates, list) or not candidates:
+            return jsonify({'error': 'No candidates provided'}), 400
+        if len(candidates) > MAX_BATCH_CANDIDATES:
+            return jsonify({'error': f'At most {MAX_BATCH_CANDIDATES} candidates per batch'}), 400
+        
+        for index, candidate_data in enumerate(candidates):
+            error = _validate_ai_candidate(candidate_data)
+            if error:
+                return jsonify({'error': f'Candidate {index}: {error}'}), 400
+        
+        k, offset, error = _paging_args()
+        if error:
+            return jsonify({'error': error}), 400
+        
+        # Get AI-based recommendations for the whole cohort
+        pages = ai_recommender.get_ai_recommendation_page_batch(candidates, k=k, offset=offset)
         
         return jsonify({
             'success': True,
-            'ai_recommendations': formatted_recommendations,
-            'total_matches': len(formatted_recommendations),
+            'results': [_format_ai_page(page) for page in pages],
+            'total_candidates': len(pages),
             'matching_algorithm': 'AI-Based Smart Allocation Engine',
-            'features_applied': [
-                'Skills-based matching',
-                'Affirmative action consideration', 
-                'Capacity constraint checking',
-                'Diversity optimization',
-                'Machine learning scoring'
-            ]
+            'features_applied': AI_MATCHING_FEATURES
         })
         
     except Exception as e:
@@ -387,6 +575,27 @@ def ai_match_internships():
             'error': str(e)
         }), 500
 
+@app.route('/api/ai-match/cache-stats', methods=['GET'])
+def ai_match_cache_stats():
+    """Recommendation cache hit/miss counters"""
+    return jsonify({'success': True, 'cache': ai_recommender.cache_stats()})
+
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    """Liveness: the process is up and serving requests"""
+    return jsonify({'status': 'ok'})
+
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    """
+    Readiness: 200 once recommendations can be served (rule-based until the model is ready)
+
+    A model stage that failed reports 'degraded': requests are still served, rule-based only.
+    """
+    warmup = ai_recommender.warmup_status()
+    ready = warmup['catalog_ready']
+    return jsonify({'status': warmup['readiness'], 'warmup': warmup}), 200 if ready else 503
+
 @app.route('/mobile-demo')
 def mobile_demo():
     """Mobile compatibility demonstration page"""
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Compare memory use and scan speed of the list-of-dicts and columnar catalog layouts
+
+Builds N synthetic postings (see models/synthetic_catalog.py). Each posting is parsed from
+JSON, with keys shared the way json.load shares them, so the dict layout looks exactly like a
+loaded data/internships.json. The postings are then converted to a ColumnarCatalog. Heap sizes
+are traced with tracemalloc. Scans run the same query over both layouts:
+
+- filter: sector, minimum stipend and open positions
+- skill: postings requiring a skill
+- aggregate: open positions per sector
+- rows: materializing 1,000 postings as dicts (what a page of results costs)
+
+Usage:
+    python benchmark_catalog_layout.py [--postings 1000000] [--repeat 3]
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from models.columnar_catalog import ColumnarCatalog, numeric_field
+from models.recommender import AIInternshipRecommender
+from models.synthetic_catalog import SyntheticCatalog
+
+
+def synthetic_postings(sample, postings: int, seed: int = 42):
+    keys = {}
+    catalog = []
+    for posting in SyntheticCatalog(sample, seed=seed).postings(postings):
+        # Fresh value objects per posting, shared key strings, as json.load produces
+        parsed = json.loads(json.dumps(posting, ensure_ascii=False))
+        catalog.append({keys.setdefault(key, key): value for key, value in parsed.items()})
+    return catalog
+
+
+def traced(build):
+    """(result, bytes the result holds) of a build function"""
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    return result, tracemalloc.get_traced_memory()[0] - before
+
+
+def best_time(run, repeat: int):
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def dict_scans(internships, sector, min_stipend, skill):
+    return {
+        'filter': lambda: sum(1 for i in internships if i.get('sector') == sector and i.get('stipend_amount', 0) >= min_stipend
+                              and i.get('opportunities', 0) - i.get('filled_positions', 0) > 0),
+        'skill': lambda: sum(1 for i in internships if skill in i.get('skills_required', [])),
+        'aggregate': lambda: _dict_open_positions(internships),
+        'rows': lambda: len([dict(internships[row]) for row in range(0, len(internships), max(1, len(internships) // 1000))]),
+    }
+
+
+def _dict_open_positions(internships):
+    totals = {}
+    for i in internships:
+        totals[i.get('sector')] = totals.get(i.get('sector'), 0) + i.get('opportunities', 0) - i.get('filled_positions', 0)
+    return totals
+
+
+def columnar_scans(catalog, sector, min_stipend, skill):
+    sectors, skills = catalog.column('sector'), catalog.column('skills_required')
+    stipend = numeric_field(catalog, 'stipend_amount', 0)
+    open_positions = numeric_field(catalog, 'opportunities', 0) - numeric_field(catalog, 'filled_positions', 0)
+
+    def filter_scan():
+        sector_code = sectors.values.index(sector)
+        return int(np.count_nonzero((sectors.codes == sector_code) & (stipend >= min_stipend) & (open_positions > 0)))
+
+    def skill_scan():
+        hits = np.flatnonzero(skills.indices == skills.values.index(skill))
+        return len(np.unique(np.searchsorted(skills.indptr, hits, side='right') - 1))
+
+    def aggregate_scan():
+        totals = np.bincount(sectors.codes, weights=open_positions, minlength=len(sectors.values))
+        return {value: int(total) for value, total in zip(sectors.values, totals)}
+
+    return {
+        'filter': filter_scan,
+        'skill': skill_scan,
+        'aggregate': aggregate_scan,
+        'rows': lambda: len([catalog[row].copy() for row in range(0, len(catalog), max(1, len(catalog) // 1000))]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare list-of-dicts and columnar catalog memory and scan speed')
+    parser.add_argument('--postings', type=int, default=1_000_000, help='Synthetic catalog size')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per scan (fastest is reported)')
+    args = parser.parse_args()
+
+    sample = AIInternshipRecommender._create_enhanced_sample_data(None)
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    internships, dict_bytes = traced(lambda: synthetic_postings(sample, args.postings))
+    print(f"Generated {len(internships):,} postings in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    catalog = ColumnarCatalog(internships)
+    build_seconds = time.perf_counter() - started
+    # What the columnar catalog holds on its own once the dicts are gone (including values it shares with them)
+    del internships
+    gc.collect()
+    columnar_bytes = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    print(f"Memory: dicts {dict_bytes / 2**20:,.0f} MiB ({dict_bytes / len(catalog):,.0f} B/posting), "
+          f"columnar {columnar_bytes / 2**20:,.0f} MiB ({columnar_bytes / len(catalog):,.0f} B/posting), "
+          f"{dict_bytes / max(columnar_bytes, 1):.1f}x smaller; columnar build {build_seconds:.1f}s")
+
+    internships = synthetic_postings(sample, args.postings)
+    assert catalog[len(catalog) // 2] == internships[len(internships) // 2]
+    sector, min_stipend, skill = 'Information Technology', 30000, 'Python'
+    dict_runs = dict_scans(internships, sector, min_stipend, skill)
+    columnar_runs = columnar_scans(catalog, sector, min_stipend, skill)
+    print(f"{'scan':>10} {'dicts ms':>10} {'columnar ms':>12} {'speedup':>8}")
+    for name in dict_runs:
+        dict_seconds, dict_result = best_time(dict_runs[name], args.repeat)
+        columnar_seconds, columnar_result = best_time(columnar_runs[name], args.repeat)
+        if dict_result != columnar_result:
+            print(f"Mismatch in {name} scan: {dict_result!r} != {columnar_result!r}", file=sys.stderr)
+        print(f"{name:>10} {dict_seconds * 1000:10.1f} {columnar_seconds * 1000:12.1f} {dict_seconds / columnar_seconds:7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Measure per-request allocations of the recommendation pipeline on a large catalog
+
+Scores one candidate against an N-posting synthetic catalog (see models/synthetic_catalog.py)
+two ways and reports Python heap usage traced with tracemalloc:
+
+- dicts: the per-stage dict path (affirmative action filter, capacity filter and scoring each
+  copy every posting, and diversity runs over the scored dicts)
+- records: the serving path, which carries ScoreRecords columns through every stage and
+  builds dicts only for the returned page
+
+"peak" is the highest traced heap during the request and "retained" is what the ranked
+result still holds afterwards (what the result cache keeps).
+
+Usage:
+    python benchmark_pipeline_memory.py [--postings 50000] [--k 5] [--repeat 3]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from models.recommender import AIInternshipRecommender
+from models.synthetic_catalog import SyntheticCatalog
+
+
+CANDIDATE = {"skills": ["Python", "SQL", "Excel"], "education": "BTech", "sector": "Information Technology",
+             "location": "Bangalore", "social_category": "OBC", "district_type": "Rural"}
+
+
+def dict_pipeline(recommender, candidate, k):
+    eligible = recommender._apply_affirmative_action_filters(candidate)
+    available = recommender._check_capacity_constraints(eligible)
+    scored = recommender._ai_match_and_score(candidate, available)
+    return scored, recommender._apply_diversity_adjustments(scored, candidate, limit=k)
+
+
+def record_pipeline(recommender, candidate, k):
+    ranked = recommender._score_and_rank(candidate)
+    return ranked, recommender._page_ranked(ranked, k, 0)
+
+
+def measure(run, repeat):
+    best = None
+    for _ in range(repeat):
+        tracemalloc.start()
+        started = time.perf_counter()
+        result = run()
+        seconds = time.perf_counter() - started
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del result
+        if best is None or seconds < best[0]:
+            best = (seconds, peak, retained)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare pipeline allocations of dict and ScoreRecords scoring')
+    parser.add_argument('--postings', type=int, default=50000, help='Synthetic catalog size')
+    parser.add_argument('--k', type=int, default=5, help='Recommendations returned')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per pipeline (fastest is reported)')
+    args = parser.parse_args()
+
+    recommender = AIInternshipRecommender(retrieval_limit=None)
+    recommender._prepare_data(list(SyntheticCatalog(recommender.internships_data).postings(args.postings)))
+    print(f"Catalog: {len(recommender.internships_data)} postings, scoring the whole catalog per request")
+
+    results = {
+        'dicts': measure(lambda: dict_pipeline(recommender, CANDIDATE, args.k), args.repeat),
+        'records': measure(lambda: record_pipeline(recommender, CANDIDATE, args.k), args.repeat),
+    }
+    for name, (seconds, peak, retained) in results.items():
+        print(f"{name:>8}: {seconds * 1000:8.1f} ms  peak {peak / 2**20:8.1f} MiB  retained {retained / 2**20:8.1f} MiB")
+
+    dicts, records = results['dicts'], results['records']
+    print(f"Reduction: peak {dicts[1] / max(records[1], 1):.1f}x, retained {dicts[2] / max(records[2], 1):.1f}x, "
+          f"time {dicts[0] / max(records[0], 1e-9):.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Benchmark the recommender on synthetic catalogs and candidate populations
+
+For each catalog size, a worker process does the following:
+- writes a SyntheticCatalog to a scratch directory and switches into it, so no artifacts are
+  shared with data/ or with other sizes;
+- times the cold start of AIInternshipRecommender(), from an empty artifact store until the
+  model is ready;
+- times get_ai_recommendations for each candidate with the result cache cleared (p50 / p95 /
+  p99), plus the cache-hit latency;
+- times get_ai_recommendations_batch over the whole candidate population;
+- records peak RSS;
+- finally times a warm start that reuses the saved artifacts.
+
+Each size runs in its own process, so peak RSS covers that size alone. The results are
+written as JSON, with the commit, environment and parameters, so runs can be compared across
+commits with --compare.
+
+Usage:
+    python benchmark_recommender.py [--postings 1000 10000 100000] [--candidates 200] [--k 5]
+                                    [--output benchmark.json] [--compare previous.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+
+SCHEMA_VERSION = 1
+
+# Metrics printed by --compare: (result path, label, lower is better)
+COMPARED_METRICS = (
+    (('cold_start_seconds',), 'cold start s', True),
+    (('warm_start_seconds',), 'warm start s', True),
+    (('latency_ms', 'p50'), 'p50 ms', True),
+    (('latency_ms', 'p95'), 'p95 ms', True),
+    (('latency_ms', 'p99'), 'p99 ms', True),
+    (('batch', 'candidates_per_second'), 'batch cand/s', False),
+    (('peak_rss_mb',), 'peak RSS MB', True),
+)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def percentiles(samples_ms) -> dict:
+    samples = np.asarray(samples_ms, dtype=float)
+    return {
+        'n': int(len(samples)),
+        'mean': round(float(samples.mean()), 3),
+        'p50': round(float(np.percentile(samples, 50)), 3),
+        'p95': round(float(np.percentile(samples, 95)), 3),
+        'p99': round(float(np.percentile(samples, 99)), 3),
+        'max': round(float(samples.max()), 3),
+    }
+
+
+def run_worker(args) -> dict:
+    """Benchmark one catalog size in this process"""
+    from models.catalog import CatalogService
+    from models.recommender import AIInternshipRecommender
+    from models.synthetic_catalog import SyntheticCatalog
+
+    generator = SyntheticCatalog(AIInternshipRecommender._create_enhanced_sample_data(None), seed=args.seed)
+    os.chdir(args.workdir)
+    started = time.perf_counter()
+    generator.write(os.path.join('data', 'internships.json'), args.postings)
+    write_seconds = time.perf_counter() - started
+    candidates = generator.candidates(args.candidates)
+
+    started = time.perf_counter()
+    recommender = AIInternshipRecommender(catalog=CatalogService(check_interval=3600))
+    recommender.wait_until_ready()
+    cold_start_seconds = time.perf_counter() - started
+    rss_after_start = peak_rss_mb()
+
+    latencies = []
+    for candidate in candidates:
+        recommender._scored_cache.clear()
+        started = time.perf_counter()
+        recommender.get_ai_recommendations(candidate, k=args.k)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    cached = []
+    for candidate in candidates:
+        recommender.get_ai_recommendations(candidate, k=args.k)  # Fill the cache entry, then time a hit
+        started = time.perf_counter()
+        recommender.get_ai_recommendations(candidate, k=args.k)
+        cached.append((time.perf_counter() - started) * 1000)
+
+    recommender._scored_cache.clear()
+    started = time.perf_counter()
+    recommender.get_ai_recommendations_batch(candidates, k=args.k)
+    batch_seconds = time.perf_counter() - started
+    peak = peak_rss_mb()
+
+    del recommender
+    started = time.perf_counter()
+    AIInternshipRecommender(catalog=CatalogService(check_interval=3600)).wait_until_ready()
+    warm_start_seconds = time.perf_counter() - started
+
+    return {
+        'postings': args.postings,
+        'candidates': len(candidates),
+        'catalog_write_seconds': round(write_seconds, 3),
+        'cold_start_seconds': round(cold_start_seconds, 3),
+        'warm_start_seconds': round(warm_start_seconds, 3),
+        'latency_ms': percentiles(latencies),
+        'cached_latency_ms': percentiles(cached),
+        'batch': {
+            'candidates': len(candidates),
+            'seconds': round(batch_seconds, 3),
+            'candidates_per_second': round(len(candidates) / batch_seconds, 1) if batch_seconds > 0 else None,
+        },
+        'rss_after_start_mb': round(rss_after_start, 1),
+        'peak_rss_mb': round(peak, 1),
+    }
+
+
+def environment() -> dict:
+    import sklearn
+    repo = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=repo, capture_output=True, text=True,
+                                check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=repo,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        commit, dirty = None, None
+    return {
+        'commit': commit,
+        'dirty': dirty,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'sklearn': sklearn.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(results: dict, baseline: dict):
+    """Print each metric next to the baseline run of the same catalog size"""
+    previous = {run['postings']: run for run in baseline.get('runs', [])}
+    print(f"Compared with {baseline.get('environment', {}).get('commit') or 'baseline'}", file=sys.stderr)
+    for run in results['runs']:
+        old = previous.get(run['postings'])
+        if old is None:
+            continue
+        print(f"\n{run['postings']:,} postings", file=sys.stderr)
+        for path, label, lower_is_better in COMPARED_METRICS:
+            new_value, old_value = run, old
+            for key in path:
+                new_value, old_value = (new_value or {}).get(key), (old_value or {}).get(key)
+            if not new_value or not old_value:
+                continue
+            change = (new_value - old_value) / old_value * 100
+            better = change < 0 if lower_is_better else change > 0
+            print(f"  {label:>14}: {old_value:>10} -> {new_value:>10} ({change:+.1f}%{' better' if better and change else ''})",
+                  file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark cold start, latency, throughput and memory of the recommender')
+    parser.add_argument('--postings', type=int, nargs='+', default=[1000, 10000, 100000], help='Catalog sizes (up to 1M)')
+    parser.add_argument('--candidates', type=int, default=200, help='Candidate population size')
+    parser.add_argument('--k', type=int, default=5, help='Recommendations per request')
+    parser.add_argument('--seed', type=int, default=42, help='Generator seed')
+    parser.add_argument('--output', default=None, help='Write results JSON here (default: stdout)')
+    parser.add_argument('--compare', default=None, help='Previous results JSON to compare against')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        args.postings = args.postings[0]
+        print(json.dumps(run_worker(args)))
+        return
+
+    runs = []
+    for postings in args.postings:
+        with tempfile.TemporaryDirectory(prefix='recommender-benchmark-') as workdir:
+            print(f"Benchmarking {postings:,} postings...", file=sys.stderr)
+            command = [sys.executable, os.path.abspath(__file__), '--worker', '--workdir', workdir,
+                       '--postings', str(postings), '--candidates', str(args.candidates),
+                       '--k', str(args.k), '--seed', str(args.seed)]
+            completed = subprocess.run(command, capture_output=True, text=True)
+            if completed.returncode != 0:
+                print(f"Error benchmarking {postings} postings:\n{completed.stderr}", file=sys.stderr)
+                continue
+            run = json.loads(completed.stdout.strip().splitlines()[-1])
+            print(f"  cold start {run['cold_start_seconds']}s, p50 {run['latency_ms']['p50']} ms, "
+                  f"p99 {run['latency_ms']['p99']} ms, {run['batch']['candidates_per_second']} cand/s, "
+                  f"peak RSS {run['peak_rss_mb']} MB", file=sys.stderr)
+            runs.append(run)
+
+    results = {
+        'schema_version': SCHEMA_VERSION,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'environment': environment(),
+        'parameters': {'candidates': args.candidates, 'k': args.k, 'seed': args.seed},
+        'runs': runs,
+    }
+    if args.output:
+        tmp_path = f"{args.output}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        os.replace(tmp_path, args.output)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
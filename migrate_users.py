@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+One-shot migration of the JSON user store to SQLite
+
+Imports data/users.json and data/applications.json into data/users.db. Afterwards run the app
+with USER_STORE_BACKEND=sqlite to use the database.
+
+Usage:
+    python migrate_users.py [--db data/users.db]
+"""
+
+import argparse
+import os
+
+from models.user_store import JSONUserStore, SQLiteUserStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Migrate the JSON user store to SQLite')
+    parser.add_argument('--users', default=os.path.join('data', 'users.json'), help='Users JSON file')
+    parser.add_argument('--applications', default=os.path.join('data', 'applications.json'), help='Applications JSON file')
+    parser.add_argument('--db', default=os.path.join('data', 'users.db'), help='SQLite database to create')
+    args = parser.parse_args()
+
+    counts = SQLiteUserStore(args.db).migrate_from_json(JSONUserStore(args.users, args.applications))
+    print(f"Migrated {counts['users']} users and {counts['applications']} applications to {args.db}")
+    if counts['skipped_applications']:
+        print(f"Skipped {counts['skipped_applications']} applications with no matching user")
+
+
+if __name__ == '__main__':
+    main()
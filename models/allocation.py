@@ -0,0 +1,298 @@
+import heapq
+import time
+from collections import deque
+from datetime import datetime
+from typing import List, Dict, Any
+import numpy as np
+from models.candidate import profile_to_candidate
+
+
+# Seat buckets per internship: general seats plus the reserved quotas from `affirmative_action`
+SEAT_BUCKETS = ('general', 'sc', 'st', 'obc', 'rural')
+GENERAL, SC, ST, OBC, RURAL = range(len(SEAT_BUCKETS))
+CATEGORY_BUCKETS = {'SC': SC, 'ST': ST, 'OBC': OBC}
+
+
+class AllocationEngine:
+    """
+    Global capacity- and quota-aware allocation of candidates to internships
+
+    Every candidate is scored against the catalog with the recommender's vectorized rule-based
+    score, the best `shortlist_size` postings are rescored with the ML model, and the resulting
+    sparse score matrix is solved as a capacity-constrained assignment with an auction algorithm.
+    Each internship's available seats are split into reserved sc/st/obc/rural buckets and a
+    general bucket; reserved seats left unfilled are released to general seats for a final round.
+    """
+
+    def __init__(self, recommender, shortlist_size: int = 20, epsilon: float = 0.5,
+                 min_score: float = 0.0, predict_chunk_rows: int = 200000):
+        self.recommender = recommender
+        self.shortlist_size = shortlist_size
+        self.epsilon = epsilon  # Auction bid increment; the result is within n * epsilon of optimal
+        self.min_score = min_score
+        self.predict_chunk_rows = predict_chunk_rows
+
+    def seat_capacities(self, state=None) -> np.ndarray:
+        """
+        (n_internships x len(SEAT_BUCKETS)) seat counts from available positions and open quotas
+
+        Counts come from the catalog state's QuotaIndex, so positions filled in the app (see
+        CapacityTracker) are already taken out, per reserved bucket as well as in total.
+        """
+        quota_index = (state or self.recommender.catalog_state).quota_index
+        capacities = np.zeros((quota_index.size, len(SEAT_BUCKETS)), dtype=np.int64)
+        available = np.maximum(0, quota_index.available)
+        reserved = np.column_stack([np.maximum(0, quota_index.quota[bucket] - quota_index.filled[bucket])
+                                    for bucket in SEAT_BUCKETS[1:]])
+
+        # Quotas are seat counts; scale them down where they exceed the seats still available
+        total = reserved.sum(axis=1)
+        over = total > available
+        reserved[over] = np.floor(reserved[over] * (available[over] / total[over])[:, None])
+        capacities[:, 1:] = reserved.astype(np.int64)
+        capacities[:, GENERAL] = available.astype(np.int64) - capacities[:, 1:].sum(axis=1)
+        return capacities
+
+    def eligible_buckets(self, candidate: Dict[str, Any]) -> List[int]:
+        """Seat buckets a candidate may take"""
+        buckets = [GENERAL]
+        category = CATEGORY_BUCKETS.get(str(candidate.get('social_category', 'General')).upper())
+        if category is not None:
+            buckets.append(category)
+        if candidate.get('district_type') == 'Rural':
+            buckets.append(RURAL)
+        return buckets
+
+    def shortlist(self, candidates: List[Dict[str, Any]], open_rows: np.ndarray, state=None):
+        """
+        Sparse candidate x internship score matrix in CSR form (indptr, rows, scores)
+
+        Rule-based scores are computed over every open posting; only the top `shortlist_size`
+        per candidate are rescored with the model (70% AI, 30% rules, as in the recommender).
+        """
+        recommender = self.recommender
+        state = state or recommender.catalog_state
+        all_rows = np.arange(len(state.internships))
+        size = min(self.shortlist_size, len(open_rows))
+
+        indptr = np.zeros(len(candidates) + 1, dtype=np.int64)
+        rows = np.empty(len(candidates) * size, dtype=np.intp)
+        rule_scores = np.empty(len(candidates) * size, dtype=float)
+        candidate_features = np.empty((len(candidates), 8), dtype=float)
+        featurized = np.ones(len(candidates), dtype=bool)
+
+        for i, candidate in enumerate(candidates):
+            scores = recommender._rule_based_scores(candidate, all_rows, state.internships, state)[open_rows]
+            top = np.argpartition(-scores, size - 1)[:size] if size < len(open_rows) else np.arange(len(open_rows))
+            rows[i * size:(i + 1) * size] = open_rows[top]
+            rule_scores[i * size:(i + 1) * size] = scores[top]
+            indptr[i + 1] = (i + 1) * size
+            try:
+                candidate_features[i] = recommender._extract_candidate_features(candidate)
+            except Exception:
+                featurized[i] = False
+
+        # Rescore the shortlist with the ML model in bounded chunks
+        ai_scores = np.zeros(len(rows))
+        owners = np.repeat(np.arange(len(candidates)), size)
+        for start in range(0, len(rows), self.predict_chunk_rows):
+            stop = min(start + self.predict_chunk_rows, len(rows))
+            internship_features = recommender._internship_feature_rows(rows[start:stop], None, state)
+            features = np.hstack([candidate_features[owners[start:stop]], internship_features])
+            try:
+                ai_scores[start:stop] = recommender.predict_scores(features)
+            except Exception as e:
+                print(f"Allocation ML scoring error: {e}")
+                ai_scores[start:stop] = np.nan
+
+        use_ai = featurized[owners] & ~np.isnan(ai_scores)
+        values = np.where(use_ai, np.clip(ai_scores * 0.7 + rule_scores * 0.3, 0, 100), rule_scores)
+        return indptr, rows, values
+
+    def solve(self, candidates: List[Dict[str, Any]], indptr: np.ndarray, rows: np.ndarray,
+              values: np.ndarray, capacities: np.ndarray, max_bids_per_candidate: int = 200) -> Dict[str, Any]:
+        """
+        Auction algorithm for the capacity-constrained assignment
+
+        Each bucket's price is the lowest bid it holds once full (0 while seats remain).
+        An unassigned candidate bids for its best bucket by net value (score - price),
+        raising its price by the gap to the second-best option (or staying unassigned) plus
+        epsilon; a full bucket evicts its lowest bid, which re-enters the queue.
+        """
+        n_buckets = len(SEAT_BUCKETS)
+        capacity = capacities.reshape(-1).copy()
+        prices = np.where(capacity > 0, 0.0, np.inf)
+        holders: Dict[int, list] = {}
+        assigned = np.full(len(candidates), -1, dtype=np.int64)
+        options: Dict[int, tuple] = {}
+
+        def candidate_options(i):
+            # Every eligible bucket of every shortlisted internship, all valued at the pair's score
+            if i not in options:
+                edge_rows = rows[indptr[i]:indptr[i + 1]]
+                edge_values = values[indptr[i]:indptr[i + 1]]
+                keep = edge_values >= self.min_score
+                buckets = self.eligible_buckets(candidates[i])
+                options[i] = (
+                    (edge_rows[keep, None] * n_buckets + np.array(buckets)).ravel(),
+                    np.repeat(edge_values[keep], len(buckets))
+                )
+            return options[i]
+
+        def update_price(bucket):
+            heap = holders.get(bucket, [])
+            if capacity[bucket] <= 0:
+                prices[bucket] = np.inf
+            elif len(heap) >= capacity[bucket]:
+                prices[bucket] = heap[0][0]
+            else:
+                prices[bucket] = 0.0
+
+        def run_auction(queue, dropped, bid_budget):
+            bids = 0
+            while queue and bids < bid_budget:
+                i = queue.popleft()
+                buckets, bucket_values = candidate_options(i)
+                if not len(buckets):
+                    dropped.append(i)
+                    continue
+
+                net = bucket_values - prices[buckets]
+                best = int(np.argmax(net))
+                if not net[best] >= 0:
+                    dropped.append(i)  # Every option now costs more than it is worth
+                    continue
+
+                # Staying unassigned is always an option worth 0
+                second = 0.0
+                if len(net) > 1:
+                    net[best] = -np.inf
+                    second = max(0.0, float(net.max()))
+                    net[best] = bucket_values[best] - prices[buckets[best]]
+                bucket = int(buckets[best])
+                bid = prices[bucket] + (net[best] - second) + self.epsilon
+
+                heap = holders.setdefault(bucket, [])
+                heapq.heappush(heap, (bid, i))
+                assigned[i] = bucket
+                if len(heap) > capacity[bucket]:
+                    _, evicted = heapq.heappop(heap)
+                    assigned[evicted] = -1
+                    queue.append(evicted)
+                update_price(bucket)
+                bids += 1
+            return bids
+
+        bid_budget = max_bids_per_candidate * max(1, len(candidates))
+        dropped = []
+        bids = run_auction(deque(range(len(candidates))), dropped, bid_budget)
+
+        # Release reserved seats nobody eligible took to the general pool and re-run for the rest
+        capacity_matrix = capacity.reshape(-1, n_buckets)
+        filled = np.zeros_like(capacity)
+        for bucket, heap in holders.items():
+            filled[bucket] = len(heap)
+        filled_matrix = filled.reshape(-1, n_buckets)
+        released = capacity_matrix[:, 1:] - filled_matrix[:, 1:]
+        capacity_matrix[:, 1:] -= released
+        capacity_matrix[:, GENERAL] += released.sum(axis=1)
+        for bucket in range(len(capacity)):
+            update_price(bucket)
+
+        retry = deque(i for i in dropped if assigned[i] < 0)
+        dropped = []
+        bids += run_auction(retry, dropped, max(0, bid_budget - bids))
+
+        return {
+            'assigned_bucket': assigned,
+            'final_capacity': capacity_matrix,
+            'released_seats': released,
+            'bids': bids,
+            'converged': bids < bid_budget
+        }
+
+    def run(self, users: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Allocate every user with a complete profile against the current catalog"""
+        timings = {}
+        started = time.perf_counter()
+
+        emails = [email for email, user in users.items() if user.get('profile_complete') and user.get('profile')]
+        candidates = [profile_to_candidate(users[email]['profile']) for email in emails]
+        state = self.recommender.catalog_state  # One catalog version for the whole run
+        capacities = self.seat_capacities(state)
+        open_rows = np.flatnonzero(capacities.sum(axis=1) > 0)
+
+        if not candidates or not len(open_rows):
+            indptr, rows, values = np.zeros(len(candidates) + 1, dtype=np.int64), np.empty(0, dtype=np.intp), np.empty(0)
+        else:
+            indptr, rows, values = self.shortlist(candidates, open_rows, state)
+        timings['scoring_seconds'] = time.perf_counter() - started
+
+        solve_started = time.perf_counter()
+        solution = self.solve(candidates, indptr, rows, values, capacities)
+        timings['assignment_seconds'] = time.perf_counter() - solve_started
+        timings['total_seconds'] = time.perf_counter() - started
+
+        internships = state.internships
+        assignments = []
+        unassigned = []
+        for i, email in enumerate(emails):
+            bucket = solution['assigned_bucket'][i]
+            if bucket < 0:
+                unassigned.append({'email': email, 'user_id': users[email].get('id')})
+                continue
+            row, seat = divmod(int(bucket), len(SEAT_BUCKETS))
+            edge = indptr[i] + np.flatnonzero(rows[indptr[i]:indptr[i + 1]] == row)[0]
+            assignments.append({
+                'email': email,
+                'user_id': users[email].get('id'),
+                'internship_id': internships[row].get('id'),
+                'internship_title': internships[row].get('title'),
+                'seat_bucket': SEAT_BUCKETS[seat],
+                'match_score': round(float(values[edge]), 2)
+            })
+
+        report = self._summary_report(candidates, capacities, solution, assignments, timings)
+        return {'assignments': assignments, 'unassigned': unassigned, 'report': report}
+
+    def _summary_report(self, candidates, capacities, solution, assignments, timings) -> Dict[str, Any]:
+        """Fill, quota and score statistics for an allocation run"""
+        assigned_buckets = solution['assigned_bucket']
+        seat_of = np.where(assigned_buckets >= 0, assigned_buckets % len(SEAT_BUCKETS), -1)
+        filled = np.bincount(seat_of[seat_of >= 0], minlength=len(SEAT_BUCKETS))
+        scores = np.array([a['match_score'] for a in assignments], dtype=float)
+
+        by_category = {}
+        for candidate, bucket in zip(candidates, assigned_buckets):
+            category = str(candidate.get('social_category', 'General'))
+            stats = by_category.setdefault(category, {'candidates': 0, 'assigned': 0})
+            stats['candidates'] += 1
+            stats['assigned'] += int(bucket >= 0)
+
+        total_seats = int(capacities.sum())
+        return {
+            'generated_at': datetime.now().isoformat(),
+            'candidates': len(candidates),
+            'internships': int(capacities.shape[0]),
+            'total_seats': total_seats,
+            'assigned': len(assignments),
+            'unassigned': len(candidates) - len(assignments),
+            'seat_fill_rate': round(len(assignments) / total_seats * 100, 2) if total_seats else 0,
+            'seat_buckets': {
+                bucket: {
+                    'seats': int(capacities[:, b].sum()),
+                    'filled': int(filled[b]),
+                    'released_to_general': int(solution['released_seats'][:, b - 1].sum()) if b else 0
+                }
+                for b, bucket in enumerate(SEAT_BUCKETS)
+            },
+            'by_social_category': by_category,
+            'match_score': {
+                'mean': round(float(scores.mean()), 2) if len(scores) else 0,
+                'median': round(float(np.median(scores)), 2) if len(scores) else 0,
+                'total': round(float(scores.sum()), 2)
+            },
+            'auction': {'bids': int(solution['bids']), 'converged': bool(solution['converged']),
+                        'epsilon': self.epsilon, 'shortlist_size': self.shortlist_size},
+            'timings': {name: round(seconds, 3) for name, seconds in timings.items()}
+        }
@@ -0,0 +1,162 @@
+import hashlib
+import os
+import threading
+from typing import Dict, Optional, Tuple
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+
+
+class IVFIndex:
+    """
+    Approximate nearest-neighbour index over internship TF-IDF vectors
+
+    Sparse TF-IDF rows are projected to a small dense space with TruncatedSVD and normalized,
+    then clustered with spherical k-means into inverted lists (IVF). A query is projected the
+    same way, the `n_probe` closest lists are opened and only their members are scored exactly.
+    `n_probe` is the recall/latency knob: probing every list is an exact search.
+    """
+
+    def __init__(self, n_components: int = 64, n_lists: int = None, n_probe: int = 4,
+                 kmeans_iterations: int = 10, random_state: int = 42):
+        self.n_components = n_components
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.kmeans_iterations = kmeans_iterations
+        self.random_state = random_state
+        self.fingerprint = None
+        self.checksum = None        # catalog_checksum of the indexed postings, set by the owner
+        self.components = None      # (n_components x n_features) SVD projection
+        self.centroids = None       # (n_lists x n_components) unit vectors
+        self.vectors = None         # (n_rows x n_components) unit vectors
+        self.assignments = None     # Inverted list of every row
+        self.rows = None            # Catalog row of every indexed vector
+        self.keys = None            # Internship id (as str) of every indexed vector
+        self._lists = None
+
+    @staticmethod
+    def vocabulary_fingerprint(vocabulary: Dict[str, int]) -> str:
+        """Identifies the term -> column mapping an index was projected from"""
+        payload = '\n'.join(f'{term}\t{column}' for term, column in sorted(vocabulary.items()))
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def vectorizer_fingerprint(cls, vectorizer) -> str:
+        """Identifies a fitted TF-IDF vectorizer: its vocabulary and, when fitted with idf, its weights"""
+        digest = hashlib.sha1(cls.vocabulary_fingerprint(vectorizer.vocabulary_).encode('utf-8'))
+        idf = getattr(vectorizer, 'idf_', None)
+        if idf is not None:
+            digest.update(np.ascontiguousarray(idf, dtype=np.float64).tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _unit_rows(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+    def project(self, matrix) -> np.ndarray:
+        """Unit-length dense projections of sparse TF-IDF rows"""
+        return self._unit_rows(np.asarray(matrix @ self.components.T, dtype=np.float32))
+
+    def build(self, matrix, keys, fingerprint: str = None) -> 'IVFIndex':
+        """Fit the projection and the inverted lists on an (n_rows x n_features) TF-IDF matrix"""
+        n_rows, n_features = matrix.shape
+        n_components = max(1, min(self.n_components, n_features - 1, n_rows - 1))
+        svd = TruncatedSVD(n_components=n_components, random_state=self.random_state)
+        svd.fit(matrix)
+        self.components = svd.components_.astype(np.float32)
+        self.fingerprint = fingerprint
+
+        self.vectors = self.project(matrix)
+        self.rows = np.arange(n_rows, dtype=np.int64)
+        self.keys = np.array([str(key) for key in keys])
+        n_lists = self.n_lists or max(1, int(np.sqrt(n_rows)))
+        self.centroids = self._spherical_kmeans(self.vectors, min(n_lists, n_rows))
+        self.assignments = np.argmax(self.vectors @ self.centroids.T, axis=1).astype(np.int64)
+        self._build_lists()
+        return self
+
+    def _spherical_kmeans(self, vectors: np.ndarray, n_lists: int) -> np.ndarray:
+        rng = np.random.default_rng(self.random_state)
+        centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+        for _ in range(self.kmeans_iterations):
+            similarity = vectors @ centroids.T
+            labels = np.argmax(similarity, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, vectors)
+            empty = np.flatnonzero(np.bincount(labels, minlength=n_lists) == 0)
+            if len(empty):
+                # Reseed empty lists with the points furthest from their centroid
+                worst = np.argsort(similarity[np.arange(len(vectors)), labels])[:len(empty)]
+                sums[empty[:len(worst)]] = vectors[worst]
+            centroids = self._unit_rows(sums)
+        return centroids
+
+    def _build_lists(self):
+        order = np.argsort(self.assignments, kind='stable')
+        splits = np.cumsum(np.bincount(self.assignments, minlength=len(self.centroids)))[:-1]
+        self._lists = np.split(order, splits)
+
+    def add(self, matrix, rows: np.ndarray, keys):
+        """Insert new postings (TF-IDF rows with their catalog rows) into their nearest lists"""
+        vectors = self.project(matrix)
+        assignments = np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int64)
+        self.vectors = np.vstack([self.vectors, vectors])
+        self.rows = np.concatenate([self.rows, np.asarray(rows, dtype=np.int64)])
+        self.keys = np.concatenate([self.keys, np.array([str(key) for key in keys])])
+        self.assignments = np.concatenate([self.assignments, assignments])
+        self._build_lists()
+
+    def search(self, query, k: int, n_probe: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Catalog rows and cosine scores of the (approximate) k nearest postings to one TF-IDF row"""
+        vector = self.project(query)[0]
+        if not vector.any() or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        n_probe = min(n_probe or self.n_probe, len(self.centroids))
+        centroid_scores = self.centroids @ vector
+        probes = np.argpartition(-centroid_scores, n_probe - 1)[:n_probe]
+        members = np.concatenate([self._lists[probe] for probe in probes])
+        if not len(members):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        scores = self.vectors[members] @ vector
+        if len(members) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            members, scores = members[top], scores[top]
+        order = np.argsort(-scores, kind='stable')
+        return self.rows[members[order]], scores[order]
+
+    def __len__(self) -> int:
+        return 0 if self.rows is None else len(self.rows)
+
+    def save(self, path: str):
+        """Persist the index (atomically replaced; concurrent writers never share a temp file)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, components=self.components, centroids=self.centroids, vectors=self.vectors,
+                     assignments=self.assignments, rows=self.rows, keys=self.keys, fingerprint=np.array(self.fingerprint or ''),
+                     checksum=np.array(self.checksum or ''), n_probe=np.array(self.n_probe))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, fingerprint: str = None) -> Optional['IVFIndex']:
+        """Load a saved index; None if missing, unreadable or built from another vectorizer"""
+        try:
+            with np.load(path) as data:
+                if fingerprint is not None and str(data['fingerprint']) != fingerprint:
+                    return None
+                index = cls(n_components=data['components'].shape[0], n_lists=data['centroids'].shape[0],
+                            n_probe=int(data['n_probe']))
+                index.components = data['components']
+                index.centroids = data['centroids']
+                index.vectors = data['vectors']
+                index.assignments = data['assignments']
+                index.rows = data['rows']
+                index.keys = data['keys']
+                index.fingerprint = str(data['fingerprint']) or None
+                index.checksum = str(data['checksum']) if 'checksum' in data else None
+        except (OSError, KeyError, ValueError):
+            return None
+        index._build_lists()
+        return index
@@ -0,0 +1,126 @@
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+
+
+class ApplicationLedger:
+    """
+    In-memory index over all applications
+
+    applications.json mixes two shapes: lists keyed by user email (written by the app) and single
+    records keyed by application id with a user_id (seeded demo data). The ledger normalizes both
+    into one record schema (every record carries id, email, user_id, internship_id, status) and
+    keeps hash indexes by (user, internship), internship and status, so duplicate checks,
+    per-internship listings and status transitions do not scan the data.
+    """
+
+    def __init__(self, applications: Dict[str, Any], users: Dict[str, Dict]):
+        self._records: Dict[str, Dict] = {}
+        self._by_user: Dict[str, List[str]] = {}
+        self._by_pair: Dict[Tuple[str, str], List[str]] = {}
+        self._by_internship: Dict[str, Dict[str, None]] = {}
+        self._by_status: Dict[str, Dict[str, None]] = {}
+        self._legacy_keys: Dict[str, str] = {}
+
+        emails_by_id = {user.get('id'): email for email, user in users.items()}
+        for key, value in applications.items():
+            if isinstance(value, list):
+                for application in value:
+                    self._index(self.normalize(application, key, users.get(key, {}).get('id')))
+            elif isinstance(value, dict):
+                # Legacy id-keyed record: resolve its owner through user_id
+                email = emails_by_id.get(value.get('user_id'))
+                record = self.normalize(dict(value, id=value.get('id', key)), email, value.get('user_id'))
+                self._legacy_keys[record['id']] = key
+                self._index(record)
+
+    @staticmethod
+    def internship_key(internship_id) -> str:
+        """Internship ids arrive as ints from the catalog and as strings from forms; index them as one"""
+        return str(internship_id)
+
+    @staticmethod
+    def normalize(application: Dict, email: Optional[str], user_id: Optional[str] = None) -> Dict:
+        """Record in the ledger schema; unknown fields are kept"""
+        record = dict(application)
+        record['email'] = email
+        record['user_id'] = record.get('user_id', user_id)
+        record.setdefault('status', 'applied')
+        if 'applied_at' not in record and 'applied_date' in record:
+            record['applied_at'] = record['applied_date']
+        return record
+
+    def _index(self, record: Dict):
+        application_id = record['id']
+        if application_id in self._records:
+            self._unindex(self._records[application_id])
+        self._records[application_id] = record
+        email = record['email']
+        internship = self.internship_key(record.get('internship_id'))
+        self._by_user.setdefault(email, []).append(application_id)
+        self._by_pair.setdefault((email, internship), []).append(application_id)
+        self._by_internship.setdefault(internship, {})[application_id] = None
+        self._by_status.setdefault(record['status'], {})[application_id] = None
+
+    def _unindex(self, record: Dict):
+        application_id = record['id']
+        internship = self.internship_key(record.get('internship_id'))
+        self._by_user[record['email']].remove(application_id)
+        self._by_pair[(record['email'], internship)].remove(application_id)
+        self._by_internship[internship].pop(application_id, None)
+        self._by_status[record['status']].pop(application_id, None)
+
+    def get(self, application_id: str) -> Optional[Dict]:
+        return self._records.get(application_id)
+
+    def legacy_key(self, application_id: str) -> Optional[str]:
+        """Top-level key of an id-keyed record in applications.json, if the record is one"""
+        return self._legacy_keys.get(application_id)
+
+    def find(self, email: str, internship_id, status: str = None) -> Optional[Dict]:
+        """First application of a user to an internship, optionally with a given status"""
+        for application_id in self._by_pair.get((email, self.internship_key(internship_id)), ()):
+            record = self._records[application_id]
+            if status is None or record['status'] == status:
+                return record
+        return None
+
+    def add(self, email: str, application: Dict, user_id: str = None) -> Dict:
+        """Index a new application and return its ledger record"""
+        record = self.normalize(application, email, user_id)
+        self._index(record)
+        return record
+
+    def update(self, application_id: str, changes: Dict) -> Optional[Dict]:
+        """Apply changes to one record, re-indexing only that record"""
+        record = self._records.get(application_id)
+        if record is None:
+            return None
+        if 'status' in changes and changes['status'] != record['status']:
+            self._by_status[record['status']].pop(application_id, None)
+            self._by_status.setdefault(changes['status'], {})[application_id] = None
+        record.update(changes)
+        return record
+
+    def for_user(self, email: str) -> List[Dict]:
+        return [self._records[application_id] for application_id in self._by_user.get(email, ())]
+
+    def for_internship(self, internship_id, status: str = None) -> List[Dict]:
+        records = (self._records[application_id] for application_id in self._by_internship.get(self.internship_key(internship_id), ()))
+        return [record for record in records if status is None or record['status'] == status]
+
+    def count_for_internship(self, internship_id, status: str = None) -> int:
+        ids = self._by_internship.get(self.internship_key(internship_id), {})
+        if status is None:
+            return len(ids)
+        return sum(1 for application_id in ids if self._records[application_id]['status'] == status)
+
+    def with_status(self, status: str) -> List[Dict]:
+        return [self._records[application_id] for application_id in self._by_status.get(status, ())]
+
+    def status_counts(self) -> Dict[str, int]:
+        return {status: len(ids) for status, ids in self._by_status.items() if ids}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterable[Dict]:
+        return iter(self._records.values())
@@ -0,0 +1,123 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+class TTLCache:
+    """
+    Small thread-safe cache with LRU eviction and per-entry expiry
+    Used to keep scored recommendation results around for repeat requests and follow-up pages
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300.0, timer=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._entries = OrderedDict()
+        self._in_flight: Dict[Hashable, threading.Event] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.collapsed = 0  # Misses that waited on an identical in-flight computation
+        self.evictions = 0
+
+    def _lookup(self, key: Hashable, missing: Any) -> Any:
+        """Live entry for key (marked most recently used) or `missing`; caller holds the lock"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return missing
+
+        expires_at, value = entry
+        if expires_at <= self._timer():
+            del self._entries[key]
+            return missing
+
+        self._entries.move_to_end(key)
+        return value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a live entry and mark it most recently used"""
+        missing = object()
+        with self._lock:
+            value = self._lookup(key, missing)
+            if value is missing:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the entry for key, computing and storing it on a miss
+
+        Concurrent misses on the same key are collapsed: one caller computes while the
+        others wait for its result instead of repeating the work.
+        """
+        missing = object()
+        while True:
+            with self._lock:
+                value = self._lookup(key, missing)
+                if value is not missing:
+                    self.hits += 1
+                    return value
+
+                flight = self._in_flight.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._in_flight[key] = threading.Event()
+                    self.misses += 1
+                else:
+                    self.collapsed += 1
+
+            if not leader:
+                # Re-check once the leader finishes; if it failed, one waiter takes over
+                flight.wait()
+                continue
+
+            try:
+                value = compute()
+                self.set(key, value)
+                return value
+            finally:
+                with self._lock:
+                    self._in_flight.pop(key, None)
+                flight.set()
+
+    def set(self, key: Hashable, value: Any):
+        """Store an entry, evicting the least recently used one when full"""
+        with self._lock:
+            self._entries[key] = (self._timer() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        """Drop a single entry if present"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current occupancy"""
+        with self._lock:
+            lookups = self.hits + self.misses + self.collapsed
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'collapsed': self.collapsed,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,12 @@
+from typing import Dict, Any
+
+
+def profile_to_candidate(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Recommender candidate data from a stored user profile"""
+    # Profile forms store skills as a comma-separated string; the recommender reads a list
+    candidate = dict(profile)
+    skills = candidate.get('skills', [])
+    if isinstance(skills, str):
+        skills = [s.strip() for s in skills.split(',') if s.strip()]
+    candidate['skills'] = skills
+    return candidate
@@ -0,0 +1,242 @@
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
+from models.quota_index import open_reserved_seats
+
+try:
+    import fcntl
+except ImportError:  # Windows: the single-writer guard is skipped
+    fcntl = None
+
+
+# Application statuses that occupy a position at the internship
+FILLING_STATUSES = ('accepted', 'selected')
+
+
+def candidate_buckets(profile: Optional[Dict[str, Any]]) -> List[str]:
+    """Reserved buckets an applicant may fill, in preference order"""
+    profile = profile or {}
+    buckets = []
+    category = str(profile.get('social_category') or '').lower()
+    if category in ('sc', 'st', 'obc'):
+        buckets.append(category)
+    if profile.get('district_type') == 'Rural':
+        buckets.append('rural')
+    return buckets
+
+
+class CapacityTracker:
+    """
+    Live per-internship application and fill counters
+
+    `filled_positions` in the catalog is static; the tracker counts what happens in the app on
+    top of it: applications per internship, and positions filled per quota bucket by
+    applications moving into (or out of) a FILLING_STATUSES status. Each fill remembers its
+    bucket so a later status change releases the same seat. The bucket is chosen from the
+    catalog's quotas (see `catalog`) under the same lock that counts the fill, and listeners
+    (e.g. the recommender's QuotaIndex) are told about every fill under that lock too. State is
+    flushed to `path` atomically in batches (every `flush_every` changes or `flush_interval`
+    seconds) and at exit.
+
+    Counters live in one process. Several processes counting into the same file would each
+    flush only their own fills, and the last writer would win; so the first tracker to open
+    `path` takes an exclusive lock on `path`.lock and only that tracker flushes. Run the app as
+    a single process (threads are fine) when live counts matter. Offline jobs (allocation,
+    precompute) open the file with read_only=True.
+    """
+
+    def __init__(self, path: str = os.path.join('data', 'capacity.json'), flush_every: int = 20,
+                 flush_interval: float = 5.0, catalog=None, read_only: bool = False):
+        self.path = os.path.abspath(path)  # Flushed at exit, possibly from another working directory
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        # CatalogService whose quotas decide the bucket of a fill; without one every fill is 'general'
+        self.catalog = catalog
+        self._catalog_rows: Tuple[Any, Dict[str, int]] = (None, {})  # (snapshot, str(id) -> row)
+        self._lock = threading.RLock()
+        self._applications: Dict[str, int] = {}
+        self._holds: Dict[str, Tuple[str, str]] = {}  # application id -> (internship id, bucket)
+        self._filled: Dict[str, Dict[str, int]] = {}
+        self._listeners: List[Callable[[str, str, int], None]] = []
+        self._dirty = 0
+        self._flush_lock = threading.Lock()  # One flush at a time, so an older snapshot never replaces a newer one
+        self._last_flush = time.monotonic()
+        # Offline jobs read the app's counters without ever competing to write them
+        self.writer = not read_only and self._acquire_writer_lock()
+        self.loaded = self._load()
+        atexit.register(self.flush)
+
+    @staticmethod
+    def key(internship_id) -> str:
+        """Internship ids arrive as ints from the catalog and as strings from forms; count them as one"""
+        return str(internship_id)
+
+    def _acquire_writer_lock(self) -> bool:
+        """Whether this tracker owns the counters file; the lock is held until the process exits"""
+        if fcntl is None:
+            return True
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self._lock_file = open(f"{self.path}.lock", 'a')
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            print(f"Capacity counters in {self.path} are owned by another tracker; this one will not flush")
+            return False
+
+    def _load(self) -> bool:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        self._applications = {key: int(count) for key, count in data.get('applications', {}).items()}
+        for application_id, (internship, bucket) in data.get('holds', {}).items():
+            self._holds[application_id] = (internship, bucket)
+            self._count_fill(internship, bucket, 1)
+        return True
+
+    def seed(self, applications: Iterable[Dict], profiles: Dict[str, Dict]):
+        """Initial counts from existing application records (ledger records with email and status)"""
+        for record in applications:
+            if record.get('status') == 'saved':
+                continue
+            self.record_application(record.get('internship_id'))
+            if record.get('status') in FILLING_STATUSES:
+                profile = (profiles.get(record.get('email')) or {}).get('profile')
+                self.fill(record['id'], record.get('internship_id'), candidate_buckets(profile))
+        self.loaded = True
+        self.flush()
+
+    def subscribe(self, listener: Callable[[str, str, int], None]):
+        """Call listener(internship_key, bucket, delta) on every fill and release"""
+        self._listeners.append(listener)
+
+    def _count_fill(self, internship: str, bucket: str, delta: int):
+        counts = self._filled.setdefault(internship, {})
+        counts[bucket] = counts.get(bucket, 0) + delta
+
+    def _changed(self):
+        with self._lock:
+            self._dirty += 1
+            due = self._dirty >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def record_application(self, internship_id):
+        """Count one application to an internship"""
+        with self._lock:
+            internship = self.key(internship_id)
+            self._applications[internship] = self._applications.get(internship, 0) + 1
+        self._changed()
+
+    def _posting(self, internship: str) -> Optional[Dict]:
+        """Catalog entry of an internship key, or None"""
+        snapshot = self.catalog.snapshot()
+        if self._catalog_rows[0] is not snapshot:
+            self._catalog_rows = (snapshot, {self.key(internship_id): row for internship_id, row in snapshot.positions.items()})
+        row = self._catalog_rows[1].get(internship)
+        return snapshot.internships[row] if row is not None else None
+
+    def _bucket_for(self, internship: str, buckets: List[str]) -> str:
+        """The first of the applicant's reserved buckets with open seats, else 'general'; caller holds the lock"""
+        posting = self._posting(internship) if self.catalog is not None and buckets else None
+        if posting is not None:
+            live = self._filled.get(internship, {})
+            for bucket in buckets:
+                if open_reserved_seats(posting, bucket, live) > 0:
+                    return bucket
+        return 'general'
+
+    def fill(self, application_id: str, internship_id, buckets: List[str] = ()) -> Optional[str]:
+        """Occupy a position for an application; returns the bucket, or None if it already holds one"""
+        with self._lock:
+            if application_id in self._holds:
+                return None
+            internship = self.key(internship_id)
+            bucket = self._bucket_for(internship, list(buckets))
+            self._holds[application_id] = (internship, bucket)
+            self._count_fill(internship, bucket, 1)
+            self._notify(internship, bucket, 1)
+        self._changed()
+        return bucket
+
+    def release(self, application_id: str) -> Optional[str]:
+        """Free the position an application held; returns its bucket, or None if it held none"""
+        with self._lock:
+            hold = self._holds.pop(application_id, None)
+            if hold is None:
+                return None
+            self._count_fill(hold[0], hold[1], -1)
+            self._notify(hold[0], hold[1], -1)
+        self._changed()
+        return hold[1]
+
+    def status_changed(self, application_id: str, internship_id, old_status: str, new_status: str,
+                       profile: Dict[str, Any] = None):
+        """Fill or release a position when an application moves into or out of a filling status"""
+        if new_status in FILLING_STATUSES and old_status not in FILLING_STATUSES:
+            self.fill(application_id, internship_id, candidate_buckets(profile))
+        elif old_status in FILLING_STATUSES and new_status not in FILLING_STATUSES:
+            self.release(application_id)
+
+    def _notify(self, internship: str, bucket: str, delta: int):
+        """Tell listeners about a fill; called under the lock, so listeners must not call back in"""
+        for listener in self._listeners:
+            listener(internship, bucket, delta)
+
+    def applications(self, internship_id) -> int:
+        return self._applications.get(self.key(internship_id), 0)
+
+    def filled(self, internship_id) -> Dict[str, int]:
+        """Positions filled in the app per bucket for an internship"""
+        return dict(self._filled.get(self.key(internship_id), {}))
+
+    def fills_by_internship(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {internship: dict(counts) for internship, counts in self._filled.items()}
+
+    @contextmanager
+    def frozen_fills(self) -> Iterator[Dict[str, Dict[str, int]]]:
+        """
+        Fills by internship, with the counters held still until the block exits
+
+        A listener that builds its own counts from these fills and publishes them inside the
+        block neither misses a fill recorded meanwhile nor counts one twice.
+        """
+        with self._lock:
+            yield self.fills_by_internship()
+
+    def flush(self):
+        """
+        Write the counters to disk (atomically replaced), if this tracker owns the file
+
+        Changes are only marked as saved once the file is replaced; a failed write leaves them
+        pending for the next flush.
+        """
+        if not self.writer:
+            return
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty and os.path.exists(self.path):
+                    return
+                data = {'applications': dict(self._applications),
+                        'holds': {application_id: list(hold) for application_id, hold in self._holds.items()}}
+                saved = self._dirty
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"Error saving capacity counters: {e}")
+                return
+            with self._lock:
+                # Changes made while writing stay pending
+                self._dirty -= saved
+                self._last_flush = time.monotonic()
@@ -0,0 +1,169 @@
+import json
+import os
+import re
+import threading
+import time
+from typing import List, Dict, Any, Callable, Optional
+import numpy as np
+from models.columnar_catalog import ColumnarCatalog, CategoricalColumn, ListColumn
+
+
+class CatalogSnapshot:
+    """
+    Immutable view of one version of the internship catalog plus structures derived from it
+    Built completely before it is published, so readers never see a partially loaded catalog.
+    Postings are held as a ColumnarCatalog; derived fields are computed from its columns.
+    """
+
+    def __init__(self, internships: List[Dict], version: int, stat_key: Optional[tuple] = None):
+        if not isinstance(internships, ColumnarCatalog):
+            internships = ColumnarCatalog(internships)
+        self.internships = internships
+        self.version = version
+        self.stat_key = stat_key
+        self.loaded_at = time.time()
+        self.positions: Dict[Any, int] = {internship_id: idx for idx, internship_id in enumerate(self._values('id', None))}
+
+        # Lowercase token fields, as compared by matching and filtering
+        self.titles = self._lowercase('title', '')
+        self.companies = self._lowercase('company', '')
+        self.sectors = self._lowercase('sector', '')
+        self.locations = self._lowercase('location', '')
+        self.skills = self._lowercase_lists('skills_required')
+        self.work_modes = self._lowercase('work_mode', '', or_default=True)
+        self.durations = self._lowercase('duration', '', or_default=True)
+
+        # Numeric columns
+        self.stipend_amount = np.array([self._stipend_amount(internship) for internship in internships], dtype=float)
+        self.opportunities = self._column(internships, 'opportunities')
+        self.filled_positions = self._column(internships, 'filled_positions')
+        self.rating = self._column(internships, 'rating')
+        self.available_positions = self.opportunities - self.filled_positions
+
+    def _values(self, field: str, default: Any) -> List[Any]:
+        """A field's value for every posting, `default` where it is missing"""
+        return [internship.get(field, default) for internship in self.internships]
+
+    def _lowercase(self, field: str, default: str, or_default: bool = False) -> List[str]:
+        """str(value).lower() per posting, computed once per distinct value for categorical columns"""
+        def lower(value):
+            return str(value or default if or_default else value).lower()
+
+        column = self.internships.column(field)
+        if isinstance(column, CategoricalColumn):
+            lowered = [lower(value) for value in column.values] + [lower(default)]  # Code -1 (missing) reads the last entry
+            return [lowered[code] for code in column.codes.tolist()]
+        return [lower(value) for value in self._values(field, default)]
+
+    def _lowercase_lists(self, field: str) -> List[List[str]]:
+        column = self.internships.column(field)
+        if isinstance(column, ListColumn):
+            lowered = [str(value).lower() for value in column.values]
+            indices, indptr = column.indices.tolist(), column.indptr.tolist()
+            return [[lowered[code] for code in indices[indptr[row]:indptr[row + 1]]] for row in range(len(self.internships))]
+        return [[str(value).lower() for value in values] for values in self._values(field, [])]
+
+    @staticmethod
+    def _column(internships: ColumnarCatalog, field: str) -> np.ndarray:
+        """Float column for a numeric field, NaN where it is missing"""
+        source = internships.column(field)
+        if hasattr(source, 'array'):
+            column = source.array()
+        else:
+            values = [internship.get(field) for internship in internships]
+            column = np.array([value if isinstance(value, (int, float)) else np.nan for value in values], dtype=float)
+        if field in ('opportunities', 'filled_positions'):
+            column = np.nan_to_num(column)
+        return column
+
+    @staticmethod
+    def _stipend_amount(internship: Dict) -> float:
+        """stipend_amount, or the leading amount of the display string (e.g. '₹15,000/month')"""
+        amount = internship.get('stipend_amount')
+        if isinstance(amount, (int, float)):
+            return float(amount)
+        match = re.search(r'\d[\d,]*', str(internship.get('stipend') or '').split('/')[0])
+        return float(match.group().replace(',', '')) if match else np.nan
+
+    def get(self, internship_id) -> Optional[Dict]:
+        """Catalog entry for an internship id, or None"""
+        row = self.positions.get(internship_id)
+        return self.internships[row] if row is not None else None
+
+    def __len__(self) -> int:
+        return len(self.internships)
+
+
+class CatalogService:
+    """
+    Shared, hot-reloading internship catalog
+
+    Holds the parsed data/internships.json as a CatalogSnapshot. The file's mtime and size are
+    checked at most every `check_interval` seconds; when they change a new snapshot is parsed
+    and built in full, then swapped in with a single reference assignment. Consumers that keep
+    their own derived state (e.g. the recommender's TF-IDF and feature matrices) compare
+    `snapshot().version` with the version they were built from.
+    """
+
+    def __init__(self, path: str = os.path.join('data', 'internships.json'), check_interval: float = 1.0,
+                 fallback: Callable[[], List[Dict]] = None, timer=time.monotonic):
+        self.path = path
+        self.check_interval = check_interval
+        self.fallback = fallback
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._checked_at = None
+        self.loads = 0
+        self.refresh(force=True)
+
+    def _stat_key(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _load(self) -> List[Dict]:
+        """Parse the catalog file, creating it from the fallback data if it does not exist"""
+        if not os.path.exists(self.path) and self.fallback is not None:
+            sample_data = self.fallback()
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(sample_data, f, indent=2, ensure_ascii=False)
+            return sample_data
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Error loading internship data: {e}")
+            return self.fallback() if self.fallback is not None else []
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload the catalog if the file changed; returns True when a new snapshot was published"""
+        with self._lock:
+            now = self._timer()
+            if not force and self._checked_at is not None and now - self._checked_at < self.check_interval:
+                return False
+            self._checked_at = now
+
+            stat_key = self._stat_key()
+            if not force and self._snapshot is not None and stat_key == self._snapshot.stat_key:
+                return False
+
+            internships = self._load()
+            version = self._snapshot.version + 1 if self._snapshot is not None else 1
+            # _load may have created the file from the fallback data
+            self._snapshot = CatalogSnapshot(internships, version, stat_key or self._stat_key())
+            self.loads += 1
+            return True
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Current catalog, reloading first if the file changed"""
+        self.refresh()
+        return self._snapshot
+
+    @property
+    def internships(self) -> List[Dict]:
+        return self.snapshot().internships
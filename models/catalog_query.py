@@ -0,0 +1,180 @@
+import base64
+import json
+from typing import List, Dict, Any, Optional
+import numpy as np
+from models.catalog import CatalogSnapshot
+
+
+class CatalogQuery:
+    """
+    Faceted filtering, sorting and cursor pagination over one catalog snapshot
+
+    Categorical fields are factorized into integer codes with per-value row postings, stipend
+    amounts are kept as a sorted array for range queries, and every sort key has a precomputed
+    row order, so a query is a few boolean mask operations plus a slice of the sort order.
+    """
+
+    # Facet name -> CatalogSnapshot lowercase field and internship display field
+    FACETS = {
+        'sector': ('sectors', 'sector'),
+        'location': ('locations', 'location'),
+        'work_mode': ('work_modes', 'work_mode'),
+        'duration': ('durations', 'duration'),
+    }
+
+    SORTS = ('relevance', 'rating', 'stipend', 'recent', 'company')
+
+    def __init__(self, snapshot: CatalogSnapshot):
+        self.snapshot = snapshot
+        self.size = len(snapshot)
+        internships = snapshot.internships
+
+        self.codes: Dict[str, np.ndarray] = {}
+        self.values: Dict[str, Dict[str, int]] = {}
+        self.labels: Dict[str, List[str]] = {}
+        self.postings: Dict[str, List[np.ndarray]] = {}
+        for facet, (field, display_field) in self.FACETS.items():
+            values: Dict[str, int] = {}
+            labels: List[str] = []
+            codes = np.empty(self.size, dtype=np.intp)
+            for row, value in enumerate(getattr(snapshot, field)):
+                if value not in values:
+                    values[value] = len(labels)
+                    labels.append(str(internships[row].get(display_field) or ''))
+                codes[row] = values[value]
+            self.codes[facet] = codes
+            self.values[facet] = values
+            self.labels[facet] = labels
+            order = np.argsort(codes, kind='stable')
+            self.postings[facet] = np.split(order, np.cumsum(np.bincount(codes, minlength=len(labels)))[:-1])
+
+        # Stipend range queries: binary search over the sorted amounts (missing amounts excluded)
+        stipend = snapshot.stipend_amount
+        known = np.flatnonzero(~np.isnan(stipend))
+        self._stipend_order = known[np.argsort(stipend[known], kind='stable')]
+        self._stipend_sorted = stipend[self._stipend_order]
+
+        # Text for the free-text filter, matched the way the explore page always has
+        self._haystacks = ['\n'.join([snapshot.titles[row], snapshot.companies[row], snapshot.sectors[row],
+                                      snapshot.locations[row]] + snapshot.skills[row]) for row in range(self.size)]
+
+        # Row order and rank (position in that order) per sort key; ties keep catalog order
+        rows = np.arange(self.size)
+        ids = np.array([self._numeric_id(internship.get('id')) for internship in internships], dtype=float)
+        rating = np.nan_to_num(snapshot.rating, nan=-np.inf)
+        stipend_desc = np.nan_to_num(stipend, nan=-np.inf)
+        self.orders = {
+            'relevance': rows,
+            'rating': np.lexsort((rows, -rating)),
+            'stipend': np.lexsort((rows, -stipend_desc)),
+            'recent': np.lexsort((rows, -np.nan_to_num(ids, nan=-np.inf))),
+            'company': np.array(sorted(rows, key=lambda row: (snapshot.companies[row], row)), dtype=np.intp),
+        }
+        self.ranks = {}
+        for sort, order in self.orders.items():
+            ranks = np.empty(self.size, dtype=np.intp)
+            ranks[order] = rows
+            self.ranks[sort] = ranks
+
+    @staticmethod
+    def _numeric_id(internship_id) -> float:
+        try:
+            return float(internship_id)
+        except (TypeError, ValueError):
+            return np.nan
+
+    def _facet_mask(self, facet: str, selected: List[str]) -> Optional[np.ndarray]:
+        """Rows whose facet value is one of the selected values (case-insensitive); None if unfiltered"""
+        if not selected:
+            return None
+        mask = np.zeros(self.size, dtype=bool)
+        for value in selected:
+            code = self.values[facet].get(str(value).lower())
+            if code is not None:
+                mask[self.postings[facet][code]] = True
+        return mask
+
+    def _stipend_mask(self, min_stipend: float = None, max_stipend: float = None) -> Optional[np.ndarray]:
+        if min_stipend is None and max_stipend is None:
+            return None
+        lo = 0 if min_stipend is None else np.searchsorted(self._stipend_sorted, min_stipend, side='left')
+        hi = len(self._stipend_sorted) if max_stipend is None else np.searchsorted(self._stipend_sorted, max_stipend, side='right')
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self._stipend_order[lo:hi]] = True
+        return mask
+
+    def _text_mask(self, q: str) -> Optional[np.ndarray]:
+        q = (q or '').strip().lower()
+        if not q:
+            return None
+        return np.fromiter((q in haystack for haystack in self._haystacks), dtype=bool, count=self.size)
+
+    def encode_cursor(self, sort: str, row: int) -> str:
+        """Opaque cursor pointing just after a row in a sort order"""
+        payload = {'v': self.snapshot.version, 's': sort, 'r': int(self.ranks[sort][row]),
+                   'id': self.snapshot.internships[row].get('id')}
+        return base64.urlsafe_b64encode(json.dumps(payload).encode('utf-8')).decode('ascii')
+
+    def _decode_cursor(self, cursor: str, sort: str) -> int:
+        """Rank to continue from; a cursor from an older catalog resumes after the same internship"""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            if payload['s'] != sort:
+                raise ValueError
+            if payload['v'] == self.snapshot.version:
+                return int(payload['r']) + 1
+            row = self.snapshot.positions.get(payload['id'])
+            return int(self.ranks[sort][row]) + 1 if row is not None else min(int(payload['r']), self.size)
+        except (ValueError, KeyError, TypeError):
+            raise ValueError('Invalid cursor')
+
+    def query(self, q: str = None, filters: Dict[str, List[str]] = None, min_stipend: float = None,
+              max_stipend: float = None, sort: str = 'relevance', limit: int = 9, cursor: str = None) -> Dict[str, Any]:
+        """
+        One page of matching internships plus facet counts
+
+        Facet counts for a field apply every filter except that field's own, so the counts show
+        what selecting another value of the field would return.
+        """
+        if sort not in self.orders:
+            raise ValueError(f"sort must be one of {', '.join(self.SORTS)}")
+        filters = filters or {}
+
+        base = np.ones(self.size, dtype=bool)
+        for mask in (self._text_mask(q), self._stipend_mask(min_stipend, max_stipend)):
+            if mask is not None:
+                base &= mask
+        facet_masks = {facet: self._facet_mask(facet, filters.get(facet)) for facet in self.FACETS}
+
+        matches = base.copy()
+        for mask in facet_masks.values():
+            if mask is not None:
+                matches &= mask
+
+        facets = {}
+        for facet in self.FACETS:
+            others = base.copy()
+            for other, mask in facet_masks.items():
+                if other != facet and mask is not None:
+                    others &= mask
+            counts = np.bincount(self.codes[facet][others], minlength=len(self.labels[facet]))
+            facets[facet] = [{'value': label, 'count': int(count)}
+                             for label, count in zip(self.labels[facet], counts) if count and label]
+            facets[facet].sort(key=lambda item: (-item['count'], item['value']))
+
+        start = self._decode_cursor(cursor, sort) if cursor else 0
+        order = self.orders[sort][start:]
+        selected = order[matches[order]]
+        page = selected[:limit]
+        has_more = len(selected) > limit
+
+        return {
+            'internships': [self.snapshot.internships[row].copy() for row in page],  # Plain dicts for JSON
+            'total': int(matches.sum()),
+            'facets': facets,
+            'sort': sort,
+            'limit': limit,
+            'has_more': has_more,
+            'next_cursor': self.encode_cursor(sort, page[-1]) if has_more else None,
+            'catalog_version': self.snapshot.version
+        }
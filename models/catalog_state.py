@@ -0,0 +1,46 @@
+from typing import List, Dict, Any
+
+
+class CatalogState:
+    """
+    Everything the recommender derives from one catalog version, published as one reference
+
+    A state is built in full before it is published and its fields are never reassigned. A
+    request that takes a single reference at entry therefore reads one consistent catalog (rows,
+    indexes, feature arrays and vectorizer) for its whole lifetime, even if a reload publishes a
+    newer state meanwhile. The only in-place updates are the live seat counts in quota_index.
+    """
+
+    __slots__ = (
+        'version', 'snapshot_version', 'checksum', 'internships', 'positions', 'keys',
+        # TF-IDF text features and numeric feature arrays (see models/model_artifacts.py)
+        'vectorizer', 'internship_features', 'internship_text_matrix',
+        'internship_numerical_features', 'internship_ai_features', 'ann_index',
+        # Rule-based scoring terms, factorized per distinct value
+        'sector_values', 'sector_codes', 'location_values', 'location_codes',
+        'diversity_sector_codes', 'company_codes', 'education_index', 'accepts_any_education',
+        'skill_index', 'inverted_index',
+        'quota_index',
+    )
+
+    def __init__(self, **fields: Any):
+        unknown = set(fields) - set(self.__slots__)
+        if unknown:
+            raise TypeError(f"Unknown catalog state fields: {sorted(unknown)}")
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields.get(name))
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"CatalogState is immutable; build a new state to change '{name}'")
+
+    def __len__(self) -> int:
+        return len(self.internships)
+
+    def get(self, internship_id) -> Dict:
+        """Catalog entry for an internship id, or None"""
+        row = self.positions.get(internship_id)
+        return self.internships[row] if row is not None else None
+
+    def values(self, field: str, default: Any = '') -> List[Any]:
+        """A field's value for every posting"""
+        return [internship.get(field, default) for internship in self.internships]
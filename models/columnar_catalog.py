@@ -0,0 +1,314 @@
+from collections.abc import Mapping, Sequence
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+import numpy as np
+
+
+# Fields stored as typed columns when every posting's value fits; anything else stays a per-row object column
+NUMERIC_FIELDS = ('stipend_amount', 'opportunities', 'filled_positions', 'rating', 'industry_capacity')
+CATEGORICAL_FIELDS = ('sector', 'location', 'work_mode', 'difficulty_level', 'company')
+LIST_FIELDS = ('skills_required', 'education_required')
+
+# Marks a field a posting does not have
+MISSING = object()
+
+
+class NumericColumn:
+    """float64 values plus a per-row kind (missing, int, float or None) so values round-trip exactly"""
+
+    __slots__ = ('values', 'kinds')
+
+    KIND_MISSING, KIND_INT, KIND_FLOAT, KIND_NONE = 0, 1, 2, 3
+
+    def __init__(self, values: np.ndarray, kinds: np.ndarray):
+        self.values = values
+        self.kinds = kinds
+
+    @classmethod
+    def build(cls, raw: List[Any]) -> Optional['NumericColumn']:
+        values = np.zeros(len(raw), dtype=float)
+        kinds = np.zeros(len(raw), dtype=np.uint8)
+        for row, value in enumerate(raw):
+            if value is MISSING:
+                continue
+            if value is None:
+                kinds[row] = cls.KIND_NONE
+            elif type(value) is int and abs(value) <= 2 ** 53:
+                values[row], kinds[row] = value, cls.KIND_INT
+            elif type(value) is float:
+                values[row], kinds[row] = value, cls.KIND_FLOAT
+            else:
+                return None
+        return cls(values, kinds)
+
+    def value(self, row: int) -> Any:
+        kind = self.kinds[row]
+        if kind == self.KIND_INT:
+            return int(self.values[row])
+        if kind == self.KIND_FLOAT:
+            return float(self.values[row])
+        return None if kind == self.KIND_NONE else MISSING
+
+    def array(self, default: float = np.nan) -> np.ndarray:
+        """Values as floats, `default` where a posting has no number"""
+        numeric = (self.kinds == self.KIND_INT) | (self.kinds == self.KIND_FLOAT)
+        return np.where(numeric, self.values, default)
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.kinds.nbytes
+
+
+class CategoricalColumn:
+    """int32 codes into a list of distinct values (-1 where missing); each distinct value is stored once"""
+
+    __slots__ = ('codes', 'values')
+
+    def __init__(self, codes: np.ndarray, values: List[Any]):
+        self.codes = codes
+        self.values = values
+
+    @classmethod
+    def build(cls, raw: List[Any]) -> Optional['CategoricalColumn']:
+        uniques: Dict[Any, int] = {}
+        codes = np.empty(len(raw), dtype=np.int32)
+        for row, value in enumerate(raw):
+            if value is MISSING:
+                codes[row] = -1
+                continue
+            try:
+                codes[row] = uniques.setdefault((type(value), value), len(uniques))
+            except TypeError:
+                return None  # Unhashable value
+        return cls(codes, [value for _, value in uniques])
+
+    def value(self, row: int) -> Any:
+        code = self.codes[row]
+        return self.values[code] if code >= 0 else MISSING
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes
+
+
+class ListColumn:
+    """CSR layout for list fields: row r's items are values[indices[indptr[r]:indptr[r + 1]]]"""
+
+    __slots__ = ('indptr', 'indices', 'values', 'present')
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, values: List[Any], present: np.ndarray):
+        self.indptr = indptr
+        self.indices = indices
+        self.values = values
+        self.present = present
+
+    @classmethod
+    def build(cls, raw: List[Any]) -> Optional['ListColumn']:
+        uniques: Dict[Any, int] = {}
+        indptr = np.zeros(len(raw) + 1, dtype=np.int64)
+        present = np.ones(len(raw), dtype=bool)
+        indices = []
+        for row, items in enumerate(raw):
+            if items is MISSING:
+                present[row] = False
+            elif type(items) is not list:
+                return None
+            else:
+                try:
+                    indices.extend(uniques.setdefault((type(item), item), len(uniques)) for item in items)
+                except TypeError:
+                    return None
+            indptr[row + 1] = len(indices)
+        return cls(indptr, np.array(indices, dtype=np.int32), [value for _, value in uniques], present)
+
+    def value(self, row: int) -> Any:
+        if not self.present[row]:
+            return MISSING
+        values = self.values
+        return [values[code] for code in self.indices[self.indptr[row]:self.indptr[row + 1]].tolist()]
+
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    @property
+    def nbytes(self) -> int:
+        return self.indptr.nbytes + self.indices.nbytes + self.present.nbytes
+
+
+class ObjectColumn:
+    """One Python object per row (MISSING where absent); equal strings share a single object"""
+
+    __slots__ = ('items',)
+
+    def __init__(self, items: List[Any]):
+        self.items = items
+
+    @classmethod
+    def build(cls, raw: List[Any]) -> 'ObjectColumn':
+        interned: Dict[str, str] = {}
+        return cls([interned.setdefault(value, value) if type(value) is str else value for value in raw])
+
+    def value(self, row: int) -> Any:
+        return self.items[row]
+
+    @property
+    def nbytes(self) -> int:
+        return 8 * len(self.items)
+
+
+class CatalogRow(Mapping):
+    """Read-only dict view of one posting; copy() returns a plain dict"""
+
+    __slots__ = ('_catalog', '_row')
+
+    def __init__(self, catalog: 'ColumnarCatalog', row: int):
+        self._catalog = catalog
+        self._row = row
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._catalog.value(self._row, key)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self._catalog.value(self._row, key)
+        return default if value is MISSING else value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._catalog.keys(self._row))
+
+    def __len__(self) -> int:
+        return len(self._catalog.keys(self._row))
+
+    def __contains__(self, key) -> bool:
+        return self._catalog.has(self._row, key)
+
+    def copy(self) -> Dict[str, Any]:
+        return self._catalog.row_dict(self._row)
+
+    def __repr__(self) -> str:
+        return f"CatalogRow({self.copy()!r})"
+
+
+class ColumnarCatalog(Sequence):
+    """
+    Internship catalog stored column by column
+
+    Numeric fields are float64 arrays, repeated categorical strings are int32 codes into one list
+    of distinct values, skill and education lists are CSR code arrays, and the remaining fields
+    are per-row object columns with equal strings shared. A field only gets a typed column when
+    every posting's value fits it. Indexing returns a lazy CatalogRow view, so code (and
+    templates) written against a list of dicts keeps working, and each posting's key order is
+    kept for exact round trips. Scans should read the columns directly through column().
+    """
+
+    def __init__(self, internships: Iterable[Dict]):
+        internships = internships if isinstance(internships, list) else list(internships)
+        self.size = len(internships)
+
+        layouts: Dict[Tuple[str, ...], int] = {}
+        self.layout_codes = np.empty(self.size, dtype=np.int32)
+        raw: Dict[str, List[Any]] = {}
+        for row, internship in enumerate(internships):
+            layout = tuple(internship)
+            self.layout_codes[row] = layouts.setdefault(layout, len(layouts))
+            for key in layout:
+                if key not in raw:
+                    raw[key] = [MISSING] * self.size
+                raw[key][row] = internship[key]
+        self.layouts = list(layouts)
+        self._layout_keys = [frozenset(layout) for layout in self.layouts]
+
+        self.columns: Dict[str, Any] = {}
+        for key, values in raw.items():
+            column = None
+            if key in NUMERIC_FIELDS:
+                column = NumericColumn.build(values)
+            elif key in CATEGORICAL_FIELDS:
+                column = CategoricalColumn.build(values)
+            elif key in LIST_FIELDS:
+                column = ListColumn.build(values)
+            self.columns[key] = column if column is not None else ObjectColumn.build(values)
+
+    def value(self, row: int, key: str) -> Any:
+        """A posting's value for a field, or MISSING"""
+        column = self.columns.get(key)
+        return column.value(row) if column is not None else MISSING
+
+    def keys(self, row: int) -> Tuple[str, ...]:
+        return self.layouts[self.layout_codes[row]]
+
+    def has(self, row: int, key: str) -> bool:
+        return key in self._layout_keys[self.layout_codes[row]]
+
+    def row_dict(self, row: int) -> Dict[str, Any]:
+        """A posting as a new plain dict, keys in their original order"""
+        columns = self.columns
+        return {key: columns[key].value(row) for key in self.keys(row)}
+
+    def column(self, key: str):
+        """The column holding a field (NumericColumn, CategoricalColumn, ListColumn or ObjectColumn), or None"""
+        return self.columns.get(key)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return [self.row_dict(row) for row in range(self.size)]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held in column arrays (and object column slots); shared values are not counted"""
+        return self.layout_codes.nbytes + sum(column.nbytes for column in self.columns.values())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [CatalogRow(self, row) for row in range(*index.indices(self.size))]
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError('catalog index out of range')
+        return CatalogRow(self, int(index))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[CatalogRow]:
+        return (CatalogRow(self, row) for row in range(self.size))
+
+
+# Column scans that also accept a plain list of dicts (e.g. a catalog passed in directly)
+
+def numeric_field(internships: Sequence, field: str, default: float) -> np.ndarray:
+    """float values of a field, `default` where missing (as internship.get(field, default) would give)"""
+    column = internships.column(field) if isinstance(internships, ColumnarCatalog) else None
+    if isinstance(column, NumericColumn):
+        kinds = column.kinds
+        values = np.where(kinds == NumericColumn.KIND_MISSING, default, column.values)
+        return np.where(kinds == NumericColumn.KIND_NONE, np.nan, values)
+    return np.array([internship.get(field, default) for internship in internships], dtype=float).reshape(len(internships))
+
+
+def list_lengths(internships: Sequence, field: str) -> np.ndarray:
+    """Length of a list field per posting (0 where missing)"""
+    column = internships.column(field) if isinstance(internships, ColumnarCatalog) else None
+    if isinstance(column, ListColumn):
+        return column.lengths()
+    return np.array([len(internship.get(field, [])) for internship in internships], dtype=np.intp)
+
+
+def factorize_field(internships: Sequence, field: str, default: Any = None, transform=None):
+    """
+    (distinct values, int codes) of transform(internship.get(field, default)) per posting
+
+    For a categorical column the transform runs once per distinct value instead of once per posting.
+    """
+    transform = transform or (lambda value: value)
+    column = internships.column(field) if isinstance(internships, ColumnarCatalog) else None
+    if isinstance(column, CategoricalColumn):
+        source_values = column.values + [default]  # Code -1 (missing) reads the last entry
+        source_codes = column.codes
+    else:
+        source_values = [internship.get(field, default) for internship in internships]
+        source_codes = np.arange(len(source_values))
+
+    uniques: Dict[Any, int] = {}
+    remap = np.array([uniques.setdefault(transform(value), len(uniques)) for value in source_values], dtype=np.intp)
+    return list(uniques), remap[source_codes]
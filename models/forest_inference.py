@@ -0,0 +1,81 @@
+import numpy as np
+
+
+class CompiledForest:
+    """
+    Flat-array inference for a fitted RandomForestRegressor and its StandardScaler
+
+    Every tree's nodes are concatenated into single feature / threshold / children / value
+    arrays (child indices are absolute and interleaved as [left, right] per node), so a batch is
+    evaluated for all trees at once: each step advances every (row, tree) pair that has not yet
+    reached a leaf by one level, and the active set shrinks as paths finish. Inputs are scaled
+    and cast to float32 exactly as scikit-learn does, so predictions match
+    RandomForestRegressor.predict. The per-call cost is a handful of NumPy operations, which
+    beats scikit-learn's validation and per-tree dispatch on request-sized batches.
+    """
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, children: np.ndarray, value: np.ndarray,
+                 roots: np.ndarray, mean: np.ndarray = None, scale: np.ndarray = None):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.roots = roots
+        self.is_leaf = children[0::2] == np.arange(len(feature))
+        self.mean = mean
+        self.scale = scale
+
+    @classmethod
+    def from_sklearn(cls, model, scaler=None) -> 'CompiledForest':
+        """Compile a fitted single-output forest regressor (and optional fitted StandardScaler)"""
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        sizes = np.array([tree.node_count for tree in trees], dtype=np.int64)
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+        feature, threshold, children, value = [], [], [], []
+        for tree, offset in zip(trees, offsets):
+            nodes = np.arange(tree.node_count, dtype=np.int64)
+            is_leaf = tree.children_left < 0
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+            # Leaves point back to themselves
+            left = np.where(is_leaf, nodes, tree.children_left) + offset
+            right = np.where(is_leaf, nodes, tree.children_right) + offset
+            children.append(np.column_stack([left, right]).ravel())
+            value.append(tree.value[:, 0, 0])
+
+        return cls(
+            feature=np.concatenate(feature).astype(np.intp),
+            threshold=np.concatenate(threshold),
+            children=np.concatenate(children).astype(np.intp),
+            value=np.concatenate(value),
+            roots=offsets.astype(np.intp),
+            mean=scaler.mean_ if scaler is not None and scaler.with_mean else None,
+            scale=scaler.scale_ if scaler is not None and scaler.with_std else None
+        )
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Mean tree prediction for each row of an unscaled (n_rows x n_features) matrix"""
+        X = np.asarray(X, dtype=float)
+        if self.mean is not None:
+            X = X - self.mean
+        if self.scale is not None:
+            X = X / self.scale
+        X = np.ascontiguousarray(X, dtype=np.float32)
+
+        n_rows, n_features = X.shape
+        n_trees = len(self.roots)
+        values = X.ravel()
+        nodes = np.tile(self.roots, n_rows)                              # One path per (row, tree)
+        row_offsets = np.repeat(np.arange(n_rows) * n_features, n_trees)  # Start of each path's row in `values`
+        active = np.flatnonzero(~self.is_leaf[nodes])
+        while len(active):
+            current = nodes[active]
+            go_right = values[row_offsets[active] + self.feature[current]] > self.threshold[current]
+            current = self.children[2 * current + go_right]
+            nodes[active] = current
+            active = active[~self.is_leaf[current]]
+        return self.value[nodes].reshape(n_rows, n_trees).mean(axis=1)
+
+    def __len__(self) -> int:
+        return len(self.roots)
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import List, Dict, Any, Optional
+import joblib
+import numpy as np
+from scipy import sparse
+
+
+# Bump when the layout or meaning of any artifact file changes
+SCHEMA_VERSION = 1
+
+# Catalog-derived arrays saved as .npy, loaded memory-mapped
+DENSE_ARRAYS = ('internship_numerical_features', 'internship_ai_features')
+
+# Catalog-derived CSR matrices, saved as data/indices/indptr .npy triples
+SPARSE_MATRICES = ('internship_features', 'internship_text_matrix')
+
+
+def catalog_checksum(internships: List[Dict]) -> str:
+    """Content hash of a catalog; catalog-derived artifacts are only reused for the same hash"""
+    # Hashed row by row (same bytes as dumping the whole list) so a columnar catalog is never materialized
+    digest = hashlib.sha256(b'[')
+    for row, internship in enumerate(internships):
+        if row:
+            digest.update(b', ')
+        digest.update(json.dumps(dict(internship), sort_keys=True, ensure_ascii=False, default=str).encode('utf-8'))
+    digest.update(b']')
+    return digest.hexdigest()
+
+
+class ModelArtifactStore:
+    """
+    Versioned on-disk recommender artifacts
+
+    Each save writes a new directory under `root` holding the fitted vectorizer, scaler and model
+    (joblib, uncompressed so their NumPy arrays can be memory-mapped), the TF-IDF matrices and
+    numeric feature arrays as .npy files, and a manifest.json with the schema version and the
+    checksum of the catalog the arrays were built from. The CURRENT file names the live version
+    and is replaced atomically, so readers never see a half-written artifact. Arrays are loaded
+    with mmap_mode='r': worker processes loading the same version share the page cache.
+
+    Version names start with a nanosecond timestamp, and pruning orders versions by their
+    manifest's created_at. Versions younger than `prune_grace` seconds are never pruned, so a
+    worker that has just read a manifest can still load it after another worker saves.
+    """
+
+    def __init__(self, root: str = os.path.join('data', 'model'), keep: int = 2, prune_grace: float = 3600.0):
+        self.root = root
+        self.keep = max(1, keep)
+        self.prune_grace = prune_grace
+
+    @property
+    def _current_path(self) -> str:
+        return os.path.join(self.root, 'CURRENT')
+
+    def current_version(self) -> Optional[str]:
+        try:
+            with open(self._current_path, 'r', encoding='utf-8') as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def manifest(self, version: str = None) -> Optional[Dict[str, Any]]:
+        """Manifest of a version (default: current); None if missing or of another schema"""
+        version = version or self.current_version()
+        if version is None:
+            return None
+        try:
+            with open(os.path.join(self.root, version, 'manifest.json'), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return manifest if manifest.get('schema_version') == SCHEMA_VERSION else None
+
+    def save(self, model_version: str, catalog_checksum: str, objects: Dict[str, Any], arrays: Dict[str, Any],
+             metadata: Dict[str, Any] = None) -> str:
+        """
+        Write a new artifact version and make it current
+
+        Args:
+            model_version: trained_at stamp of the model
+            catalog_checksum: checksum of the catalog the arrays were built from
+            objects: name -> fitted estimator (vectorizer, scaler, model)
+            arrays: name -> dense ndarray or sparse matrix (see DENSE_ARRAYS / SPARSE_MATRICES)
+            metadata: JSON-serializable extras (e.g. the training checkpoint)
+        """
+        now_ns = time.time_ns()
+        version = f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime(now_ns // 10**9))}.{now_ns % 10**9:09d}Z-{os.getpid()}"
+        tmp_dir = os.path.join(self.root, f".{version}.tmp")
+        os.makedirs(tmp_dir)
+
+        files = {}
+        for name, obj in objects.items():
+            files[name] = f"{name}.joblib"
+            joblib.dump(obj, os.path.join(tmp_dir, files[name]))
+        for name, array in arrays.items():
+            if sparse.issparse(array):
+                csr = array.tocsr()
+                for part in ('data', 'indices', 'indptr'):
+                    np.save(os.path.join(tmp_dir, f"{name}.{part}.npy"), getattr(csr, part))
+                files[name] = {'sparse': list(csr.shape)}
+            else:
+                files[name] = f"{name}.npy"
+                np.save(os.path.join(tmp_dir, files[name]), np.ascontiguousarray(array))
+
+        manifest = {
+            'schema_version': SCHEMA_VERSION,
+            'version': version,
+            'model_version': model_version,
+            'catalog_checksum': catalog_checksum,
+            'created_at': now_ns / 1e9,
+            'files': files,
+            'metadata': metadata or {}
+        }
+        with open(os.path.join(tmp_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_dir, os.path.join(self.root, version))
+
+        tmp_current = f"{self._current_path}.{os.getpid()}.tmp"
+        with open(tmp_current, 'w', encoding='utf-8') as f:
+            f.write(version)
+        os.replace(tmp_current, self._current_path)
+        self._prune(version)
+        return version
+
+    def versions(self) -> List[Dict[str, Any]]:
+        """Manifests of every readable version of this schema, newest first"""
+        if not os.path.isdir(self.root):
+            return []
+        manifests = []
+        for name in os.listdir(self.root):
+            if not name.startswith('.') and os.path.isdir(os.path.join(self.root, name)):
+                manifest = self.manifest(name)
+                if manifest is not None:
+                    manifests.append(manifest)
+        return sorted(manifests, key=lambda manifest: manifest.get('created_at', 0), reverse=True)
+
+    def _prune(self, current: str):
+        """Remove all but the newest `keep` versions (never the current one, nor any within the grace period)"""
+        cutoff = time.time() - self.prune_grace
+        readable = self.versions()
+        stale = [manifest['version'] for manifest in readable[self.keep:] if manifest.get('created_at', 0) < cutoff]
+        # Directories without a readable manifest (older schemas, failed writes) go once past the grace period
+        names = {manifest['version'] for manifest in readable}
+        stale += [name for name in os.listdir(self.root)
+                  if not name.startswith('.') and name not in names and os.path.isdir(os.path.join(self.root, name))
+                  and os.path.getmtime(os.path.join(self.root, name)) < cutoff]
+        for name in stale:
+            if name != current:
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+
+    def load_objects(self, manifest: Dict[str, Any], names) -> Dict[str, Any]:
+        """Fitted estimators of a version, with their arrays memory-mapped"""
+        directory = os.path.join(self.root, manifest['version'])
+        return {name: joblib.load(os.path.join(directory, manifest['files'][name]), mmap_mode='r') for name in names}
+
+    def load_arrays(self, manifest: Dict[str, Any]) -> Dict[str, Any]:
+        """Catalog-derived arrays of a version, memory-mapped read-only"""
+        directory = os.path.join(self.root, manifest['version'])
+        arrays = {}
+        for name in DENSE_ARRAYS + SPARSE_MATRICES:
+            entry = manifest['files'][name]
+            if isinstance(entry, dict):
+                parts = [np.load(os.path.join(directory, f"{name}.{part}.npy"), mmap_mode='r')
+                         for part in ('data', 'indices', 'indptr')]
+                arrays[name] = sparse.csr_matrix(tuple(parts), shape=tuple(entry['sparse']), copy=False)
+            else:
+                arrays[name] = np.load(os.path.join(directory, entry), mmap_mode='r')
+        return arrays
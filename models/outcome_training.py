@@ -0,0 +1,104 @@
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+import numpy as np
+from models.candidate import profile_to_candidate
+
+
+# Training label per application status: how good a match the application turned out to be
+OUTCOME_SCORES = {
+    'saved': 45.0,
+    'applied': 55.0,
+    'screening': 60.0,
+    'shortlisted': 75.0,
+    'interviewed': 80.0,
+    'accepted': 100.0,
+    'selected': 100.0,
+    'withdrawn': 30.0,
+    'rejected': 20.0,
+}
+
+# Timestamps that mark a change to an application record
+EVENT_TIME_FIELDS = ('updated_at', 'last_updated', 'saved_at', 'applied_at', 'applied_date')
+
+
+def event_time(record: Dict[str, Any]) -> str:
+    """Time of the latest change to an application record (ISO strings compare chronologically)"""
+    return max((str(record[field]) for field in EVENT_TIME_FIELDS if record.get(field)), default='')
+
+
+class OutcomeEvents:
+    """
+    (features, outcome) training rows from real application records
+
+    Application records (as normalized by ApplicationLedger) are joined with the applicant's
+    profile and the internship's catalog row, giving exactly the feature vector the model sees
+    when serving, labelled with the OUTCOME_SCORES value of the record's current status. A
+    checkpoint (latest event time plus the ids seen at that time) selects the records that
+    changed since the previous training run.
+    """
+
+    def __init__(self, recommender, users: Dict[str, Dict]):
+        self.recommender = recommender
+        self.users = users
+        self.skipped = 0  # Records that could not be joined or featurized
+
+    @staticmethod
+    def since(records: Iterable[Dict], checkpoint: Optional[Dict] = None) -> List[Dict]:
+        """Records with an outcome label that changed after the checkpoint, oldest first"""
+        watermark = (checkpoint or {}).get('watermark', '')
+        seen = set((checkpoint or {}).get('ids_at_watermark', ()))
+        new = [record for record in records if record.get('status') in OUTCOME_SCORES and
+               (event_time(record) > watermark or (event_time(record) == watermark and record['id'] not in seen))]
+        return sorted(new, key=event_time)
+
+    @staticmethod
+    def checkpoint_after(records: List[Dict], previous: Optional[Dict] = None) -> Optional[Dict]:
+        """Checkpoint covering `records` (sorted by event time) on top of the previous one"""
+        if not records:
+            return previous
+        watermark = event_time(records[-1])
+        ids = [record['id'] for record in records if event_time(record) == watermark]
+        if previous and previous.get('watermark') == watermark:
+            ids = list(previous.get('ids_at_watermark', ())) + ids
+        return {'watermark': watermark, 'ids_at_watermark': ids}
+
+    def _catalog_row(self, internship_id) -> Optional[int]:
+        positions = self.recommender._catalog_positions
+        row = positions.get(internship_id)
+        if row is None and isinstance(internship_id, str) and internship_id.isdigit():
+            row = positions.get(int(internship_id))
+        return row
+
+    def rows(self, records: Iterable[Dict], chunk_rows: int = 50000) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Stream (X, y) chunks for the records that join to a profile and a catalog internship"""
+        features, outcomes = [], []
+        candidates: Dict[str, Optional[np.ndarray]] = {}
+        for record in records:
+            email = record.get('email')
+            if email not in candidates:
+                profile = (self.users.get(email) or {}).get('profile')
+                try:
+                    candidate = profile_to_candidate(profile) if profile else None
+                    candidates[email] = (np.asarray(self.recommender._extract_candidate_features(candidate), dtype=float)
+                                         if candidate else None)
+                except (TypeError, ValueError):
+                    candidates[email] = None
+            row = self._catalog_row(record.get('internship_id'))
+            if candidates[email] is None or row is None:
+                self.skipped += 1
+                continue
+
+            features.append(np.concatenate([candidates[email], self.recommender.internship_ai_features[row]]))
+            outcomes.append(OUTCOME_SCORES[record['status']])
+            if len(features) == chunk_rows:
+                yield np.array(features), np.array(outcomes)
+                features, outcomes = [], []
+        if features:
+            yield np.array(features), np.array(outcomes)
+
+    def matrix(self, records: Iterable[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """All rows for the records as one feature matrix and outcome vector"""
+        chunks = list(self.rows(records))
+        if not chunks:
+            width = len(self.recommender._extract_candidate_features({})) + self.recommender.internship_ai_features.shape[1]
+            return np.empty((0, width)), np.empty(0)
+        return np.vstack([X for X, _ in chunks]), np.concatenate([y for _, y in chunks])
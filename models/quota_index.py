@@ -0,0 +1,115 @@
+from typing import List, Dict, Any, Iterable, Tuple
+import numpy as np
+
+
+SOCIAL_CATEGORIES = ('GENERAL', 'SC', 'ST', 'OBC')
+DISTRICT_TYPES = ('Urban', 'Rural')
+
+# Reserved seat buckets, as `<bucket>_quota` / `<bucket>_filled` in an internship's affirmative_action
+QUOTA_BUCKETS = ('sc', 'st', 'obc', 'rural')
+
+# Score bonus where a candidate can take a reserved seat
+RESERVED_PRIORITY = 10
+
+
+def open_reserved_seats(internship: Dict, bucket: str, live_fills: Dict[str, int] = None) -> float:
+    """
+    Unfilled reserved seats of a quota bucket at one posting, as QuotaIndex.open_seats counts them
+
+    For callers without an index (e.g. CapacityTracker choosing the bucket of a fill);
+    `live_fills` are the posting's fills per bucket recorded since the catalog was written.
+    """
+    live_fills = live_fills or {}
+    quota = internship.get('affirmative_action') or {}
+    available = (internship.get('opportunities', 0) or 0) - (internship.get('filled_positions', 0) or 0) - sum(live_fills.values())
+    reserved = quota.get(f'{bucket}_quota', 0) - quota.get(f'{bucket}_filled', 0) - live_fills.get(bucket, 0)
+    return max(0.0, min(reserved, available))
+
+
+class QuotaIndex:
+    """
+    Affirmative action eligibility masks and priority vectors for one catalog version
+
+    Every posting with available positions stays open to every candidate, as in the original
+    filter; quotas only change the ranking. A candidate gets RESERVED_PRIORITY where one of
+    their reserved buckets still has open seats (quota minus filled, bounded by the available
+    positions), and postings that declare no quotas keep the flat SC/ST/OBC priority. The rural
+    quota is horizontal (a rural SC candidate fills an SC seat and a rural seat at once), so the
+    buckets are judged independently and never summed into a reserved total. Unfilled reserved
+    seats are released to general candidates, as AllocationEngine does. One mask and one
+    priority vector per (social category, district type) combination are precomputed, so a
+    request selects its pair in O(1). Positions filled in the app (see CapacityTracker) are
+    applied on top of the catalog's counts, and record_fill updates only the affected posting's
+    entries.
+    """
+
+    def __init__(self, internships: List[Dict], live_fills: Dict[str, Dict[str, int]] = None):
+        self.size = len(internships)
+        self.opportunities = np.array([internship.get('opportunities', 0) or 0 for internship in internships], dtype=float)
+        filled = np.array([internship.get('filled_positions', 0) or 0 for internship in internships], dtype=float)
+        self.available = self.opportunities - filled  # Always current: live fills are applied in place
+
+        quotas = [internship.get('affirmative_action') or {} for internship in internships]
+        self.declares_quotas = np.array([bool(quota) for quota in quotas], dtype=bool)
+        self.quota = {bucket: np.array([quota.get(f'{bucket}_quota', 0) for quota in quotas], dtype=float)
+                      for bucket in QUOTA_BUCKETS}
+        self.filled = {bucket: np.array([quota.get(f'{bucket}_filled', 0) for quota in quotas], dtype=float)
+                       for bucket in QUOTA_BUCKETS}
+
+        # Fills recorded since the catalog was written, keyed by str(internship id)
+        for row, internship in enumerate(internships):
+            for bucket, count in (live_fills or {}).get(str(internship.get('id')), {}).items():
+                self.available[row] -= count
+                if bucket in self.filled:
+                    self.filled[bucket][row] += count
+        filled = self.opportunities - self.available
+        self.utilization = np.divide(filled * 100, self.opportunities, out=np.zeros(self.size), where=self.opportunities > 0)
+
+        self.masks: Dict[Tuple[str, str], np.ndarray] = {}
+        self.priorities: Dict[Tuple[str, str], np.ndarray] = {}
+        for category in SOCIAL_CATEGORIES:
+            for district in DISTRICT_TYPES:
+                self.masks[(category, district)] = np.zeros(self.size, dtype=bool)
+                self.priorities[(category, district)] = np.zeros(self.size, dtype=np.int64)
+        self._rebuild(np.arange(self.size))
+
+    @staticmethod
+    def key(candidate_data: Dict[str, Any]) -> Tuple[str, str]:
+        """(social category, district type) of a candidate; unknown values count as General / Urban"""
+        category = str(candidate_data.get('social_category') or 'General').upper()
+        district = 'Rural' if candidate_data.get('district_type') == 'Rural' else 'Urban'
+        return (category if category in SOCIAL_CATEGORIES else 'GENERAL', district)
+
+    def _rebuild(self, rows: np.ndarray):
+        """Recompute the mask and priority entries of some postings from the current counts"""
+        open_rows = self.available[rows] > 0
+        bucket_open = {bucket: (self.quota[bucket][rows] - self.filled[bucket][rows] > 0) & open_rows
+                       for bucket in QUOTA_BUCKETS}
+        legacy = ~self.declares_quotas[rows] & open_rows
+
+        for (category, district), mask in self.masks.items():
+            mask[rows] = open_rows
+            priority = np.zeros(len(rows), dtype=bool)
+            if category != 'GENERAL':
+                priority |= bucket_open[category.lower()] | legacy
+            if district == 'Rural':
+                priority |= bucket_open['rural']
+            self.priorities[(category, district)][rows] = np.where(priority, RESERVED_PRIORITY, 0)
+
+    def select(self, candidate_data: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """Eligibility mask and priority vector over the catalog for a candidate"""
+        key = self.key(candidate_data)
+        return self.masks[key], self.priorities[key]
+
+    def open_seats(self, row: int, bucket: str) -> float:
+        """Unfilled reserved seats of a quota bucket at a posting (bounded by its available positions)"""
+        return max(0.0, min(self.quota[bucket][row] - self.filled[bucket][row], self.available[row]))
+
+    def record_fill(self, row: int, buckets: Iterable[str] = (), delta: int = 1):
+        """Count a seat taken (delta=1) or released (delta=-1) at a posting, in the given quota buckets"""
+        self.available[row] -= delta
+        if self.opportunities[row] > 0:
+            self.utilization[row] = (self.opportunities[row] - self.available[row]) * 100 / self.opportunities[row]
+        for bucket in buckets:
+            self.filled[bucket][row] += delta
+        self._rebuild(np.array([row]))
@@ -0,0 +1,131 @@
+import os
+import threading
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+import numpy as np
+
+
+# Score fields kept per stored recommendation, in column order
+SCORE_FIELDS = ('ai_match_score', 'ai_raw_score', 'rule_score')
+
+
+class RecommendationStore:
+    """
+    Compact on-disk store of precomputed recommendations
+
+    One .npz file holds, per user, the recommended internship ids and their score fields as
+    fixed-width NumPy arrays, plus the profile stamp the recommendations were computed from.
+    The catalog checksum and model version of the run are stored too; a read against another
+    catalog or model, or one that finds a recommended posting full, falls back to live scoring.
+    Internship dicts are rebuilt from the live catalog when read, so the file stays small.
+    """
+
+    def __init__(self, path: str = os.path.join('data', 'recommendations.npz')):
+        self.path = path
+        self._lock = threading.Lock()
+        self._loaded_stat = None
+        self._rows: Dict[str, int] = {}
+        self._data: Dict[str, np.ndarray] = {}
+
+    @staticmethod
+    def profile_stamp(user: Dict[str, Any]) -> str:
+        """Identifies the profile version recommendations were computed from"""
+        return str(user.get('updated_at') or user.get('created_at') or '')
+
+    def write(self, results: Dict[str, tuple], k: int, versions: Dict[str, Any] = None):
+        """
+        Atomically replace the store
+
+        Args:
+            results: email -> (profile_stamp, list of recommendation dicts)
+            k: Recommendations kept per user
+            versions: catalog_checksum and model_version the results were scored with
+        """
+        versions = versions or {}
+        emails = list(results)
+        ids = np.full((len(emails), k), -1, dtype=np.int64)
+        scores = np.zeros((len(emails), k, len(SCORE_FIELDS)), dtype=np.float32)
+        counts = np.zeros(len(emails), dtype=np.int16)
+        stamps = []
+
+        for row, email in enumerate(emails):
+            stamp, recommendations = results[email]
+            stamps.append(stamp)
+            recommendations = recommendations[:k]
+            counts[row] = len(recommendations)
+            for col, rec in enumerate(recommendations):
+                ids[row, col] = rec['id']
+                scores[row, col] = [rec.get(field, 0) for field in SCORE_FIELDS]
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, emails=np.array(emails, dtype=str), stamps=np.array(stamps, dtype=str),
+                     ids=ids, scores=scores, counts=counts,
+                     catalog_checksum=np.array(versions.get('catalog_checksum') or ''),
+                     model_version=np.array(versions.get('model_version') or ''),
+                     generated_at=np.array(datetime.now().isoformat()))
+        os.replace(tmp_path, self.path)
+
+    def _refresh(self):
+        """Reload the file when it has been replaced since the last read"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            self._loaded_stat, self._rows, self._data = None, {}, {}
+            return
+
+        key = (stat.st_mtime_ns, stat.st_size)
+        if key == self._loaded_stat:
+            return
+        with np.load(self.path) as npz:
+            data = {name: npz[name] for name in npz.files}
+        self._rows = {email: row for row, email in enumerate(data['emails'].tolist())}
+        self._data = data
+        self._loaded_stat = key
+
+    def get(self, email: str, profile_stamp: str, catalog_lookup, versions: Dict[str, Any] = None,
+            available_lookup=None) -> Optional[List[Dict]]:
+        """
+        Stored recommendations for a user, or None when they should be scored live instead
+
+        That is when they are missing, computed from an older profile, scored against another
+        catalog or model than `versions`, or include a posting with no positions left.
+
+        Args:
+            catalog_lookup: Callable mapping an internship id to its catalog dict (or None)
+            versions: Live catalog_checksum and model_version
+            available_lookup: Callable mapping an internship id to its live available positions
+        """
+        with self._lock:
+            self._refresh()
+            row = self._rows.get(email)
+            if row is None or str(self._data['stamps'][row]) != profile_stamp:
+                return None
+            for field, live in (versions or {}).items():
+                stored = str(self._data[field]) if field in self._data else ''
+                if stored != str(live or ''):
+                    return None
+            ids = self._data['ids'][row, :self._data['counts'][row]]
+            scores = self._data['scores'][row]
+
+        recommendations = []
+        for col, internship_id in enumerate(ids.tolist()):
+            internship = catalog_lookup(internship_id)
+            if internship is None:
+                return None  # Catalog changed underneath the store
+            rec = internship.copy()
+            if available_lookup is not None:
+                available = available_lookup(internship_id)
+                if available is None or available <= 0:
+                    return None  # Filled up since the run
+                rec['available_positions'] = int(available)
+            rec.update({field: float(scores[col, i]) for i, field in enumerate(SCORE_FIELDS)})
+            recommendations.append(rec)
+        return recommendations
+
+    def generated_at(self) -> Optional[str]:
+        """When the current store was written"""
+        with self._lock:
+            self._refresh()
+            return str(self._data['generated_at']) if self._data else None
@@ -1,15 +1,31 @@
 import json
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.preprocessing import StandardScaler
+from sklearn.preprocessing import StandardScaler, normalize
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import train_test_split
 import numpy as np
 import pickle
+import hashlib
+import copy
+import time
 from datetime import datetime
+from models.skill_index import SkillIndex
+from models.retrieval import InvertedIndex
+from models.cache import TTLCache
+from models.catalog import CatalogService
+from models.ann_index import IVFIndex
+from models.forest_inference import CompiledForest
+from models.quota_index import QuotaIndex
+from models.capacity import CapacityTracker
+from models.score_records import ScoreRecords
+from models.catalog_state import CatalogState
+from models.columnar_catalog import numeric_field, list_lengths, factorize_field
+from models.training_data import SyntheticTrainingData
+from models.model_artifacts import ModelArtifactStore, catalog_checksum, DENSE_ARRAYS, SPARSE_MATRICES
+import threading
 
 class AIInternshipRecommender:
     """
@@ -18,33 +34,168 @@ class AIInternshipRecommender:
     Optimized for lightweight deployment on platforms like Railway
     """
     
-    def __init__(self):
-        self.internships_data = self._load_internships_data()
+    # Number of top recommendations that get sector/company diversity adjustments
+    DIVERSITY_WINDOW = 5
+    
+    # Upper bound on candidate x internship rows scored per predict call in batch mode
+    BATCH_CHUNK_ROWS = 100000
+    
+    # Synthetic training set size and seed for models trained at startup, and training parallelism
+    TRAINING_ROWS = 1000
+    TRAINING_SEED = 42
+    TRAINING_JOBS = -1
+    
+    # Column of the internship AI features holding available positions (live, from quota_index)
+    AVAILABLE_FEATURE = 2
+    
+    # Largest batch scored with the flat-array forest (models/forest_inference.py); bigger
+    # batches go to scikit-learn, which is faster once per-call overhead no longer dominates
+    COMPILED_PREDICT_MAX_ROWS = 1024
+    
+    # Candidate generators for the retrieval stage
+    CANDIDATE_GENERATORS = ('inverted', 'ann')
+    
+    # TF-IDF vectorizer settings (reduced features for storage efficiency)
+    VECTORIZER_PARAMS = {'stop_words': 'english', 'max_features': 500}
+    
+    # Recommender attributes that read a field of the current CatalogState (see __getattr__)
+    STATE_ATTRIBUTES = {
+        'internships_data': 'internships', '_catalog_version': 'version', '_catalog_checksum': 'checksum',
+        '_catalog_positions': 'positions', '_catalog_keys': 'keys', 'vectorizer': 'vectorizer',
+        'internship_features': 'internship_features', 'internship_text_matrix': 'internship_text_matrix',
+        'internship_numerical_features': 'internship_numerical_features',
+        'internship_ai_features': 'internship_ai_features', 'ann_index': 'ann_index',
+        'skill_index': 'skill_index', 'education_index': 'education_index', 'inverted_index': 'inverted_index',
+        'quota_index': 'quota_index'
+    }
+    
+    def __init__(self, retrieval_limit: int = 500, retrieval_min_candidates: int = 20, catalog: CatalogService = None,
+                 candidate_generator: str = 'inverted', ann_probes: int = 4,
+                 ann_index_path: str = os.path.join('data', 'ann_index.npz'), background: bool = False,
+                 artifact_dir: str = os.path.join('data', 'model'), capacity: CapacityTracker = None):
+        # Candidate retrieval: score at most retrieval_limit postings, falling back to the
+        # full catalog when fewer than retrieval_min_candidates share a token with the candidate
+        self.retrieval_limit = retrieval_limit
+        self.retrieval_min_candidates = retrieval_min_candidates
+        # 'inverted' retrieves by token overlap, 'ann' by TF-IDF similarity through the IVF index;
+        # ann_probes trades recall for latency
+        if candidate_generator not in self.CANDIDATE_GENERATORS:
+            raise ValueError(f"candidate_generator must be one of {self.CANDIDATE_GENERATORS}")
+        self.candidate_generator = candidate_generator
+        self.ann_probes = ann_probes
+        self.ann_index_path = ann_index_path
+        # Shared catalog; derived structures are rebuilt off the request path when it publishes a
+        # new version, and published as one CatalogState reference that each request reads once
+        self.catalog = catalog or CatalogService(fallback=self._create_enhanced_sample_data)
+        self._state: CatalogState = None
+        self._reload_lock = threading.Lock()  # Schedules catalog checks
+        self._rebuild_lock = threading.Lock()  # Serializes catalog rebuilds
+        self._reloader = None
+        self._catalog_checked_at = time.monotonic()
         self.applications_data = self._load_applications_data()
-        self.vectorizer = TfidfVectorizer(stop_words='english', max_features=500)  # Reduced for storage
         self.scaler = StandardScaler()
         self.ml_model = RandomForestRegressor(n_estimators=50, random_state=42)  # Lightweight model
-        self.model_path = 'data/ai_model.pkl'
-        self._prepare_data()
-        self._load_or_train_model()
-    
-    def _load_internships_data(self) -> List[Dict]:
-        """Load internship data from JSON file with enhanced fields for AI matching"""
-        data_file = os.path.join('data', 'internships.json')
-        
-        if not os.path.exists(data_file):
-            # Create sample data if file doesn't exist
-            sample_data = self._create_enhanced_sample_data()
-            with open(data_file, 'w', encoding='utf-8') as f:
-                json.dump(sample_data, f, indent=2, ensure_ascii=False)
-            return sample_data
+        self.model_path = 'data/ai_model.pkl'  # Legacy pickle, migrated into the artifact store
+        # Versioned, memory-mappable model + catalog arrays (see models/model_artifacts.py)
+        self.artifacts = ModelArtifactStore(artifact_dir)
+        self._artifact_manifest = self.artifacts.manifest()
+        self.model_version = None
+        self.training_checkpoint = None  # Last application event the model has learned from
+        self._compiled_forest = None  # (model, scaler, CompiledForest) used by predict_scores
+        # Live fills from applications; QuotaIndex applies them and the capacity filter reads its arrays.
+        # The tracker picks each fill's bucket from the same catalog's quotas.
+        self.capacity = capacity
+        if capacity is not None:
+            capacity.subscribe(self._on_capacity_change)
+            if capacity.catalog is None:
+                capacity.catalog = self.catalog
+        self._scored_cache = TTLCache(maxsize=256, ttl=300)  # Scored results keyed by normalized profile
         
+        # Warm-up: derived catalog structures, then the ML model. With background=True both run on
+        # a thread so the constructor returns at once; entry points wait for the catalog structures
+        # (or raise if warm-up failed before publishing them) and results are rule-based only until
+        # the model is ready.
+        self._data_ready = threading.Event()
+        self._data_failed = threading.Event()
+        self._model_ready = threading.Event()
+        self._warmup = {'stage': 'starting', 'started_at': time.time(), 'ready_at': None, 'error': None}
+        if background:
+            threading.Thread(target=self._warm_up, name='recommender-warmup', daemon=True).start()
+        else:
+            self._warm_up()
+    
+    def _warm_up(self):
+        """Prepare the catalog structures, then load or train the model, recording progress"""
         try:
-            with open(data_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            self._warmup['stage'] = 'catalog'
+            snapshot = self.catalog.snapshot()
+            self._prepare_data(snapshot.internships, snapshot.version)
+            if self._state is None:
+                raise RuntimeError("The internship catalog is empty")
+            self._data_ready.set()
+            self._warmup['stage'] = 'model'
+            self._load_or_train_model()
+            self._model_ready.set()
+            # Results scored rule-only while the model was loading are keyed apart; drop them
+            self._scored_cache.clear()
+            self._warmup.update({'stage': 'ready', 'ready_at': time.time()})
         except Exception as e:
-            print(f"Error loading internship data: {e}")
-            return self._create_enhanced_sample_data()
+            self._warmup.update({'stage': 'failed', 'error': str(e)})
+            raise
+        finally:
+            # Requests waiting for catalog structures that will never be published give up
+            if not self._data_ready.is_set():
+                self._data_failed.set()
+    
+    def __getattr__(self, name: str):
+        """Read-only access to the current catalog state's fields under their historical names"""
+        field = AIInternshipRecommender.STATE_ATTRIBUTES.get(name)
+        state = self.__dict__.get('_state')
+        if field is None or state is None:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        return getattr(state, field)
+    
+    @property
+    def model_ready(self) -> bool:
+        """True once the ML model is loaded or trained; until then scoring is rule-based only"""
+        return self._model_ready.is_set()
+    
+    def wait_until_ready(self, timeout: float = None) -> bool:
+        """Block until the model is ready (or timeout seconds pass); returns model_ready"""
+        return self._model_ready.wait(timeout)
+    
+    def warmup_status(self) -> Dict[str, Any]:
+        """
+        Warm-up progress for health checks
+        
+        'readiness' sums it up: 'warming_up', 'ready' (served, rule-based until the model is
+        ready), 'degraded' (the model stage failed, so results stay rule-based for good) or
+        'failed' (no catalog structures, nothing can be served).
+        """
+        status = dict(self._warmup)
+        end = status['ready_at'] or time.time()
+        state = self._state
+        if self._data_failed.is_set():
+            readiness = 'failed'
+        elif state is None:
+            readiness = 'warming_up'
+        elif status['stage'] == 'failed':
+            readiness = 'degraded'
+        else:
+            readiness = 'ready'
+        status.update({
+            'readiness': readiness,
+            'catalog_ready': state is not None,
+            'failed': self._data_failed.is_set(),
+            'model_ready': self.model_ready,
+            'elapsed_seconds': round(end - status['started_at'], 3),
+            'internships': len(state) if state is not None else None
+        })
+        return status
+    
+    def _load_internships_data(self) -> List[Dict]:
+        """Internship data from the shared catalog (created from sample data if the file doesn't exist)"""
+        return self.catalog.internships
     
     def _load_applications_data(self) -> List[Dict]:
         """Load application/matching history for ML training"""
@@ -237,29 +388,196 @@ class AIInternshipRecommender:
             }
         ]
     
-    def _prepare_data(self):
-        """Prepare data for AI-based recommendations"""
-        if not self.internships_data:
+    def _prepare_data(self, internships: List[Dict] = None, snapshot_version: int = None):
+        """Build the derived structures of a catalog and publish them as the current CatalogState"""
+        current = self._state
+        if internships is None:
+            internships = current.internships if current is not None else self.catalog.snapshot().internships
+        if not internships:
             return
+        fields = self._build_catalog_fields(internships, snapshot_version)
+        if self.capacity is None:
+            fields['quota_index'] = QuotaIndex(internships)
+            self._state = CatalogState(**fields)
+        else:
+            # Live fills are copied and the state published with the tracker held still, so a fill
+            # lands either in the copy or, through _on_capacity_change, in the published index
+            with self.capacity.frozen_fills() as fills:
+                fields['quota_index'] = QuotaIndex(internships, fills)
+                self._state = CatalogState(**fields)
+        # Results scored against the previous catalog are no longer valid
+        self._scored_cache.clear()
+    
+    def _build_catalog_fields(self, internships: List[Dict], snapshot_version: int = None) -> Dict[str, Any]:
+        """Every structure derived from a catalog except the live quota counts, built off to the side of the published state"""
+        current = self._state
+        fields = {
+            'internships': internships,
+            'version': (current.version if current is not None else 0) + 1,
+            'snapshot_version': snapshot_version if snapshot_version is not None else (current.snapshot_version if current is not None else None),
+            'checksum': catalog_checksum(internships),
+        }
         
-        # Create feature text for each internship
-        feature_texts = []
-        for internship in self.internships_data:
-            text = f"{internship['title']} {internship['sector']} {' '.join(internship['skills_required'])} {internship['description']}"
-            feature_texts.append(text)
+        # Vectorizer, TF-IDF matrices and numeric features come from the saved artifact when it was
+        # built from this exact catalog; otherwise they are fitted here
+        artifact_arrays = self._load_catalog_artifact(fields['checksum'])
+        if artifact_arrays is not None:
+            fields.update(artifact_arrays)
+        else:
+            # Create feature text for each internship
+            feature_texts = []
+            for internship in internships:
+                text = f"{internship['title']} {internship['sector']} {' '.join(internship['skills_required'])} {internship['description']}"
+                feature_texts.append(text)
+            
+            # Fit TF-IDF vectorizer (reduced features for storage efficiency)
+            vectorizer = TfidfVectorizer(**self.VECTORIZER_PARAMS)
+            fields['internship_features'] = vectorizer.fit_transform(feature_texts)
+            fields['vectorizer'] = vectorizer
+            # Unit-length CSR rows, so a query's cosine scores are one sparse product
+            fields['internship_text_matrix'] = normalize(fields['internship_features'], norm='l2', copy=True).tocsr()
+            
+            # Prepare numerical features for ML model
+            fields['internship_numerical_features'] = self._extract_numerical_features(internships)
+            fields['internship_ai_features'] = self._build_internship_feature_matrix(internships)
         
-        # Fit TF-IDF vectorizer (reduced features for storage efficiency)
-        if feature_texts:
-            self.internship_features = self.vectorizer.fit_transform(feature_texts)
+        if self.candidate_generator == 'ann':
+            fields['ann_index'] = self._load_or_build_ann_index(internships, fields['internship_text_matrix'], fields['vectorizer'])
         
-        # Prepare numerical features for ML model
-        self.internship_numerical_features = self._extract_numerical_features()
+        # Precompute the per-catalog structures used by the batched scoring path
+        fields['positions'] = {internship.get('id'): idx for idx, internship in enumerate(internships)}
+        fields['keys'] = {str(internship.get('id')): idx for idx, internship in enumerate(internships)}
+        fields.update(self._build_rule_term_codes(internships))
+        return fields
+    
+    def _load_catalog_artifact(self, checksum: str) -> Dict[str, Any]:
+        """Memory-mapped vectorizer and catalog arrays from the current artifact, if built from this catalog"""
+        manifest = self._artifact_manifest
+        if manifest is None or manifest.get('catalog_checksum') != checksum:
+            return None
+        try:
+            arrays = self.artifacts.load_arrays(manifest)
+            arrays.update(self.artifacts.load_objects(manifest, ('vectorizer',)))
+            return arrays
+        except Exception as e:
+            print(f"Error loading catalog artifacts: {e}")
+            return None
     
-    def _extract_numerical_features(self) -> np.ndarray:
+    def _load_or_build_ann_index(self, internships: List[Dict], matrix, vectorizer) -> IVFIndex:
+        """
+        ANN index for the catalog, persisted next to the model
+        
+        A saved index is reused only if it was projected from the same fitted vectorizer
+        (vocabulary and IDF weights) and the postings it holds are, byte for byte, a prefix of
+        the catalog; only the new postings are then inserted. Anything else is rebuilt, so edited
+        postings never keep stale vectors.
+        """
+        fingerprint = IVFIndex.vectorizer_fingerprint(vectorizer)
+        keys = [str(internship.get('id')) for internship in internships]
+        index = IVFIndex.load(self.ann_index_path, fingerprint)
+        
+        reusable = index is not None and len(index) <= len(keys) and index.keys.tolist() == keys[:len(index)]
+        if reusable and index.checksum == catalog_checksum(internships[:len(index)]):
+            if len(index) == len(keys):
+                return index
+            index.add(matrix[len(index):], np.arange(len(index), len(keys)), keys[len(index):])
+        else:
+            index = IVFIndex(n_probe=self.ann_probes).build(matrix, keys, fingerprint)
+        index.checksum = catalog_checksum(internships)
+        
+        try:
+            index.save(self.ann_index_path)
+        except OSError as e:
+            print(f"Error saving ANN index: {e}")
+        return index
+    
+    def _current_state(self) -> CatalogState:
+        """
+        The catalog state a request reads from, taken once at entry
+        
+        If the shared catalog may have changed, a background thread checks it and rebuilds;
+        requests keep reading the state they took until the new one is published.
+        """
+        self._wait_for_data()
+        state = self._state
+        now = time.monotonic()
+        with self._reload_lock:
+            due = now - self._catalog_checked_at >= self.catalog.check_interval
+            if due and (self._reloader is None or not self._reloader.is_alive()):
+                self._catalog_checked_at = now
+                self._reloader = threading.Thread(target=self._reload_catalog, name='recommender-catalog-reload', daemon=True)
+                self._reloader.start()
+        return state
+    
+    def _wait_for_data(self):
+        """Block until warm-up has published the catalog structures; raise if it failed first"""
+        while not self._data_ready.wait(0.05):
+            if self._data_failed.is_set():
+                raise RuntimeError(f"Recommender warm-up failed: {self._warmup['error']}")
+    
+    @property
+    def catalog_state(self) -> CatalogState:
+        """The current CatalogState; callers doing several reads should hold on to one"""
+        return self._current_state()
+    
+    def _reload_catalog(self) -> bool:
+        """Rebuild and publish the derived structures if the shared catalog has a new version"""
+        with self._rebuild_lock:
+            snapshot = self.catalog.snapshot()
+            state = self._state
+            if state is not None and snapshot.version == state.snapshot_version:
+                return False
+            try:
+                self._prepare_data(snapshot.internships, snapshot.version)
+            except Exception as e:
+                print(f"Error rebuilding catalog structures: {e}")
+                return False
+            return True
+    
+    def refresh_catalog(self) -> bool:
+        """Check the shared catalog now and wait for any rebuild; True if a new state was published"""
+        self._wait_for_data()
+        return self._reload_catalog()
+
+    def _build_internship_feature_matrix(self, internships: List[Dict] = None) -> np.ndarray:
+        """Build the (n_internships x 6) matrix of _extract_internship_features_for_ai columns"""
+        internships = self.internships_data if internships is None else internships
+        work_modes, work_mode_codes = factorize_field(internships, 'work_mode')
+        remote = np.array([work_mode == 'Remote' for work_mode in work_modes], dtype=float)
+
+        return np.column_stack([
+            numeric_field(internships, 'stipend_amount', 15000),
+            list_lengths(internships, 'skills_required'),
+            # Available positions per the catalog; scoring swaps in the live count (AVAILABLE_FEATURE)
+            numeric_field(internships, 'opportunities', 0) - numeric_field(internships, 'filled_positions', 0),
+            numeric_field(internships, 'rating', 4.0),
+            remote[work_mode_codes] if len(remote) else np.zeros(len(internships)),
+            numeric_field(internships, 'industry_capacity', 100)
+        ]).astype(float).reshape(len(internships), 6)
+
+    def _build_rule_term_codes(self, internships: List[Dict] = None) -> Dict[str, Any]:
+        """Factorize the string fields read by the rule-based score so each distinct value is evaluated once per request"""
+        internships = self.internships_data if internships is None else internships
+        state = {}
+        state['sector_values'], state['sector_codes'] = factorize_field(internships, 'sector', '', str.lower)
+        state['location_values'], state['location_codes'] = factorize_field(internships, 'location', '', str.lower)
+        # Exact sector and company keys for the diversity rules
+        state['diversity_sector_codes'] = factorize_field(internships, 'sector', '')[1]
+        state['company_codes'] = factorize_field(internships, 'company', '')[1]
+        # Education uses the same substring-containment vocabulary index as skills
+        state['education_index'] = SkillIndex(internship.get('education_required', []) for internship in internships)
+        state['accepts_any_education'] = np.array(
+            ['any' in [edu.lower() for edu in internship.get('education_required', [])] for internship in internships],
+            dtype=bool)
+        state['skill_index'] = SkillIndex(internship.get('skills_required', []) for internship in internships)
+        state['inverted_index'] = InvertedIndex(internships, state['skill_index'])
+        return state
+
+    def _extract_numerical_features(self, internships: List[Dict] = None) -> np.ndarray:
         """Extract numerical features from internship data for ML model"""
         features = []
         
-        for internship in self.internships_data:
+        for internship in (self.internships_data if internships is None else internships):
             feature_vector = [
                 internship.get('stipend_amount', 0),
                 len(internship.get('skills_required', [])),
@@ -277,117 +595,138 @@ class AIInternshipRecommender:
         return np.array(features)
     
     def _load_or_train_model(self):
-        """Load existing AI model or train a new one"""
-        if os.path.exists(self.model_path):
+        """
+        Load the AI model from the current artifact (or a legacy pickle), or train a new one
+        
+        A new model is trained only when no artifact exists. If the saved artifacts exist but
+        none of them loads, this raises rather than replacing an outcome-trained model.
+        """
+        if self._artifact_manifest is not None or self.artifacts.versions():
+            manifest, objects = self._load_model_objects()
+            self.ml_model = objects['model']
+            self.scaler = objects['scaler']
+            self.model_version = manifest.get('model_version')
+            self.training_checkpoint = manifest.get('metadata', {}).get('training_checkpoint')
+            self._artifact_manifest = manifest
+            print("AI model loaded successfully")
+            if manifest.get('catalog_checksum') != self._state.checksum:
+                # Same model, new catalog: save its freshly fitted arrays for the next boot, unless
+                # another worker already has
+                current = self.artifacts.manifest()
+                if current is None or current.get('catalog_checksum') != self._state.checksum or \
+                        current.get('model_version') != self.model_version:
+                    self._save_artifacts()
+            return
+        elif os.path.exists(self.model_path):
             try:
                 with open(self.model_path, 'rb') as f:
                     model_data = pickle.load(f)
                     self.ml_model = model_data['model']
                     self.scaler = model_data['scaler']
+                    self.model_version = model_data.get('trained_at')
                 print("AI model loaded successfully")
+                self._save_artifacts()
                 return
             except Exception as e:
                 print(f"Error loading model: {e}")
         
-        # Train new model if none exists or loading failed
+        # Train new model if none exists
         self._train_ai_model()
     
-    def _train_ai_model(self):
-        """Train the AI model with synthetic data for prototype"""
-        # Generate synthetic training data for prototype
-        X_train, y_train = self._generate_synthetic_training_data()
+    def _load_model_objects(self):
+        """
+        (manifest, model and scaler) of the newest artifact version that loads
         
-        if len(X_train) > 0:
-            # Scale features
-            X_train_scaled = self.scaler.fit_transform(X_train)
-            
-            # Train the model
-            self.ml_model.fit(X_train_scaled, y_train)
-            
-            # Save the model
-            os.makedirs('data', exist_ok=True)
-            model_data = {
-                'model': self.ml_model,
-                'scaler': self.scaler,
-                'trained_at': datetime.now().isoformat()
-            }
-            
+        Tries the manifest read at startup, then the current version (another worker may have
+        published since), then older versions, newest first.
+        """
+        tried, errors = set(), []
+        candidates = [self._artifact_manifest, self.artifacts.manifest()] + self.artifacts.versions()
+        for manifest in candidates:
+            if manifest is None or manifest['version'] in tried:
+                continue
+            tried.add(manifest['version'])
             try:
-                with open(self.model_path, 'wb') as f:
-                    pickle.dump(model_data, f)
-                print("AI model trained and saved successfully")
+                return manifest, self.artifacts.load_objects(manifest, ('model', 'scaler'))
             except Exception as e:
-                print(f"Error saving model: {e}")
-    
-    def _generate_synthetic_training_data(self):
-        """Generate synthetic training data for prototype demonstration"""
-        X = []
-        y = []
-        
-        # Create synthetic user-internship interaction data
-        for _ in range(1000):  # Generate 1000 synthetic interactions
-            # Random candidate features
-            candidate_features = [
-                np.random.randint(10000, 30000),  # Expected stipend
-                np.random.randint(1, 8),          # Number of skills
-                np.random.randint(1, 5),          # Experience level (1-4)
-                np.random.random(),               # Location preference match (0-1)
-                np.random.random(),               # Sector interest match (0-1)
-                np.random.randint(0, 2),          # Remote work preference
-                np.random.randint(1, 4),          # Education level
-                np.random.random()                # Skills match percentage
-            ]
-            
-            # Random internship features (matching format)
-            internship_idx = np.random.randint(0, len(self.internships_data))
-            internship = self.internships_data[internship_idx]
-            
-            internship_features = [
-                internship.get('stipend_amount', 15000),
-                len(internship.get('skills_required', [])),
-                internship.get('opportunities', 50),
-                internship.get('rating', 4.0),
-                1 if internship.get('work_mode') == 'Remote' else 0,
-                internship.get('industry_capacity', 100)
-            ]
-            
-            # Combine features
-            combined_features = candidate_features + internship_features
-            
-            # Generate realistic match score based on feature similarity
-            match_score = self._calculate_synthetic_match_score(candidate_features, internship_features)
-            
-            X.append(combined_features)
-            y.append(match_score)
-        
-        return np.array(X), np.array(y)
+                print(f"Error loading model version {manifest['version']}: {e}")
+                errors.append(f"{manifest['version']}: {e}")
+        raise RuntimeError(f"No model artifact in {self.artifacts.root} could be loaded ({'; '.join(errors) or 'no readable manifest'}); "
+                           "refusing to retrain over it")
     
-    def _calculate_synthetic_match_score(self, candidate_features, internship_features):
-        """Calculate synthetic match score for training data"""
-        score = 0
-        
-        # Stipend compatibility (higher if internship stipend meets candidate expectation)
-        if internship_features[0] >= candidate_features[0] * 0.8:
-            score += 30
-        
-        # Skills compatibility
-        skills_match = min(candidate_features[1], internship_features[1]) / max(candidate_features[1], internship_features[1])
-        score += skills_match * 25
+    def train_model(self, X_train: np.ndarray, y_train: np.ndarray, checkpoint: Dict = None, **model_params):
+        """Retrain the match model on given rows (e.g. a generated training set) and publish it"""
+        if model_params:
+            self.ml_model = RandomForestRegressor(**dict(self.ml_model.get_params(), **model_params))
+        self._train_ai_model(X_train, y_train, checkpoint)
+    
+    def update_model(self, X_new: np.ndarray, y_new: np.ndarray, checkpoint: Dict = None,
+                     n_trees: int = 10, max_trees: int = 200) -> bool:
+        """
+        Incremental update: grow the forest with n_trees trees fitted on the new rows only
         
-        # Experience level match
-        exp_diff = abs(candidate_features[2] - 2)  # Assuming internship is intermediate level
-        score += max(0, 20 - exp_diff * 5)
+        The current scaler is kept so old and new trees see the same feature scale; the oldest
+        trees beyond max_trees are dropped so the forest follows recent outcomes. Returns False
+        when there is nothing to learn from.
+        """
+        if len(X_new) == 0:
+            return False
         
-        # Location/remote preference match
-        if candidate_features[5] == internship_features[4]:  # Remote preference match
-            score += 15
+        # Grow a copy; the serving model's tree list is never mutated
+        model = copy.copy(self.ml_model)
+        model.estimators_ = list(self.ml_model.estimators_)
+        model.set_params(warm_start=True, n_estimators=len(model.estimators_) + n_trees, n_jobs=self.TRAINING_JOBS)
+        model.fit(self.scaler.transform(X_new), y_new)
+        model.estimators_ = model.estimators_[-max_trees:]
+        model.set_params(warm_start=False, n_estimators=len(model.estimators_), n_jobs=None)
         
-        # Add some randomness for realistic variation
-        score += np.random.normal(0, 5)
+        self.__dict__.update({'ml_model': model, 'model_version': datetime.now().isoformat(),
+                              'training_checkpoint': checkpoint})
+        self._scored_cache.clear()
+        self._save_artifacts()
+        return True
+    
+    def _train_ai_model(self, X_train: np.ndarray = None, y_train: np.ndarray = None, checkpoint: Dict = None):
+        """Train the AI model (on synthetic data unless training rows are given) and publish it"""
+        if X_train is None:
+            X_train, y_train = self._generate_synthetic_training_data()
         
-        return max(0, min(100, score))  # Ensure score is between 0-100
+        if len(X_train) > 0:
+            # Fit a new scaler and model off to the side, so requests keep using the current pair
+            scaler = StandardScaler()
+            X_train_scaled = scaler.fit_transform(X_train)
+            
+            # Fit on every core; predict stays single-threaded, where thread dispatch would
+            # outweigh the small per-request batches
+            model = RandomForestRegressor(**dict(self.ml_model.get_params(), n_jobs=self.TRAINING_JOBS))
+            model.fit(X_train_scaled, y_train)
+            model.set_params(n_jobs=None)
+            
+            # Publish the model, scaler and version together, then save them
+            self.__dict__.update({'ml_model': model, 'scaler': scaler, 'model_version': datetime.now().isoformat(),
+                                  'training_checkpoint': checkpoint})
+            self._scored_cache.clear()
+            self._save_artifacts()
+    
+    def _save_artifacts(self):
+        """Write the model and the current catalog's arrays as a new artifact version"""
+        try:
+            state = self._state  # One catalog version for the vectorizer, arrays and checksum
+            objects = {'vectorizer': state.vectorizer, 'scaler': self.scaler, 'model': self.ml_model}
+            arrays = {name: getattr(state, name) for name in DENSE_ARRAYS + SPARSE_MATRICES}
+            self.artifacts.save(self.model_version, state.checksum, objects, arrays,
+                                {'training_checkpoint': self.training_checkpoint})
+            self._artifact_manifest = self.artifacts.manifest()
+            print("AI model trained and saved successfully")
+        except Exception as e:
+            print(f"Error saving model: {e}")
     
-    def get_ai_recommendations(self, candidate_data: Dict[str, Any]) -> List[Dict]:
+    def _generate_synthetic_training_data(self, n_rows: int = None):
+        """Synthetic candidate x internship interactions for prototype demonstration"""
+        generator = SyntheticTrainingData(self.internships_data, seed=self.TRAINING_SEED)
+        return generator.generate(n_rows or self.TRAINING_ROWS)
+    
+    def get_ai_recommendations(self, candidate_data: Dict[str, Any], k: int = 5, offset: int = 0) -> List[Dict]:
         """
         AI-Based Smart Allocation Engine for internship recommendations
         
@@ -400,67 +739,234 @@ class AIInternshipRecommender:
                 - social_category: For affirmative action (SC/ST/OBC/General)
                 - district_type: For rural quota (Rural/Urban)
                 - past_participation: Boolean for previous internships
+            k: Number of recommendations to return
+            offset: Rank of the first recommendation (for paging)
                 
         Returns:
             List of AI-matched internships with match scores
         """
         
-        # Step 1: Apply affirmative action filters
-        eligible_internships = self._apply_affirmative_action_filters(candidate_data)
+        return self.get_ai_recommendation_page(candidate_data, k=k, offset=offset)['recommendations']
+    
+    def get_ai_recommendation_page(self, candidate_data: Dict[str, Any], k: int = 5, offset: int = 0) -> Dict[str, Any]:
+        """
+        One page of AI recommendations plus paging metadata
+        
+        The scored, ranked result for a candidate is kept for a short time so repeat requests
+        and follow-up pages ("show more") are sliced from it instead of re-scoring the catalog.
+        """
+        state = self._current_state()
+        cache_key = self._scored_cache_key(candidate_data, state)
+        ranked = self._scored_cache.get_or_compute(cache_key, lambda: self._score_and_rank(candidate_data, state))
+        return self._page_result(ranked, k, offset)
+    
+    def _page_result(self, ranked: Dict[str, Any], k: int, offset: int) -> Dict[str, Any]:
+        """Page of a ranked result plus paging metadata"""
+        total = len(ranked['records'])
+        return {
+            'recommendations': self._page_ranked(ranked, k, offset),
+            'offset': offset,
+            'k': k,
+            'total': total,
+            'has_more': offset + k < total
+        }
+    
+    def get_ai_recommendations_batch(self, candidates: List[Dict[str, Any]], k: int = 5, offset: int = 0) -> List[List[Dict]]:
+        """
+        AI recommendations for many candidates at once (e.g. a counselling centre cohort)
         
-        # Step 2: Apply capacity constraints
-        available_internships = self._check_capacity_constraints(eligible_internships)
+        Returns one list per candidate, in input order, shaped exactly like get_ai_recommendations.
+        """
+        return [page['recommendations'] for page in self.get_ai_recommendation_page_batch(candidates, k=k, offset=offset)]
+    
+    def get_ai_recommendation_page_batch(self, candidates: List[Dict[str, Any]], k: int = 5, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Batch counterpart of get_ai_recommendation_page
+        
+        Candidates are scored in chunks of at most BATCH_CHUNK_ROWS candidate x internship
+        pairs (a single candidate above the bound is scored alone), with one scale and predict
+        call per chunk.
+        """
+        state = self._current_state()
+        results = [None] * len(candidates)
+        chunk = []
+        chunk_rows = 0
+        
+        for position, candidate_data in enumerate(candidates):
+            cache_key = self._scored_cache_key(candidate_data, state)
+            ranked = self._scored_cache.get(cache_key)
+            if ranked is not None:
+                results[position] = self._page_result(ranked, k, offset)
+                continue
+            
+            available_internships = self._available_internships(candidate_data, state)
+            # Score the chunk before this candidate would take it past the bound
+            if chunk and chunk_rows + len(available_internships) > self.BATCH_CHUNK_ROWS:
+                self._score_batch_chunk(chunk, results, k, offset, state)
+                chunk, chunk_rows = [], 0
+            chunk.append((position, cache_key, candidate_data, available_internships))
+            chunk_rows += len(available_internships)
+        
+        if chunk:
+            self._score_batch_chunk(chunk, results, k, offset, state)
+        return results
+    
+    def _score_batch_chunk(self, chunk: List[tuple], results: List, k: int, offset: int, state: CatalogState):
+        """Score one chunk of batch candidates and fill in their result pages"""
+        self._score_records_many([(candidate_data, records) for _, _, candidate_data, records in chunk], state)
+        for position, cache_key, _, records in chunk:
+            ranked = self._rank_scored(records, state)
+            self._scored_cache.set(cache_key, ranked)
+            results[position] = self._page_result(ranked, k, offset)
+    
+    def _score_and_rank(self, candidate_data: Dict[str, Any], state: CatalogState = None) -> Dict[str, Any]:
+        """Run the full matching pipeline once and keep what paging needs"""
+        state = state or self._state
+        records = self._available_internships(candidate_data, state)
         
         # Step 3: AI-based matching and scoring
-        ai_scored_internships = self._ai_match_and_score(candidate_data, available_internships)
+        self._score_records_many([(candidate_data, records)], state)
         
-        # Step 4: Apply diversity and fairness adjustments
-        final_recommendations = self._apply_diversity_adjustments(ai_scored_internships, candidate_data)
+        return self._rank_scored(records, state)
+    
+    def _available_internships(self, candidate_data: Dict[str, Any], state: CatalogState = None) -> ScoreRecords:
+        """Candidate retrieval, affirmative action and capacity stages of the pipeline, as compact records"""
+        state = state or self._state
+        # Step 0: Retrieve a bounded candidate set from the inverted index
+        rows = self._retrieve_candidates(candidate_data, state)
         
-        # Step 5: Sort by AI match score and return top 5
-        recommendations = sorted(final_recommendations, key=lambda x: x['ai_match_score'], reverse=True)[:5]
+        # Steps 1-2: Affirmative action eligibility and capacity, as one precomputed mask
+        quota_index = state.quota_index
+        mask, priority = quota_index.select(candidate_data)
+        rows = rows[mask[rows]]
+        return ScoreRecords(state.internships, rows, priority=priority[rows],
+                            available=quota_index.available[rows], utilization=quota_index.utilization[rows])
+    
+    def _on_capacity_change(self, internship_key: str, bucket: str, delta: int):
+        """CapacityTracker listener (called under the tracker's lock): update the live quota counts of one posting"""
+        state = self._state
+        row = state.keys.get(internship_key) if state is not None else None
+        if row is None:
+            return
+        quota_index = state.quota_index
+        quota_index.record_fill(row, [bucket] if bucket in quota_index.quota else [], delta)
+        # Cached rankings may include a posting that just filled up
+        self._scored_cache.clear()
+    
+    def _rank_scored(self, records: ScoreRecords, state: CatalogState = None) -> Dict[str, Any]:
+        """Step 4: Apply diversity and fairness adjustments to the head of the ranking"""
+        scores = records.ai_match_score
+        sectors, companies = self._diversity_keys(records, state or self._state)
+        head = self._diversity_head(sectors, companies, scores, self.DIVERSITY_WINDOW)
+        return {'records': records, 'scores': scores, 'head': head}
+    
+    def _diversity_keys(self, records: ScoreRecords, state: CatalogState):
+        """Per-position sector and company keys for the diversity rules (catalog codes when possible)"""
+        if records.sources is None:
+            return state.diversity_sector_codes[records.rows], state.company_codes[records.rows]
+        return ([internship.get('sector', '') for internship in records.sources],
+                [internship.get('company', '') for internship in records.sources])
+    
+    def _page_ranked(self, ranked: Dict[str, Any], k: int, offset: int) -> List[Dict]:
+        """Slice [offset, offset + k) from the diversity head followed by the rest in score order"""
+        records, scores, head = ranked['records'], ranked['scores'], ranked['head']
+        end = min(offset + k, len(records))
+        positions = list(head[offset:end])
         
-        return recommendations
+        # Step 5: Partial top-k selection over everything outside the diversity head
+        if end > len(head):
+            rest_scores = scores.copy()
+            rest_scores[head] = -np.inf
+            rest = self._top_k_positions(rest_scores, end - len(head))
+            positions.extend(rest[max(0, offset - len(head)):])
+        
+        # Only the returned page is turned into dicts
+        return records.materialize(positions)
     
-    def _apply_affirmative_action_filters(self, candidate_data: Dict[str, Any]) -> List[Dict]:
-        """Apply affirmative action policies for fair representation"""
-        eligible_internships = []
+    @staticmethod
+    def _normalized_candidate_fields(candidate_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        The candidate fields the engine reads, normalized the way the engine reads them
         
-        social_category = candidate_data.get('social_category', 'General')
-        district_type = candidate_data.get('district_type', 'Urban')
+        Skills, location and sector are only compared lowercased, certifications only counted,
+        and missing fields are filled with the defaults the scoring code falls back to.
+        """
+        def number(value):
+            return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else value
         
-        for internship in self.internships_data:
-            affirmative_action = internship.get('affirmative_action', {})
-            
-            # Check if candidate is eligible under affirmative action
-            is_eligible = True
-            
-            # Rural quota check
-            if district_type == 'Rural':
-                rural_quota = affirmative_action.get('rural_quota', 0)
-                # Simulate current rural filled positions (for prototype)
-                rural_filled = internship.get('filled_positions', 0) * 0.1  # Assume 10% are rural
-                if rural_filled >= rural_quota:
-                    # Still eligible through general quota
-                    pass
-            
-            # Social category quota check
-            category_quotas = {
-                'SC': affirmative_action.get('sc_quota', 0),
-                'ST': affirmative_action.get('st_quota', 0),
-                'OBC': affirmative_action.get('obc_quota', 0)
-            }
-            
-            if social_category in category_quotas:
-                # Add priority scoring for reserved categories
-                internship_copy = internship.copy()
-                internship_copy['affirmative_action_priority'] = 10
-                eligible_internships.append(internship_copy)
-            else:
-                # General category
-                internship_copy = internship.copy()
-                internship_copy['affirmative_action_priority'] = 0
-                eligible_internships.append(internship_copy)
+        return {
+            'skills': sorted(str(skill).lower() for skill in candidate_data.get('skills', [])),
+            'education': candidate_data.get('education', ''),
+            'location': str(candidate_data.get('location', '')).lower(),
+            'sector': str(candidate_data.get('sector', '')).lower(),
+            'social_category': candidate_data.get('social_category', 'General'),
+            'district_type': candidate_data.get('district_type', 'Urban'),
+            'expected_stipend': number(candidate_data.get('expected_stipend', 15000)),
+            'experience_months': number(candidate_data.get('experience_months', 0)),
+            'certifications': len(candidate_data.get('certifications', [])),
+            'cgpa': number(candidate_data.get('cgpa', 7.0))
+        }
+    
+    def _scored_cache_key(self, candidate_data: Dict[str, Any], state: CatalogState = None) -> str:
+        """
+        Cache key for a candidate's scored result: normalized profile hash plus catalog/model version
+        
+        Until the model is ready results are rule-only, so they never share a key with model
+        scores, even once model_version is published ahead of the artifact save.
+        """
+        state = state or self._state
+        model_version = self.model_version if self.model_ready else None
+        payload = json.dumps([self._normalized_candidate_fields(candidate_data), state.version if state else 0, model_version],
+                             sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+    
+    def invalidate_candidate(self, candidate_data: Dict[str, Any]):
+        """Drop the cached result for a profile (e.g. after the user edits it)"""
+        self._scored_cache.invalidate(self._scored_cache_key(candidate_data))
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Recommendation cache counters plus the catalog/model version keys are built from"""
+        stats = self._scored_cache.stats()
+        state = self._state
+        stats.update({'catalog_version': state.version if state else 0, 'model_version': self.model_version})
+        return stats
+    
+    def _retrieve_candidates(self, candidate_data: Dict[str, Any], state: CatalogState = None) -> np.ndarray:
+        """Catalog rows to score for a candidate, or the whole catalog when retrieval finds too few"""
+        state = state or self._state
+        all_rows = np.arange(len(state.internships))
+        if self.retrieval_limit is None:
+            return all_rows
+        
+        if self.candidate_generator == 'ann' and state.ann_index is not None:
+            rows = np.sort(state.ann_index.search(state.vectorizer.transform([self._candidate_text(candidate_data)]),
+                                                  self.retrieval_limit, n_probe=self.ann_probes)[0])
+        else:
+            if state.inverted_index is None:
+                return all_rows
+            rows = state.inverted_index.retrieve(candidate_data, self.retrieval_limit)
+        if len(rows) < min(self.retrieval_min_candidates, len(all_rows)):
+            return all_rows
+        return rows
+    
+    @staticmethod
+    def _candidate_text(candidate_data: Dict[str, Any]) -> str:
+        """Candidate profile as text for the TF-IDF vectorizer"""
+        return f"{candidate_data.get('education', '')} {candidate_data.get('sector', '')} {' '.join(candidate_data.get('skills', []))}"
+    
+    def _apply_affirmative_action_filters(self, candidate_data: Dict[str, Any], internships: List[Dict] = None) -> List[Dict]:
+        """Apply affirmative action policies for fair representation (see QuotaIndex)"""
+        state = self._state
+        mask, priority = state.quota_index.select(candidate_data)
+        eligible_internships = []
+        
+        for internship in (state.internships if internships is None else internships):
+            row = state.positions.get(internship.get('id'))
+            if row is not None and not mask[row]:
+                continue
+            internship_copy = internship.copy()
+            internship_copy['affirmative_action_priority'] = int(priority[row]) if row is not None else 0
+            eligible_internships.append(internship_copy)
         
         return eligible_internships
     
@@ -482,50 +988,131 @@ class AIInternshipRecommender:
     
     def _ai_match_and_score(self, candidate_data: Dict[str, Any], internships: List[Dict]) -> List[Dict]:
         """Use AI model to score internship matches"""
-        if not internships:
-            return []
-        
-        scored_internships = []
-        
-        for internship in internships:
-            # Extract candidate features for AI model
-            candidate_features = self._extract_candidate_features(candidate_data)
-            internship_features = self._extract_internship_features_for_ai(internship)
-            
-            # Combine features for AI prediction
-            combined_features = np.array([candidate_features + internship_features])
-            
+        state = self._state
+        records = ScoreRecords.from_dicts(state.internships, state.positions, internships)
+        self._score_records_many([(candidate_data, records)], state)
+        return list(records)
+
+    def _score_records_many(self, requests: List[tuple], state: CatalogState = None):
+        """Fill in the score columns of several (candidate_data, records) pairs with a single scale and predict call"""
+        state = state or self._state
+        blocks = []
+        for candidate_data, records in requests:
+            rows = records.rows
+
+            # Combine with rule-based scoring for robustness
+            rule_scores = self._rule_based_scores(candidate_data, rows, records.sources, state)
+            aa_bonus = np.zeros(len(rows)) if records.priority is None else records.priority.astype(float)
+
             try:
-                # Scale features and predict match score
-                scaled_features = self.scaler.transform(combined_features)
-                ai_score = self.ml_model.predict(scaled_features)[0]
-                
-                # Combine with rule-based scoring for robustness
-                rule_score = self._calculate_rule_based_score(candidate_data, internship)
-                
-                # Weighted combination: 70% AI, 30% rules
-                final_score = (ai_score * 0.7) + (rule_score * 0.3)
-                
-                # Add affirmative action bonus
-                aa_bonus = internship.get('affirmative_action_priority', 0)
-                final_score += aa_bonus
-                
-                internship_copy = internship.copy()
-                internship_copy['ai_match_score'] = min(100, max(0, final_score))
-                internship_copy['ai_raw_score'] = ai_score
-                internship_copy['rule_score'] = rule_score
-                scored_internships.append(internship_copy)
-                
+                candidate_features = np.asarray(self._extract_candidate_features(candidate_data), dtype=float)
+            except Exception:
+                candidate_features = None  # Unusable candidate fields: rule-based scoring only
+            blocks.append((rows, rule_scores, aa_bonus, candidate_features))
+
+        # Broadcast each candidate vector against its internship rows and predict all blocks at once
+        ai_blocks = [None] * len(blocks)
+        predictable = [i for i, block in enumerate(blocks) if block[3] is not None and len(block[0])]
+        if predictable and self.model_ready:
+            try:
+                combined_features = np.vstack([
+                    np.hstack([np.broadcast_to(blocks[i][3], (len(blocks[i][0]), blocks[i][3].size)),
+                               self._internship_feature_rows(blocks[i][0], requests[i][1].sources, state)])
+                    for i in predictable
+                ])
+                ai_scores = self.predict_scores(combined_features)
+                splits = np.cumsum([len(blocks[i][0]) for i in predictable])[:-1]
+                for i, block_scores in zip(predictable, np.split(ai_scores, splits)):
+                    ai_blocks[i] = block_scores
             except Exception as e:
+                print(f"ML scoring error: {e}")  # Fallback to rule-based scoring
+
+        for (_, records), (rows, rule_scores, aa_bonus, _), ai_scores in zip(requests, blocks, ai_blocks):
+            if ai_scores is not None:
+                # Weighted combination: 70% AI, 30% rules, plus affirmative action bonus
+                final_scores = np.clip((ai_scores * 0.7) + (rule_scores * 0.3) + aa_bonus, 0, 100)
+            else:
                 # Fallback to rule-based scoring
-                rule_score = self._calculate_rule_based_score(candidate_data, internship)
-                internship_copy = internship.copy()
-                internship_copy['ai_match_score'] = rule_score
-                internship_copy['ai_raw_score'] = 0
-                internship_copy['rule_score'] = rule_score
-                scored_internships.append(internship_copy)
+                ai_scores = np.zeros(len(rows))
+                final_scores = rule_scores
+
+            records.ai_match_score = np.asarray(final_scores, dtype=float)
+            records.ai_raw_score = np.asarray(ai_scores, dtype=float)
+            records.rule_score = rule_scores
+
+    def predict_scores(self, features: np.ndarray) -> np.ndarray:
+        """AI scores for unscaled (n x 14) candidate+internship feature rows"""
+        model, scaler = self.ml_model, self.scaler
+        if len(features) > self.COMPILED_PREDICT_MAX_ROWS:
+            # Large offline batches: scikit-learn's compiled per-tree loops win
+            return model.predict(scaler.transform(features))
+        compiled = self._compiled_forest
+        if compiled is None or compiled[0] is not model or compiled[1] is not scaler:
+            # Recompiled whenever a new model or scaler is published
+            compiled = (model, scaler, CompiledForest.from_sklearn(model, scaler))
+            self._compiled_forest = compiled
+        return compiled[2].predict(features)
+    
+    def _internship_feature_rows(self, rows: np.ndarray, internships: List[Dict], state: CatalogState = None) -> np.ndarray:
+        """
+        Gather AI feature rows from the precomputed matrix, extracting any non-catalog internship directly
         
-        return scored_internships
+        Catalog rows get the live available positions from quota_index, so positions filled in
+        the app reach the model as well as the capacity filter.
+        """
+        state = state or self._state
+        catalog_features = state.internship_ai_features
+        if len(rows) and rows.min() >= 0:
+            features = catalog_features[rows]
+            features[:, self.AVAILABLE_FEATURE] = state.quota_index.available[rows]
+            return features
+
+        features = np.empty((len(rows), 6), dtype=float)
+        for i, (row, internship) in enumerate(zip(rows, internships)):
+            features[i] = catalog_features[row] if row >= 0 else self._extract_internship_features_for_ai(internship)
+        known = rows >= 0
+        features[known, self.AVAILABLE_FEATURE] = state.quota_index.available[rows[known]]
+        return features
+
+    def _rule_based_scores(self, candidate_data: Dict[str, Any], rows: np.ndarray, internships: List[Dict],
+                           state: CatalogState = None) -> np.ndarray:
+        """Vectorized _calculate_rule_based_score over catalog rows"""
+        state = state or self._state
+        scores = np.zeros(len(rows), dtype=float)
+        known = rows >= 0
+
+        if known.any():
+            catalog_rows = rows[known]
+            candidate_education = candidate_data.get('education', '').lower()
+            candidate_location = candidate_data.get('location', '').lower()
+            candidate_sector = candidate_data.get('sector', '').lower()
+
+            # Skill and education overlap for the whole catalog are sparse products against the vocabulary indexes
+            skill_terms = state.skill_index.skill_scores(candidate_data.get('skills', []), weight=40)
+            education_terms = np.where(
+                (state.education_index.match_counts([candidate_education]) > 0) | state.accepts_any_education, 25.0, 0.0)
+
+            # Evaluate the remaining rules once per distinct catalog value, then gather by code
+            location_terms = np.array([
+                20 if (candidate_location in location or location in candidate_location or
+                       location == 'remote' or candidate_location == 'anywhere') else 0
+                for location in state.location_values
+            ], dtype=float)
+            sector_terms = np.array([
+                15 if candidate_sector in sector or sector in candidate_sector else 0
+                for sector in state.sector_values
+            ], dtype=float)
+
+            known_scores = skill_terms[catalog_rows]
+            known_scores += education_terms[catalog_rows]
+            known_scores += location_terms[state.location_codes[catalog_rows]]
+            known_scores += sector_terms[state.sector_codes[catalog_rows]]
+            scores[known] = np.minimum(100, known_scores)
+
+        for i in np.flatnonzero(~known):
+            scores[i] = self._calculate_rule_based_score(candidate_data, internships[i])
+
+        return scores
     
     def _extract_candidate_features(self, candidate_data: Dict[str, Any]) -> List[float]:
         """Extract numerical features from candidate data for AI model"""
@@ -596,58 +1183,138 @@ class AIInternshipRecommender:
         
         return min(100, score)
     
-    def _apply_diversity_adjustments(self, scored_internships: List[Dict], candidate_data: Dict[str, Any]) -> List[Dict]:
+    def _apply_diversity_adjustments(self, scored_internships: List[Dict], candidate_data: Dict[str, Any], limit: int = 5) -> List[Dict]:
         """Apply diversity and fairness adjustments to recommendations"""
-        # Ensure diversity in sectors and companies
-        final_recommendations = []
-        seen_sectors = set()
+        scores = np.array([internship['ai_match_score'] for internship in scored_internships], dtype=float)
+        sectors = [internship.get('sector', '') for internship in scored_internships]
+        companies = [internship.get('company', '') for internship in scored_internships]
+        return [scored_internships[pos] for pos in self._diversity_head(sectors, companies, scores, limit)]
+    
+    def _diversity_head(self, sectors, companies, scores: np.ndarray, limit: int = 5) -> List[int]:
+        """Positions of the diversity-adjusted top recommendations, ordered by score"""
+        head = []
+        skipped = []
+        sector_counts = {}
         seen_companies = set()
         
-        # Sort by score first
-        sorted_internships = sorted(scored_internships, key=lambda x: x['ai_match_score'], reverse=True)
-        
-        # Add top recommendations while maintaining diversity
-        for internship in sorted_internships:
-            sector = internship.get('sector', '')
-            company = internship.get('company', '')
-            
-            # Prioritize diversity (max 2 per sector, 1 per company)
-            if len(final_recommendations) < 5:
-                if (sector not in seen_sectors or len([r for r in final_recommendations if r.get('sector') == sector]) < 2) and \
-                   company not in seen_companies:
-                    final_recommendations.append(internship)
-                    seen_sectors.add(sector)
+        # Visit candidates best-first (score, then position) in growing top-k windows instead of
+        # ordering the whole list; the window is widened only if diversity skips too many
+        considered = 0
+        window = limit * 4
+        while len(head) < limit and considered < len(scores):
+            for pos in self._top_k_positions(scores, window)[considered:].tolist():
+                considered += 1
+                # Add top recommendations while maintaining diversity (max 2 per sector, 1 per company)
+                sector, company = sectors[pos], companies[pos]
+                if sector_counts.get(sector, 0) < 2 and company not in seen_companies:
+                    head.append(pos)
+                    sector_counts[sector] = sector_counts.get(sector, 0) + 1
                     seen_companies.add(company)
+                    if len(head) == limit:
+                        break
+                else:
+                    skipped.append(pos)
+            window *= 4
         
-        # Fill remaining slots if needed
-        while len(final_recommendations) < 5 and len(final_recommendations) < len(sorted_internships):
-            for internship in sorted_internships:
-                if internship not in final_recommendations:
-                    final_recommendations.append(internship)
-                    break
+        # Fill remaining slots with the best skipped internships if needed
+        head.extend(skipped[:limit - len(head)])
         
-        return final_recommendations
+        return sorted(head, key=lambda pos: -scores[pos])
+    
+    @staticmethod
+    def _top_k_positions(scores: np.ndarray, k: int) -> np.ndarray:
+        """Positions of the k highest scores (ties in position order) via argpartition instead of a full sort"""
+        n = len(scores)
+        if k <= 0 or n == 0:
+            return np.empty(0, dtype=np.intp)
+        if k < n:
+            kth = np.partition(-scores, k - 1)[k - 1]
+            better = np.flatnonzero(-scores < kth)
+            ties = np.flatnonzero(-scores == kth)[:k - len(better)]
+            selected = np.concatenate([better, ties])
+        else:
+            selected = np.arange(n)
+        return selected[np.lexsort((selected, -scores[selected]))]
     
     def get_available_sectors(self) -> List[str]:
         """Get list of available sectors"""
+        state = self._current_state()
         sectors = set()
-        for internship in self.internships_data:
+        for internship in state.internships:
             sectors.add(internship.get('sector', ''))
         return sorted(list(sectors))
     
     def get_available_locations(self) -> List[str]:
         """Get list of available locations"""
+        state = self._current_state()
         locations = set()
-        for internship in self.internships_data:
+        for internship in state.internships:
             location = internship.get('location', '')
             if location:
                 locations.add(location)
         return sorted(list(locations))
     
+    def get_internship(self, internship_id) -> Dict:
+        """Catalog entry for an internship id, or None"""
+        return self._current_state().get(internship_id)
+    
+    def get_available_positions(self, internship_id) -> Optional[float]:
+        """Live available positions of an internship (catalog count minus fills in the app), or None"""
+        state = self._current_state()
+        row = state.positions.get(internship_id)
+        return float(state.quota_index.available[row]) if row is not None else None
+    
+    def serving_versions(self) -> Dict[str, Any]:
+        """Catalog checksum and model version results are scored with now (no model version until it is ready)"""
+        return {'catalog_checksum': self._current_state().checksum,
+                'model_version': self.model_version if self.model_ready else None}
+    
+    def search_internships(self, query: str, k: int = 10, sector: str = None, location: str = None) -> List[Dict]:
+        """
+        Full-text search over the catalog's TF-IDF vectors
+        
+        The query is vectorized with the fitted vectorizer and scored against every posting with
+        one sparse matrix-vector product; the top k are selected with argpartition. Sector and
+        location filters are case-insensitive exact matches.
+        """
+        state = self._current_state()
+        matrix = state.internship_text_matrix if state is not None else None
+        if matrix is None or not query or not query.strip() or k <= 0:
+            return []
+        
+        internships = state.internships
+        query_vector = normalize(state.vectorizer.transform([query]), norm='l2')
+        scores = np.asarray((matrix @ query_vector.T).todense()).ravel()
+        
+        eligible = scores > 0
+        if sector:
+            eligible &= self._value_mask(state.sector_values, state.sector_codes, sector)
+        if location:
+            eligible &= self._value_mask(state.location_values, state.location_codes, location)
+        scores = np.where(eligible, scores, -np.inf)
+        
+        top = self._top_k_positions(scores, min(k, int(eligible.sum())))
+        results = []
+        for row in top:
+            internship = internships[row].copy()
+            internship['search_score'] = round(float(scores[row]), 4)
+            results.append(internship)
+        return results
+    
+    @staticmethod
+    def _value_mask(values: List[str], codes: np.ndarray, value: str) -> np.ndarray:
+        """Rows whose factorized field equals value (case-insensitive)"""
+        value = value.lower()
+        matching = np.array([candidate == value for candidate in values], dtype=bool)
+        return matching[codes] if len(matching) else np.zeros(len(codes), dtype=bool)
+    
     # Legacy method for backward compatibility
     def get_recommendations(self, candidate_data: Dict[str, Any]) -> List[Dict]:
-        """Legacy method - redirects to AI recommendations"""
-        return self.get_ai_recommendations(candidate_data)
+        """Legacy method - redirects to AI recommendations, with the legacy match_score field"""
+        recommendations = self.get_ai_recommendations(candidate_data)
+        for recommendation in recommendations:
+            recommendation['match_score'] = recommendation['ai_match_score']
+        return recommendations
     
     def _apply_rules(self, candidate_data: Dict[str, Any]) -> List[Dict]:
         """Apply rule-based filtering"""
@@ -657,8 +1324,10 @@ class AIInternshipRecommender:
         candidate_skills = [skill.lower().strip() for skill in candidate_data.get('skills', [])]
         candidate_sector = candidate_data.get('sector', '').lower()
         candidate_location = candidate_data.get('location', '').lower()
+        state = self._state
+        skill_matches = state.skill_index.match_counts(candidate_skills)
         
-        for internship in self.internships_data:
+        for idx, internship in enumerate(state.internships):
             score = 0
             
             # Education matching
@@ -667,10 +1336,7 @@ class AIInternshipRecommender:
                 score += 3
             
             # Skills matching
-            skills_required = [skill.lower() for skill in internship.get('skills_required', [])]
-            skill_matches = sum(1 for skill in candidate_skills 
-                              if any(skill in req_skill or req_skill in skill for req_skill in skills_required))
-            score += skill_matches * 2
+            score += int(skill_matches[idx]) * 2
             
             # Sector matching
             if candidate_sector in internship.get('sector', '').lower():
@@ -693,7 +1359,8 @@ class AIInternshipRecommender:
     
     def _score_with_ml(self, candidate_data: Dict[str, Any], internships: List[Dict]) -> List[Dict]:
         """Score internships using ML similarity"""
-        if not hasattr(self, 'internship_features') or not internships:
+        state = self._state
+        if state is None or not internships:
             # Fallback to rule-based scoring only
             for internship in internships:
                 internship['match_score'] = internship.get('rule_score', 0)
@@ -701,36 +1368,25 @@ class AIInternshipRecommender:
         
         try:
             # Create candidate feature vector
-            candidate_text = f"{candidate_data.get('education', '')} {candidate_data.get('sector', '')} {' '.join(candidate_data.get('skills', []))}"
-            candidate_vector = self.vectorizer.transform([candidate_text])
+            candidate_vector = normalize(state.vectorizer.transform([self._candidate_text(candidate_data)]), norm='l2')
+            
+            # Cosine similarity for every catalog row in one sparse product, gathered by id
+            similarities = np.asarray((state.internship_text_matrix @ candidate_vector.T).todense()).ravel()
+            catalog_positions = state.positions
             
             scored_internships = []
             for internship in internships:
-                # Find the internship in original data to get its feature index
-                internship_idx = None
-                for idx, original in enumerate(self.internships_data):
-                    if original['id'] == internship['id']:
-                        internship_idx = idx
-                        break
-                
+                internship_idx = catalog_positions.get(internship['id'])
+                internship_copy = internship.copy()
                 if internship_idx is not None:
-                    # Calculate similarity
-                    similarity = cosine_similarity(candidate_vector, 
-                                                 self.internship_features[internship_idx:internship_idx+1])[0][0]
-                    
                     # Combine rule-based score with ML similarity
                     rule_score = internship.get('rule_score', 0)
-                    ml_score = similarity * 10  # Scale similarity to 0-10
-                    combined_score = rule_score + ml_score
-                    
-                    internship_copy = internship.copy()
-                    internship_copy['match_score'] = combined_score
-                    scored_internships.append(internship_copy)
+                    ml_score = similarities[internship_idx] * 10  # Scale similarity to 0-10
+                    internship_copy['match_score'] = rule_score + ml_score
                 else:
                     # Fallback to rule score only
-                    internship_copy = internship.copy()
                     internship_copy['match_score'] = internship.get('rule_score', 0)
-                    scored_internships.append(internship_copy)
+                scored_internships.append(internship_copy)
             
             return scored_internships
             
@@ -743,15 +1399,17 @@ class AIInternshipRecommender:
     
     def get_available_sectors(self) -> List[str]:
         """Get list of available sectors"""
+        state = self._current_state()
         sectors = set()
-        for internship in self.internships_data:
+        for internship in state.internships:
             sectors.add(internship.get('sector', ''))
         return sorted(list(sectors))
     
     def get_available_locations(self) -> List[str]:
         """Get list of available locations"""
+        state = self._current_state()
         locations = set()
-        for internship in self.internships_data:
+        for internship in state.internships:
             location = internship.get('location', '')
             if location:
                 locations.add(location)
@@ -0,0 +1,89 @@
+from typing import List, Dict, Any, Iterable
+import numpy as np
+from models.skill_index import SkillIndex
+
+
+class InvertedIndex:
+    """
+    Inverted index from skill/sector/location/education tokens to catalog rows
+    Used as the candidate retrieval stage ahead of ML scoring; tokens are related to
+    candidate values with the same substring rules as the rule-based score
+    """
+
+    # Same weights as _calculate_rule_based_score so retrieval ranks like the rules do
+    SKILL_WEIGHT = 40
+    EDUCATION_WEIGHT = 25
+    LOCATION_WEIGHT = 20
+    SECTOR_WEIGHT = 15
+
+    def __init__(self, internships: List[Dict], skill_index: SkillIndex):
+        self.size = len(internships)
+        self.skill_index = skill_index
+        self._skill_postings = skill_index.incidence.tocsc()
+
+        self._sectors = self._build_postings([internship.get('sector', '').lower()] for internship in internships)
+        self._locations = self._build_postings([internship.get('location', '').lower()] for internship in internships)
+        self._education = self._build_postings(
+            [edu.lower() for edu in internship.get('education_required', [])] for internship in internships)
+
+    @staticmethod
+    def _build_postings(token_lists: Iterable[List[str]]) -> Dict[str, np.ndarray]:
+        """Map each token to the sorted array of rows containing it"""
+        postings: Dict[str, List[int]] = {}
+        for row, tokens in enumerate(token_lists):
+            for token in set(tokens):
+                postings.setdefault(token, []).append(row)
+        return {token: np.array(rows, dtype=np.intp) for token, rows in postings.items()}
+
+    @staticmethod
+    def _related_rows(postings: Dict[str, np.ndarray], value: str) -> np.ndarray:
+        """Union of postings for tokens that contain, or are contained in, value"""
+        matches = [rows for token, rows in postings.items() if value in token or token in value]
+        if not matches:
+            return np.empty(0, dtype=np.intp)
+        return np.unique(np.concatenate(matches))
+
+    def _skill_rows(self, skill: str) -> np.ndarray:
+        """Rows requiring at least one skill related to a candidate skill"""
+        columns = self.skill_index.related_columns(skill.lower())
+        if not len(columns):
+            return np.empty(0, dtype=np.intp)
+        postings = self._skill_postings
+        return np.unique(np.concatenate([postings.indices[postings.indptr[c]:postings.indptr[c + 1]] for c in columns]))
+
+    def relevance(self, candidate_data: Dict[str, Any]) -> np.ndarray:
+        """Accumulate rule-weighted token overlap for every row touched by the candidate's postings"""
+        scores = np.zeros(self.size)
+
+        skill_counts = np.zeros(self.size)
+        for skill in candidate_data.get('skills', []):
+            skill_counts[self._skill_rows(skill)] += 1
+        required = self.skill_index.required_counts
+        np.divide(skill_counts * self.SKILL_WEIGHT, required, out=scores, where=required > 0)
+
+        education = candidate_data.get('education', '').lower()
+        # 'Any' postings accept every candidate
+        any_rows = self._education.get('any', np.empty(0, dtype=np.intp))
+        scores[np.union1d(self._related_rows(self._education, education), any_rows)] += self.EDUCATION_WEIGHT
+
+        location = candidate_data.get('location', '').lower()
+        if location == 'anywhere':
+            scores += self.LOCATION_WEIGHT
+        else:
+            location_rows = self._related_rows(self._locations, location)
+            remote_rows = self._locations.get('remote', np.empty(0, dtype=np.intp))
+            scores[np.union1d(location_rows, remote_rows)] += self.LOCATION_WEIGHT
+
+        sector = candidate_data.get('sector', '').lower()
+        scores[self._related_rows(self._sectors, sector)] += self.SECTOR_WEIGHT
+
+        return scores
+
+    def retrieve(self, candidate_data: Dict[str, Any], limit: int) -> np.ndarray:
+        """Rows sharing at least one token with the candidate, bounded to the `limit` most relevant"""
+        scores = self.relevance(candidate_data)
+        rows = np.flatnonzero(scores > 0)
+        if limit is not None and len(rows) > limit:
+            top = np.argpartition(-scores[rows], limit - 1)[:limit]
+            rows = rows[top]
+        return np.sort(rows)
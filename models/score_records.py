@@ -0,0 +1,64 @@
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+import numpy as np
+
+
+class ScoreRecords:
+    """
+    Postings moving through the recommendation pipeline, held as columns instead of dicts
+
+    Each posting is a catalog row. Its per-request fields (affirmative action priority,
+    capacity, scores) sit in parallel NumPy arrays. Stages filter and score by position, and a
+    posting becomes a dict only when a page returns it (see materialize). Postings that were
+    passed in as dicts, including ones not in the catalog (row -1), keep that dict in `sources`.
+    Fields already on a source dict are not attached again.
+    """
+
+    __slots__ = ('catalog', 'rows', 'sources', 'priority', 'available', 'utilization',
+                 'ai_match_score', 'ai_raw_score', 'rule_score')
+
+    def __init__(self, catalog: List[Dict], rows: np.ndarray, priority: np.ndarray = None,
+                 available: np.ndarray = None, utilization: np.ndarray = None, sources: List[Dict] = None):
+        self.catalog = catalog
+        self.rows = rows
+        self.sources = sources
+        self.priority = priority
+        self.available = available
+        self.utilization = utilization
+        self.ai_match_score: Optional[np.ndarray] = None
+        self.ai_raw_score: Optional[np.ndarray] = None
+        self.rule_score: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_dicts(cls, catalog: List[Dict], positions: Dict[Any, int], internships: Iterable[Dict]) -> 'ScoreRecords':
+        """Records for posting dicts, located in the catalog by id"""
+        internships = list(internships)
+        rows = np.array([positions.get(internship.get('id'), -1) for internship in internships], dtype=np.intp)
+        priority = np.array([internship.get('affirmative_action_priority', 0) for internship in internships], dtype=float)
+        return cls(catalog, rows, priority=priority, sources=internships)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.materialize(range(len(self.rows))))
+
+    def materialize(self, positions: Iterable[int]) -> List[Dict]:
+        """Response dicts (copies of the postings with their request fields) for some positions"""
+        records = []
+        for pos in positions:
+            if self.sources is not None:
+                record = self.sources[pos].copy()
+            else:
+                record = self.catalog[self.rows[pos]].copy()
+                if self.priority is not None:
+                    record['affirmative_action_priority'] = int(self.priority[pos])
+                if self.available is not None:
+                    record['available_positions'] = int(self.available[pos])
+                if self.utilization is not None:
+                    record['capacity_utilization'] = float(self.utilization[pos])
+            if self.ai_match_score is not None:
+                record['ai_match_score'] = float(self.ai_match_score[pos])
+                record['ai_raw_score'] = float(self.ai_raw_score[pos])
+                record['rule_score'] = float(self.rule_score[pos])
+            records.append(record)
+        return records
@@ -0,0 +1,68 @@
+from typing import List, Dict, Iterable
+import numpy as np
+from scipy import sparse
+
+
+class SkillIndex:
+    """
+    Canonical skill vocabulary for the internship catalog
+    Resolves the rule-based substring matching (candidate skill in required skill or
+    required skill in candidate skill) into a sparse internship x skill incidence matrix
+    """
+
+    # Bound on memoized candidate skill lookups (free-text skills are unbounded)
+    MAX_CACHED_SKILLS = 10000
+
+    def __init__(self, skill_lists: Iterable[List[str]]):
+        self.vocabulary: Dict[str, int] = {}
+        indptr = [0]
+        indices = []
+        required_counts = []
+
+        for skills in skill_lists:
+            lowered = [skill.lower() for skill in skills]
+            columns = {self.vocabulary.setdefault(skill, len(self.vocabulary)) for skill in lowered}
+            indices.extend(sorted(columns))
+            indptr.append(len(indices))
+            # Rule scores divide by the full required list, duplicates included
+            required_counts.append(len(lowered))
+
+        self.terms = list(self.vocabulary)
+        self.incidence = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), indices, indptr),
+            shape=(len(required_counts), len(self.terms))
+        )
+        self.required_counts = np.array(required_counts, dtype=float)
+        self._related_cache: Dict[str, np.ndarray] = {}
+
+    def related_columns(self, skill: str) -> np.ndarray:
+        """Vocabulary columns that contain, or are contained in, a lowercased skill"""
+        columns = self._related_cache.get(skill)
+        if columns is None:
+            columns = np.array([col for col, term in enumerate(self.terms) if skill in term or term in skill], dtype=np.intp)
+            if len(self._related_cache) >= self.MAX_CACHED_SKILLS:
+                self._related_cache.clear()
+            self._related_cache[skill] = columns
+        return columns
+
+    def match_counts(self, candidate_skills: List[str]) -> np.ndarray:
+        """Number of candidate skills matching at least one required skill, per internship"""
+        if not candidate_skills or not self.terms:
+            return np.zeros(self.incidence.shape[0])
+
+        # Dense (vocabulary x candidate skills) relation, one column per candidate skill, so the
+        # whole catalog is a single sparse-times-dense product
+        query = np.zeros((len(self.terms), len(candidate_skills)), dtype=np.float32)
+        for col, skill in enumerate(candidate_skills):
+            query[self.related_columns(skill.lower()), col] = 1
+
+        overlap = self.incidence @ query
+        return np.count_nonzero(overlap, axis=1).astype(float)
+
+    def skill_scores(self, candidate_skills: List[str], weight: float = 40) -> np.ndarray:
+        """Skills term of the rule-based score: matched fraction of required skills times weight"""
+        counts = self.match_counts(candidate_skills)
+        scores = np.zeros_like(counts)
+        has_required = self.required_counts > 0
+        scores[has_required] = (counts[has_required] / self.required_counts[has_required]) * weight
+        return scores
@@ -0,0 +1,161 @@
+import json
+import os
+from typing import List, Dict, Any, Iterator
+import numpy as np
+
+
+# Location -> (district, state), as in the sample catalog's full layout
+LOCATIONS = {
+    'Bangalore': ('Bangalore Urban', 'Karnataka'),
+    'Mumbai': ('Mumbai', 'Maharashtra'),
+    'Delhi': ('New Delhi', 'Delhi'),
+    'Hyderabad': ('Hyderabad', 'Telangana'),
+    'Chennai': ('Chennai', 'Tamil Nadu'),
+    'Pune': ('Pune', 'Maharashtra'),
+    'Kolkata': ('Kolkata', 'West Bengal'),
+    'Ahmedabad': ('Ahmedabad', 'Gujarat'),
+    'Jaipur': ('Jaipur', 'Rajasthan'),
+    'Remote': ('Remote', 'Remote'),
+}
+COMPANY_TYPES = ('Private', 'Public Sector', 'Startup', 'MNC')
+WORK_MODES = ('On-site', 'Hybrid', 'Remote')
+DIFFICULTY_LEVELS = ('Beginner', 'Intermediate', 'Advanced')
+GROWTH_POTENTIAL = ('Low', 'Medium', 'High')
+
+# Applicant mix used for candidate populations
+SOCIAL_CATEGORY_SHARES = {'General': 0.5, 'OBC': 0.27, 'SC': 0.15, 'ST': 0.08}
+RURAL_SHARE = 0.35
+
+
+class SyntheticCatalog:
+    """
+    Realistic synthetic internship catalogs and candidate populations for benchmarks
+
+    Postings use the full field layout of _create_enhanced_sample_data. Each one starts from a
+    sample posting (its title, sector, skills, education and description) and draws a company
+    branch, location, stipend, capacity, quotas and categorical fields at random. So the vocab
+    sizes, skill overlap and sector mix look like the real catalog at any size. Candidates draw
+    skills from a sector's postings plus the shared vocabulary, and follow SOCIAL_CATEGORY_SHARES
+    and RURAL_SHARE. Everything is generated from one seed, so sizes and runs are reproducible.
+    """
+
+    def __init__(self, sample: List[Dict], seed: int = 42, companies_per_sample: int = 200):
+        self.sample = sample
+        self.seed = seed
+        self.companies_per_sample = companies_per_sample
+        self.skills = sorted({skill for internship in sample for skill in internship.get('skills_required', [])})
+        self.education = sorted({edu for internship in sample for edu in internship.get('education_required', [])
+                                 if edu != 'Any'})
+        self.sectors = sorted({internship['sector'] for internship in sample})
+
+    def _chunk(self, rng: np.random.Generator, first_id: int, n: int, size: int) -> List[Dict[str, Any]]:
+        """
+        The first n postings of a chunk, ids starting at first_id
+
+        Random fields are drawn for all `size` rows of the chunk at once (whatever n is), so the
+        postings do not depend on how many of them are used.
+        """
+        locations = list(LOCATIONS)
+        n_drawn, n = size, min(n, size)
+        templates = rng.integers(len(self.sample), size=n_drawn)
+        location_codes = rng.integers(len(locations), size=n_drawn)
+        branches = rng.integers(self.companies_per_sample, size=n_drawn)
+        durations = rng.integers(2, 7, size=n_drawn)
+        stipends = rng.integers(16, 61, size=n_drawn) * 500
+        opportunities = rng.integers(5, 61, size=n_drawn)
+        filled = (rng.random(n_drawn) * (opportunities + 1)).astype(np.int64)
+        ratings = np.round(rng.uniform(3.5, 4.9, size=n_drawn), 1)
+        company_types = rng.integers(len(COMPANY_TYPES), size=n_drawn)
+        work_modes = rng.integers(len(WORK_MODES), size=n_drawn)
+        capacities = rng.integers(50, 501, size=n_drawn)
+        difficulty = rng.integers(len(DIFFICULTY_LEVELS), size=n_drawn)
+        growth = rng.integers(len(GROWTH_POTENTIAL), size=n_drawn)
+        extra_counts = rng.integers(0, 3, size=n_drawn)
+        extra_skills = rng.integers(len(self.skills), size=(n_drawn, 2))
+
+        postings = []
+        for i in range(n):
+            template = self.sample[templates[i]]
+            location = locations[location_codes[i]]
+            district, state = LOCATIONS[location]
+            stipend_amount, positions = int(stipends[i]), int(opportunities[i])
+            skills = list(template.get('skills_required', [])) + [self.skills[j] for j in extra_skills[i, :extra_counts[i]]]
+            postings.append({
+                'id': first_id + i,
+                'title': template['title'],
+                'company': f"{template['company']} {branches[i]}",
+                'sector': template['sector'],
+                'location': location,
+                'district': district,
+                'state': state,
+                'duration': f"{durations[i]} months",
+                'stipend': f"₹{stipend_amount:,}/month",
+                'stipend_amount': stipend_amount,
+                'skills_required': list(dict.fromkeys(skills)),
+                'education_required': list(template.get('education_required', [])),
+                'description': template['description'],
+                'opportunities': positions,
+                'filled_positions': int(filled[i]),
+                'rating': float(ratings[i]),
+                'company_type': COMPANY_TYPES[company_types[i]],
+                'work_mode': 'Remote' if location == 'Remote' else WORK_MODES[work_modes[i]],
+                'affirmative_action': {
+                    'rural_quota': int(positions * 0.3),
+                    'sc_quota': int(positions * 0.15),
+                    'st_quota': int(positions * 0.075),
+                    'obc_quota': int(positions * 0.27),
+                    'pwd_quota': int(positions * 0.05),
+                },
+                'industry_capacity': int(capacities[i]),
+                'difficulty_level': DIFFICULTY_LEVELS[difficulty[i]],
+                'growth_potential': GROWTH_POTENTIAL[growth[i]],
+            })
+        return postings
+
+    def postings(self, n: int, chunk_rows: int = 10000) -> Iterator[Dict[str, Any]]:
+        """
+        n postings with ids 1..n, generated chunk by chunk
+
+        Each chunk has its own generator seeded from (seed, chunk number), so a smaller catalog
+        is always a prefix of a larger one with the same seed and chunk_rows.
+        """
+        for chunk, start in enumerate(range(0, n, chunk_rows)):
+            rng = np.random.default_rng(np.random.SeedSequence([self.seed, 0, chunk]))
+            yield from self._chunk(rng, start + 1, n - start, chunk_rows)
+
+    def write(self, path: str, n: int):
+        """Write n postings as a JSON catalog file, one posting at a time"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('[')
+            for i, posting in enumerate(self.postings(n)):
+                f.write(',\n' if i else '\n')
+                json.dump(posting, f, ensure_ascii=False)
+            f.write('\n]\n')
+        os.replace(tmp_path, path)
+
+    def candidates(self, n: int) -> List[Dict[str, Any]]:
+        """n candidate profiles in the shape get_ai_recommendations takes"""
+        rng = np.random.default_rng(np.random.SeedSequence([self.seed, 1]))
+        categories = list(SOCIAL_CATEGORY_SHARES)
+        shares = np.array(list(SOCIAL_CATEGORY_SHARES.values()))
+        candidates = []
+        for _ in range(n):
+            template = self.sample[rng.integers(len(self.sample))]
+            own = list(template.get('skills_required', []))
+            picked = [own[i] for i in rng.choice(len(own), size=min(len(own), rng.integers(1, 4)), replace=False)] if own else []
+            picked += [self.skills[i] for i in rng.choice(len(self.skills), size=rng.integers(0, 3), replace=False)]
+            candidates.append({
+                'skills': list(dict.fromkeys(picked)),
+                'education': self.education[rng.integers(len(self.education))],
+                'sector': template['sector'] if rng.random() < 0.8 else self.sectors[rng.integers(len(self.sectors))],
+                'location': 'anywhere' if rng.random() < 0.1 else list(LOCATIONS)[rng.integers(len(LOCATIONS) - 1)],
+                'social_category': categories[rng.choice(len(categories), p=shares)],
+                'district_type': 'Rural' if rng.random() < RURAL_SHARE else 'Urban',
+                'expected_stipend': int(rng.integers(16, 61)) * 500,
+                'experience_months': int(rng.integers(0, 25)),
+                'cgpa': round(float(rng.uniform(6.0, 9.8)), 1),
+                'certifications': [f"Certification {i}" for i in range(rng.integers(0, 4))],
+            })
+        return candidates
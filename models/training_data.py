@@ -0,0 +1,122 @@
+import json
+import os
+from typing import List, Dict, Iterator, Tuple
+import numpy as np
+
+
+# Feature columns, in the order the model sees them: candidate features then internship features
+CANDIDATE_COLUMNS = ('expected_stipend', 'num_skills', 'experience_level', 'location_match',
+                     'sector_match', 'remote_preference', 'education_level', 'skills_match')
+INTERNSHIP_COLUMNS = ('stipend_amount', 'num_skills_required', 'opportunities', 'rating',
+                      'is_remote', 'industry_capacity')
+FEATURE_COLUMNS = CANDIDATE_COLUMNS + INTERNSHIP_COLUMNS
+
+
+def synthetic_match_scores(candidates: np.ndarray, internships: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Vectorized synthetic match score (0-100) for aligned candidate and internship feature rows"""
+    score = np.where(internships[:, 0] >= candidates[:, 0] * 0.8, 30.0, 0.0)
+
+    # Skills compatibility
+    skills = np.minimum(candidates[:, 1], internships[:, 1]) / np.maximum(candidates[:, 1], internships[:, 1])
+    score += skills * 25
+
+    # Experience level match (internships assumed intermediate level)
+    score += np.maximum(0, 20 - np.abs(candidates[:, 2] - 2) * 5)
+
+    # Remote preference match
+    score += np.where(candidates[:, 5] == internships[:, 4], 15.0, 0.0)
+
+    # Some randomness for realistic variation
+    score += rng.normal(0, 5, len(score))
+    return np.clip(score, 0, 100)
+
+
+class SyntheticTrainingData:
+    """
+    Synthetic candidate x internship training rows for the match model
+
+    Rows are generated in fixed-size chunks, each from its own np.random.Generator spawned from
+    one seed, so a (seed, chunk_rows) pair always yields the same data however it is consumed.
+    Datasets can be written to a directory with one .npy file per column (plus the target),
+    which loads memory-mapped and never needs the whole table in memory while being written.
+    """
+
+    def __init__(self, internships: List[Dict], seed: int = 42, chunk_rows: int = 1_000_000):
+        self.seed = seed
+        self.chunk_rows = chunk_rows
+        self.internship_features = np.array([
+            [
+                internship.get('stipend_amount', 15000),
+                len(internship.get('skills_required', [])),
+                internship.get('opportunities', 50),
+                internship.get('rating', 4.0),
+                1 if internship.get('work_mode') == 'Remote' else 0,
+                internship.get('industry_capacity', 100)
+            ]
+            for internship in internships
+        ], dtype=np.float32).reshape(len(internships), len(INTERNSHIP_COLUMNS))
+
+    def _chunk(self, rng: np.random.Generator, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        X = np.empty((n, len(FEATURE_COLUMNS)), dtype=np.float32)
+        X[:, 0] = rng.integers(10000, 30000, n)  # Expected stipend
+        X[:, 1] = rng.integers(1, 8, n)          # Number of skills
+        X[:, 2] = rng.integers(1, 5, n)          # Experience level (1-4)
+        X[:, 3] = rng.random(n)                  # Location preference match (0-1)
+        X[:, 4] = rng.random(n)                  # Sector interest match (0-1)
+        X[:, 5] = rng.integers(0, 2, n)          # Remote work preference
+        X[:, 6] = rng.integers(1, 4, n)          # Education level
+        X[:, 7] = rng.random(n)                  # Skills match percentage
+        X[:, len(CANDIDATE_COLUMNS):] = self.internship_features[rng.integers(0, len(self.internship_features), n)]
+        y = synthetic_match_scores(X[:, :len(CANDIDATE_COLUMNS)], X[:, len(CANDIDATE_COLUMNS):], rng)
+        return X, y.astype(np.float32)
+
+    def chunks(self, n_rows: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """(X, y) chunks totalling n_rows rows"""
+        if not len(self.internship_features):
+            return
+        n_chunks = -(-n_rows // self.chunk_rows)
+        for i, seed in enumerate(np.random.SeedSequence(self.seed).spawn(n_chunks)):
+            yield self._chunk(np.random.default_rng(seed), min(self.chunk_rows, n_rows - i * self.chunk_rows))
+
+    def generate(self, n_rows: int) -> Tuple[np.ndarray, np.ndarray]:
+        """n_rows rows in memory as a float32 feature matrix and target vector"""
+        X = np.empty((n_rows, len(FEATURE_COLUMNS)), dtype=np.float32)
+        y = np.empty(n_rows, dtype=np.float32)
+        start = 0
+        for X_chunk, y_chunk in self.chunks(n_rows):
+            X[start:start + len(X_chunk)], y[start:start + len(y_chunk)] = X_chunk, y_chunk
+            start += len(X_chunk)
+        return X[:start], y[:start]
+
+    def write(self, path: str, n_rows: int) -> Dict:
+        """Write n_rows rows to a columnar dataset directory, chunk by chunk"""
+        os.makedirs(path, exist_ok=True)
+        columns = {name: np.lib.format.open_memmap(os.path.join(path, f"{name}.npy"), mode='w+',
+                                                   dtype=np.float32, shape=(n_rows,))
+                   for name in FEATURE_COLUMNS + ('target',)}
+        start = 0
+        for X_chunk, y_chunk in self.chunks(n_rows):
+            stop = start + len(X_chunk)
+            for col, name in enumerate(FEATURE_COLUMNS):
+                columns[name][start:stop] = X_chunk[:, col]
+            columns['target'][start:stop] = y_chunk
+            start = stop
+        for column in columns.values():
+            column.flush()
+
+        manifest = {'rows': start, 'seed': self.seed, 'chunk_rows': self.chunk_rows,
+                    'columns': list(FEATURE_COLUMNS), 'target': 'target'}
+        with open(os.path.join(path, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+
+    @staticmethod
+    def load(path: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Feature matrix and target of a written dataset (columns are read memory-mapped)"""
+        with open(os.path.join(path, 'manifest.json'), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        X = np.empty((manifest['rows'], len(manifest['columns'])), dtype=np.float32)
+        for col, name in enumerate(manifest['columns']):
+            X[:, col] = np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r')[:manifest['rows']]
+        y = np.load(os.path.join(path, f"{manifest['target']}.npy"), mmap_mode='r')[:manifest['rows']]
+        return X, np.asarray(y)
@@ -1,61 +1,89 @@
-import json
 import os
 from datetime import datetime
 import uuid
+from models.user_store import JSONUserStore, JournalJSONUserStore, SQLiteUserStore
+from models.application_ledger import ApplicationLedger
 
 class User:
-    def __init__(self):
+    """
+    User accounts and applications
+
+    Storage is selected with `backend` (or the USER_STORE_BACKEND environment variable):
+    'json' keeps the demo data files, 'journal' keeps the same files but appends writes to
+    data/users.journal and compacts in the background, 'sqlite' uses data/users.db
+    (see migrate_users.py).
+
+    Application lookups on the json backend go through an in-process ApplicationLedger cache.
+    The journal and sqlite backends answer them from the store, since other workers write to
+    the sqlite database and the journal store already holds its data in memory.
+
+    With a CapacityTracker, applications and moves into or out of an accepted status are
+    counted live (seeded from the stored applications the first time).
+    """
+
+    BACKENDS = ('json', 'journal', 'sqlite')
+
+    def __init__(self, backend=None, capacity=None):
         self.users_file = 'data/users.json'
         self.applications_file = 'data/applications.json'
-        self.ensure_data_files()
+        self.journal_file = 'data/users.journal'
+        self.db_file = 'data/users.db'
+        self.backend = backend or os.environ.get('USER_STORE_BACKEND', 'json')
+        if self.backend == 'json':
+            self.store = JSONUserStore(self.users_file, self.applications_file)
+        elif self.backend == 'journal':
+            self.store = JournalJSONUserStore(self.users_file, self.applications_file, self.journal_file)
+        elif self.backend == 'sqlite':
+            self.store = SQLiteUserStore(self.db_file)
+        else:
+            raise ValueError(f"Unknown user store backend '{self.backend}', expected one of {self.BACKENDS}")
+        self._ledger = None
+        self._profile_listeners = []
+        self.capacity = capacity
+        if capacity is not None and not capacity.loaded:
+            capacity.seed(self.ledger, self.load_users())
     
-    def ensure_data_files(self):
-        """Ensure user and application data files exist"""
-        os.makedirs('data', exist_ok=True)
-        
-        if not os.path.exists(self.users_file):
-            with open(self.users_file, 'w') as f:
-                json.dump({}, f)
-        
-        if not os.path.exists(self.applications_file):
-            with open(self.applications_file, 'w') as f:
-                json.dump({}, f)
+    @property
+    def ledger(self):
+        """
+        Application ledger over every stored application
+
+        Cached for the json backend, where it serves the lookups below. Other backends get a
+        fresh snapshot, for full scans such as capacity seeding and outcome training.
+        """
+        if self._ledger is not None:
+            return self._ledger
+        ledger = ApplicationLedger(self.store.load_applications(), self.store.load_users())
+        if self.backend == 'json':
+            self._ledger = ledger
+        return ledger
+
+    def _find_application(self, user_email, internship_id, status=None):
+        if self.backend == 'json':
+            return self.ledger.find(user_email, internship_id, status)
+        return self.store.find_application(user_email, internship_id, status)
     
     def load_users(self):
-        """Load users from JSON file"""
-        try:
-            with open(self.users_file, 'r') as f:
-                return json.load(f)
-        except:
-            return {}
+        """Load all users (email -> user)"""
+        return self.store.load_users()
     
     def save_users(self, users):
-        """Save users to JSON file"""
-        with open(self.users_file, 'w') as f:
-            json.dump(users, f, indent=2)
+        """Replace all users"""
+        self.store.save_users(users)
     
     def load_applications(self):
-        """Load applications from JSON file"""
-        try:
-            with open(self.applications_file, 'r') as f:
-                return json.load(f)
-        except:
-            return {}
+        """Load all applications"""
+        return self.store.load_applications()
     
     def save_applications(self, applications):
-        """Save applications to JSON file"""
-        with open(self.applications_file, 'w') as f:
-            json.dump(applications, f, indent=2)
+        """Replace all applications"""
+        self.store.save_applications(applications)
+        self._ledger = None
     
     def create_user(self, email, password, name, phone=None):
         """Create a new user account"""
-        users = self.load_users()
-        
-        if email in users:
-            return {'success': False, 'error': 'User already exists'}
-        
         user_id = str(uuid.uuid4())
-        users[email] = {
+        user = {
             'id': user_id,
             'email': email,
             'password': password,  # In production, this should be hashed
@@ -66,46 +94,52 @@ class User:
             'profile': {}
         }
         
-        self.save_users(users)
-        return {'success': True, 'user_id': user_id, 'user': users[email]}
+        if not self.store.add_user(email, user):
+            return {'success': False, 'error': 'User already exists'}
+        return {'success': True, 'user_id': user_id, 'user': user}
     
     def authenticate_user(self, email, password):
         """Authenticate user login"""
-        users = self.load_users()
+        user = self.store.get_user(email)
         
-        if email not in users:
+        if user is None:
             return {'success': False, 'error': 'User not found'}
         
-        if users[email]['password'] != password:
+        if user['password'] != password:
             return {'success': False, 'error': 'Invalid password'}
         
-        return {'success': True, 'user': users[email]}
+        return {'success': True, 'user': user}
     
     def update_profile(self, email, profile_data):
         """Update user profile"""
-        users = self.load_users()
+        user = self.store.get_user(email)
         
-        if email not in users:
+        if user is None:
             return {'success': False, 'error': 'User not found'}
         
-        users[email]['profile'] = profile_data
-        users[email]['profile_complete'] = True
-        users[email]['updated_at'] = datetime.now().isoformat()
+        previous_profile = user.get('profile')
+        user['profile'] = profile_data
+        user['profile_complete'] = True
+        user['updated_at'] = datetime.now().isoformat()
         
-        self.save_users(users)
-        return {'success': True, 'user': users[email]}
+        self.store.update_user(email, user)
+        for listener in self._profile_listeners:
+            listener(email, previous_profile, profile_data)
+        return {'success': True, 'user': user}
+    
+    def on_profile_update(self, listener):
+        """Call listener(email, previous_profile, profile) after every profile update"""
+        self._profile_listeners.append(listener)
     
     def get_user(self, email):
         """Get user by email"""
-        users = self.load_users()
-        return users.get(email)
+        return self.store.get_user(email)
     
     def apply_to_internship(self, user_email, internship_id, internship_title):
         """Apply user to an internship"""
-        applications = self.load_applications()
-        
-        if user_email not in applications:
-            applications[user_email] = []
+        # Check if already applied
+        if self._find_application(user_email, internship_id) is not None:
+            return {'success': False, 'error': 'Already applied to this internship'}
         
         application = {
             'id': str(uuid.uuid4()),
@@ -115,21 +149,16 @@ class User:
             'applied_at': datetime.now().isoformat()
         }
         
-        # Check if already applied
-        existing = [app for app in applications[user_email] if app['internship_id'] == internship_id]
-        if existing:
-            return {'success': False, 'error': 'Already applied to this internship'}
-        
-        applications[user_email].append(application)
-        self.save_applications(applications)
+        self._record_application(user_email, application)
+        if self.capacity is not None:
+            self.capacity.record_application(internship_id)
         return {'success': True, 'application': application}
     
     def save_internship(self, user_email, internship_id, internship_title):
         """Save internship for later"""
-        applications = self.load_applications()
-        
-        if user_email not in applications:
-            applications[user_email] = []
+        # Check if already saved
+        if self._find_application(user_email, internship_id, status='saved') is not None:
+            return {'success': False, 'error': 'Already saved this internship'}
         
         application = {
             'id': str(uuid.uuid4()),
@@ -139,32 +168,58 @@ class User:
             'saved_at': datetime.now().isoformat()
         }
         
-        # Check if already saved
-        existing = [app for app in applications[user_email] if app['internship_id'] == internship_id and app['status'] == 'saved']
-        if existing:
-            return {'success': False, 'error': 'Already saved this internship'}
-        
-        applications[user_email].append(application)
-        self.save_applications(applications)
+        self._record_application(user_email, application)
         return {'success': True, 'application': application}
     
+    def _record_application(self, user_email, application):
+        """Persist a new application (and index it in the ledger cache)"""
+        user = self.store.get_user(user_email) or {}
+        record = ApplicationLedger.normalize(application, user_email, user.get('id'))
+        self.store.add_application(user_email, record)
+        if self._ledger is not None:
+            self._ledger.add(user_email, record)
+    
     def get_user_applications(self, user_email):
         """Get all applications for a user"""
-        applications = self.load_applications()
-        return applications.get(user_email, [])
+        if self.backend != 'json':
+            return self.store.user_applications(user_email)
+        return [dict(app) for app in self.ledger.for_user(user_email)]
+    
+    def get_internship_applications(self, internship_id, status=None):
+        """All applications to an internship, optionally with a given status"""
+        if self.backend != 'json':
+            return self.store.internship_applications(internship_id, status)
+        return [dict(app) for app in self.ledger.for_internship(internship_id, status)]
+    
+    def count_internship_applications(self, internship_id, status=None):
+        """Number of applications to an internship, optionally with a given status"""
+        if self.backend != 'json':
+            return self.store.count_internship_applications(internship_id, status)
+        return self.ledger.count_for_internship(internship_id, status)
     
     def update_application_status(self, user_email, application_id, status):
         """Update application status"""
-        applications = self.load_applications()
-        
-        if user_email not in applications:
+        applications = self.get_user_applications(user_email)
+        if not applications:
             return {'success': False, 'error': 'No applications found'}
         
-        for app in applications[user_email]:
-            if app['id'] == application_id:
-                app['status'] = status
-                app['updated_at'] = datetime.now().isoformat()
-                self.save_applications(applications)
-                return {'success': True, 'application': app}
-        
-        return {'success': False, 'error': 'Application not found'}
\ No newline at end of file
+        app = next((app for app in applications if app['id'] == application_id), None)
+        if app is None:
+            return {'success': False, 'error': 'Application not found'}
+        
+        old_status = app['status']
+        changes = {'status': status, 'updated_at': datetime.now().isoformat()}
+        if self.backend == 'json':
+            legacy_key = self.ledger.legacy_key(application_id)
+            if legacy_key is not None:
+                self.store.update_legacy_application(legacy_key, changes)
+            else:
+                self.store.update_application(user_email, application_id, changes)
+            record = dict(self.ledger.update(application_id, changes))
+        else:
+            self.store.update_application(user_email, application_id, changes)
+            record = dict(app, **changes)
+        if self.capacity is not None:
+            profile = (self.store.get_user(user_email) or {}).get('profile')
+            self.capacity.status_changed(application_id, app.get('internship_id'), old_status, status, profile)
+        return {'success': True, 'application': record}
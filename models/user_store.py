@@ -0,0 +1,560 @@
+import atexit
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Dict, Any, Optional
+
+from models.application_ledger import ApplicationLedger
+
+
+def _user_records(applications: Dict[str, Any], email: str, user_id: Optional[str]) -> List[Dict]:
+    """Ledger records of one user from the applications.json layout (both shapes, file order)"""
+    records = []
+    for key, value in applications.items():
+        if key == email and isinstance(value, list):
+            records.extend(ApplicationLedger.normalize(app, email, user_id) for app in value)
+        elif isinstance(value, dict) and user_id is not None and value.get('user_id') == user_id:
+            records.append(ApplicationLedger.normalize(dict(value, id=value.get('id', key)), email, user_id))
+    return records
+
+
+def _internship_records(applications: Dict[str, Any], users: Dict[str, Dict], internship_id,
+                        status: str = None) -> List[Dict]:
+    """Ledger records of every application to an internship from the applications.json layout"""
+    internship = ApplicationLedger.internship_key(internship_id)
+    emails_by_id = {user.get('id'): email for email, user in users.items()}
+    records = []
+    for key, value in applications.items():
+        if isinstance(value, list):
+            user_id = users.get(key, {}).get('id')
+            records.extend(ApplicationLedger.normalize(app, key, user_id) for app in value
+                           if ApplicationLedger.internship_key(app.get('internship_id')) == internship)
+        elif isinstance(value, dict) and ApplicationLedger.internship_key(value.get('internship_id')) == internship:
+            records.append(ApplicationLedger.normalize(dict(value, id=value.get('id', key)),
+                                                       emails_by_id.get(value.get('user_id')), value.get('user_id')))
+    return [record for record in records if status is None or record['status'] == status]
+
+
+def _legacy_key(applications: Dict[str, Any], user_id: Optional[str], application_id: str) -> Optional[str]:
+    """Top-level key of a user's id-keyed demo record with this application id"""
+    for key, value in applications.items():
+        if (isinstance(value, dict) and user_id is not None and value.get('user_id') == user_id
+                and value.get('id', key) == application_id):
+            return key
+    return None
+
+
+class JSONUserStore:
+    """
+    Users and applications kept in two pretty-printed JSON files
+    Every read parses and every write rewrites the whole file; kept for demos and small data sets
+    """
+
+    def __init__(self, users_file: str = 'data/users.json', applications_file: str = 'data/applications.json'):
+        self.users_file = users_file
+        self.applications_file = applications_file
+        self.ensure_data_files()
+
+    def ensure_data_files(self):
+        """Ensure user and application data files exist"""
+        for path in (self.users_file, self.applications_file):
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            if not os.path.exists(path):
+                with open(path, 'w') as f:
+                    json.dump({}, f)
+
+    def load_users(self) -> Dict[str, Dict]:
+        """Load users from JSON file"""
+        try:
+            with open(self.users_file, 'r') as f:
+                return json.load(f)
+        except:
+            return {}
+
+    def save_users(self, users: Dict[str, Dict]):
+        """Save users to JSON file"""
+        with open(self.users_file, 'w') as f:
+            json.dump(users, f, indent=2)
+
+    def load_applications(self) -> Dict[str, Any]:
+        """Load applications from JSON file"""
+        try:
+            with open(self.applications_file, 'r') as f:
+                return json.load(f)
+        except:
+            return {}
+
+    def save_applications(self, applications: Dict[str, Any]):
+        """Save applications to JSON file"""
+        with open(self.applications_file, 'w') as f:
+            json.dump(applications, f, indent=2)
+
+    def get_user(self, email: str) -> Optional[Dict]:
+        return self.load_users().get(email)
+
+    def add_user(self, email: str, user: Dict) -> bool:
+        """Insert a new user; False if the email is taken"""
+        users = self.load_users()
+        if email in users:
+            return False
+        users[email] = user
+        self.save_users(users)
+        return True
+
+    def update_user(self, email: str, user: Dict):
+        users = self.load_users()
+        users[email] = user
+        self.save_users(users)
+
+    def get_applications(self, email: str) -> List[Dict]:
+        applications = self.load_applications().get(email, [])
+        return applications if isinstance(applications, list) else []
+
+    def user_applications(self, email: str) -> List[Dict]:
+        """A user's applications as ledger records, including demo records stored under their own key"""
+        return _user_records(self.load_applications(), email, (self.get_user(email) or {}).get('id'))
+
+    def internship_applications(self, internship_id, status: str = None) -> List[Dict]:
+        """Ledger records of every application to an internship, optionally with a given status"""
+        return _internship_records(self.load_applications(), self.load_users(), internship_id, status)
+
+    def count_internship_applications(self, internship_id, status: str = None) -> int:
+        return len(self.internship_applications(internship_id, status))
+
+    def find_application(self, email: str, internship_id, status: str = None) -> Optional[Dict]:
+        """First application of a user to an internship, optionally with a given status"""
+        internship = ApplicationLedger.internship_key(internship_id)
+        for app in self.user_applications(email):
+            if ApplicationLedger.internship_key(app.get('internship_id')) == internship and (status is None or app['status'] == status):
+                return app
+        return None
+
+    def add_application(self, email: str, application: Dict):
+        applications = self.load_applications()
+        applications.setdefault(email, []).append(application)
+        self.save_applications(applications)
+
+    def update_application(self, email: str, application_id: str, changes: Dict) -> Optional[Dict]:
+        """Apply changes to one of a user's applications; None if it does not exist"""
+        applications = self.load_applications()
+        user_applications = applications.get(email, [])
+        for app in user_applications if isinstance(user_applications, list) else []:
+            if app['id'] == application_id:
+                app.update(changes)
+                self.save_applications(applications)
+                return app
+        key = _legacy_key(applications, (self.get_user(email) or {}).get('id'), application_id)
+        return self.update_legacy_application(key, changes) if key is not None else None
+
+    def update_legacy_application(self, key: str, changes: Dict) -> Optional[Dict]:
+        """Apply changes to a demo application stored under its own key rather than a user's list"""
+        applications = self.load_applications()
+        app = applications.get(key)
+        if not isinstance(app, dict):
+            return None
+        app.update(changes)
+        self.save_applications(applications)
+        return app
+
+
+class JournalJSONUserStore(JSONUserStore):
+    """
+    JSON file layout with a write-ahead journal
+
+    Users and applications live in memory. Each mutation is appended to the journal as one
+    JSON line (fsync batched by count and time) instead of rewriting the JSON files; on startup
+    the files are loaded and the journal replayed on top. Once the journal passes
+    `compact_bytes` it is rotated and the in-memory state is written back to users.json and
+    applications.json by a background thread. Meant for a single process.
+    """
+
+    def __init__(self, users_file: str = 'data/users.json', applications_file: str = 'data/applications.json',
+                 journal_file: str = 'data/users.journal', compact_bytes: int = 1024 * 1024,
+                 fsync_every: int = 32, fsync_interval: float = 1.0):
+        super().__init__(users_file, applications_file)
+        self.journal_file = journal_file
+        self.compact_bytes = compact_bytes
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._lock = threading.RLock()
+        self._compactor = None
+        self._unsynced = 0
+        self._last_fsync = time.monotonic()
+
+        self._users = JSONUserStore.load_users(self)
+        self._applications = JSONUserStore.load_applications(self)
+        # A leftover rotated journal means a compaction did not finish; replaying is idempotent
+        for path in (self._rotated_file, self.journal_file):
+            self._replay(path)
+        self._journal = open(self.journal_file, 'a', encoding='utf-8')
+        atexit.register(self.sync)
+
+    @property
+    def _rotated_file(self) -> str:
+        return f"{self.journal_file}.compacting"
+
+    def _replay(self, path: str):
+        """Apply every complete record of a journal file, cutting off a torn final write"""
+        if not os.path.exists(path):
+            return
+        complete = 0
+        with open(path, 'rb') as f:
+            for line in f:
+                try:
+                    record = json.loads(line) if line.endswith(b'\n') else None
+                except ValueError:
+                    record = None
+                if record is None:
+                    break
+                self._apply(record)
+                complete += len(line)
+        if complete < os.path.getsize(path):
+            os.truncate(path, complete)
+
+    def _apply(self, record: Dict):
+        op = record['op']
+        if op == 'user':
+            self._users[record['email']] = record['user']
+        elif op == 'users':
+            self._users = record['users']
+        elif op == 'application':
+            # Upsert by id so replaying a record already compacted into the files is harmless
+            user_applications = self._applications.setdefault(record['email'], [])
+            application = record['application']
+            for i, existing in enumerate(user_applications):
+                if existing['id'] == application['id']:
+                    user_applications[i] = application
+                    break
+            else:
+                user_applications.append(application)
+        elif op == 'legacy_application':
+            self._applications[record['key']] = record['application']
+        elif op == 'applications':
+            self._applications = record['applications']
+
+    def _append(self, record: Dict):
+        """Apply a mutation in memory and journal it; caller holds the lock"""
+        self._apply(copy.deepcopy(record))
+        self._journal.write(json.dumps(record) + '\n')
+        self._journal.flush()
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every or time.monotonic() - self._last_fsync >= self.fsync_interval:
+            self.sync()
+        if self._journal.tell() >= self.compact_bytes:
+            self.compact(background=True)
+
+    def sync(self):
+        """fsync journal writes made so far"""
+        with self._lock:
+            if self._unsynced:
+                os.fsync(self._journal.fileno())
+            self._unsynced = 0
+            self._last_fsync = time.monotonic()
+
+    def compact(self, background: bool = False):
+        """Rotate the journal and write the current state back to the JSON files"""
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            self.sync()
+            self._journal.close()
+            if os.path.exists(self._rotated_file):
+                # An earlier compaction failed; keep its records until a snapshot lands
+                with open(self._rotated_file, 'ab') as rotated, open(self.journal_file, 'rb') as journal:
+                    rotated.write(journal.read())
+                os.remove(self.journal_file)
+            else:
+                os.replace(self.journal_file, self._rotated_file)
+            self._journal = open(self.journal_file, 'a', encoding='utf-8')
+            # Serialize under the lock: the snapshot is exactly the rotated journal's end state
+            users, applications = json.dumps(self._users, indent=2), json.dumps(self._applications, indent=2)
+
+        def write_snapshot():
+            for path, payload in ((self.users_file, users), (self.applications_file, applications)):
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, 'w') as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, path)
+            os.remove(self._rotated_file)
+
+        if background:
+            self._compactor = threading.Thread(target=write_snapshot, name='user-store-compaction', daemon=True)
+            self._compactor.start()
+        else:
+            write_snapshot()
+
+    def close(self):
+        """Wait for a running compaction and flush the journal"""
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+        with self._lock:
+            self.sync()
+            self._journal.close()
+
+    def load_users(self) -> Dict[str, Dict]:
+        with self._lock:
+            return copy.deepcopy(self._users)
+
+    def save_users(self, users: Dict[str, Dict]):
+        with self._lock:
+            self._append({'op': 'users', 'users': users})
+
+    def load_applications(self) -> Dict[str, Any]:
+        with self._lock:
+            return copy.deepcopy(self._applications)
+
+    def save_applications(self, applications: Dict[str, Any]):
+        with self._lock:
+            self._append({'op': 'applications', 'applications': applications})
+
+    def get_user(self, email: str) -> Optional[Dict]:
+        with self._lock:
+            return copy.deepcopy(self._users.get(email))
+
+    def add_user(self, email: str, user: Dict) -> bool:
+        """Insert a new user; False if the email is taken"""
+        with self._lock:
+            if email in self._users:
+                return False
+            self._append({'op': 'user', 'email': email, 'user': user})
+            return True
+
+    def update_user(self, email: str, user: Dict):
+        with self._lock:
+            self._append({'op': 'user', 'email': email, 'user': user})
+
+    def get_applications(self, email: str) -> List[Dict]:
+        with self._lock:
+            applications = self._applications.get(email, [])
+            return copy.deepcopy(applications) if isinstance(applications, list) else []
+
+    def user_applications(self, email: str) -> List[Dict]:
+        with self._lock:
+            return copy.deepcopy(_user_records(self._applications, email, self._users.get(email, {}).get('id')))
+
+    def internship_applications(self, internship_id, status: str = None) -> List[Dict]:
+        with self._lock:
+            return copy.deepcopy(_internship_records(self._applications, self._users, internship_id, status))
+
+    def count_internship_applications(self, internship_id, status: str = None) -> int:
+        with self._lock:
+            return len(_internship_records(self._applications, self._users, internship_id, status))
+
+    def add_application(self, email: str, application: Dict):
+        with self._lock:
+            self._append({'op': 'application', 'email': email, 'application': application})
+
+    def update_application(self, email: str, application_id: str, changes: Dict) -> Optional[Dict]:
+        """Apply changes to one of a user's applications; None if it does not exist"""
+        with self._lock:
+            for app in self.get_applications(email):
+                if app['id'] == application_id:
+                    app.update(changes)
+                    self._append({'op': 'application', 'email': email, 'application': app})
+                    return app
+            key = _legacy_key(self._applications, self._users.get(email, {}).get('id'), application_id)
+            return self.update_legacy_application(key, changes) if key is not None else None
+
+    def update_legacy_application(self, key: str, changes: Dict) -> Optional[Dict]:
+        """Apply changes to a demo application stored under its own key rather than a user's list"""
+        with self._lock:
+            app = copy.deepcopy(self._applications.get(key))
+            if not isinstance(app, dict):
+                return None
+            app.update(changes)
+            self._append({'op': 'legacy_application', 'key': key, 'application': app})
+            return app
+
+
+class SQLiteUserStore:
+    """
+    Users and applications in SQLite (WAL mode)
+
+    Records are stored as JSON documents next to the indexed columns used for lookups
+    (email, user id, internship id), so each operation reads or writes only the rows it needs
+    and several worker processes can share the database.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS users (
+            email TEXT PRIMARY KEY,
+            user_id TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_users_user_id ON users (user_id);
+        CREATE TABLE IF NOT EXISTS applications (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            id TEXT UNIQUE NOT NULL,
+            email TEXT,
+            internship_id,
+            status TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_applications_email ON applications (email, internship_id);
+        CREATE INDEX IF NOT EXISTS idx_applications_internship ON applications (internship_id);
+    """
+
+    def __init__(self, db_path: str = 'data/users.db'):
+        self.db_path = db_path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._connection().executescript(self.SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def load_users(self) -> Dict[str, Dict]:
+        rows = self._connection().execute('SELECT email, data FROM users ORDER BY rowid')
+        return {email: json.loads(data) for email, data in rows}
+
+    def save_users(self, users: Dict[str, Dict]):
+        """Replace every user"""
+        with self._connection() as conn:
+            conn.execute('DELETE FROM users')
+            conn.executemany('INSERT INTO users (email, user_id, data) VALUES (?, ?, ?)',
+                             [(email, user.get('id'), json.dumps(user)) for email, user in users.items()])
+
+    def load_applications(self) -> Dict[str, List[Dict]]:
+        """All applications grouped by user email"""
+        applications: Dict[str, List[Dict]] = {}
+        for email, data in self._connection().execute('SELECT email, data FROM applications ORDER BY seq'):
+            applications.setdefault(email, []).append(json.loads(data))
+        return applications
+
+    def save_applications(self, applications: Dict[str, List[Dict]]):
+        """Replace every application (email -> list of applications)"""
+        with self._connection() as conn:
+            conn.execute('DELETE FROM applications')
+            for email, user_applications in applications.items():
+                conn.executemany('INSERT INTO applications (id, email, internship_id, status, data) VALUES (?, ?, ?, ?, ?)',
+                                 [self._application_row(email, app) for app in user_applications])
+
+    @staticmethod
+    def _application_row(email: str, application: Dict) -> tuple:
+        return (application['id'], email, application.get('internship_id'), application.get('status'), json.dumps(application))
+
+    def get_user(self, email: str) -> Optional[Dict]:
+        row = self._connection().execute('SELECT data FROM users WHERE email = ?', (email,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def add_user(self, email: str, user: Dict) -> bool:
+        """Insert a new user; False if the email is taken"""
+        try:
+            with self._connection() as conn:
+                conn.execute('INSERT INTO users (email, user_id, data) VALUES (?, ?, ?)', (email, user.get('id'), json.dumps(user)))
+            return True
+        except sqlite3.IntegrityError:
+            return False
+
+    def update_user(self, email: str, user: Dict):
+        with self._connection() as conn:
+            conn.execute('INSERT OR REPLACE INTO users (email, user_id, data) VALUES (?, ?, ?)',
+                         (email, user.get('id'), json.dumps(user)))
+
+    def get_applications(self, email: str) -> List[Dict]:
+        rows = self._connection().execute('SELECT data FROM applications WHERE email = ? ORDER BY seq', (email,))
+        return [json.loads(data) for data, in rows]
+
+    @staticmethod
+    def _internship_ids(internship_id) -> list:
+        """Both stored forms of an internship id: catalog ids are ints, form posts send strings"""
+        key = ApplicationLedger.internship_key(internship_id)
+        return [key, int(key)] if key.isdigit() else [key, key]
+
+    def user_applications(self, email: str) -> List[Dict]:
+        """A user's applications as ledger records"""
+        rows = self._connection().execute(
+            'SELECT a.data, u.user_id FROM applications a LEFT JOIN users u ON u.email = a.email '
+            'WHERE a.email = ? ORDER BY a.seq', (email,))
+        return [ApplicationLedger.normalize(json.loads(data), email, user_id) for data, user_id in rows]
+
+    def internship_applications(self, internship_id, status: str = None) -> List[Dict]:
+        """Ledger records of every application to an internship, optionally with a given status"""
+        query = ('SELECT a.email, a.data, u.user_id FROM applications a LEFT JOIN users u ON u.email = a.email '
+                 'WHERE a.internship_id IN (?, ?)')
+        params = self._internship_ids(internship_id)
+        if status is not None:
+            query += ' AND a.status = ?'
+            params.append(status)
+        rows = self._connection().execute(query + ' ORDER BY a.seq', params)
+        return [ApplicationLedger.normalize(json.loads(data), email, user_id) for email, data, user_id in rows]
+
+    def count_internship_applications(self, internship_id, status: str = None) -> int:
+        query = 'SELECT COUNT(*) FROM applications WHERE internship_id IN (?, ?)'
+        params = self._internship_ids(internship_id)
+        if status is not None:
+            query += ' AND status = ?'
+            params.append(status)
+        return self._connection().execute(query, params).fetchone()[0]
+
+    def find_application(self, email: str, internship_id, status: str = None) -> Optional[Dict]:
+        """First application of a user to an internship, optionally with a given status"""
+        query = 'SELECT data FROM applications WHERE email = ? AND internship_id IN (?, ?)'
+        params = [email] + self._internship_ids(internship_id)
+        if status is not None:
+            query += ' AND status = ?'
+            params.append(status)
+        row = self._connection().execute(query + ' ORDER BY seq LIMIT 1', params).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def add_application(self, email: str, application: Dict):
+        with self._connection() as conn:
+            conn.execute('INSERT INTO applications (id, email, internship_id, status, data) VALUES (?, ?, ?, ?, ?)',
+                         self._application_row(email, application))
+
+    def update_application(self, email: str, application_id: str, changes: Dict) -> Optional[Dict]:
+        """Apply changes to one of a user's applications; None if it does not exist"""
+        with self._connection() as conn:
+            row = conn.execute('SELECT data FROM applications WHERE id = ? AND email = ?', (application_id, email)).fetchone()
+            if row is None:
+                return None
+            application = json.loads(row[0])
+            application.update(changes)
+            conn.execute('UPDATE applications SET status = ?, data = ? WHERE id = ?',
+                         (application.get('status'), json.dumps(application), application_id))
+        return application
+
+    def migrate_from_json(self, json_store: JSONUserStore) -> Dict[str, int]:
+        """
+        One-shot import of the JSON files into an empty database
+
+        applications.json holds two shapes: lists keyed by user email (written by the app) and
+        single records keyed by application id with a user_id (seeded demo data); the latter
+        are attached to the user with that id.
+        """
+        users = json_store.load_users()
+        emails_by_id = {user.get('id'): email for email, user in users.items()}
+
+        applications: Dict[str, List[Dict]] = {}
+        skipped = 0
+        for key, value in json_store.load_applications().items():
+            if isinstance(value, list):
+                applications.setdefault(key, []).extend(value)
+            elif isinstance(value, dict) and emails_by_id.get(value.get('user_id')):
+                applications.setdefault(emails_by_id[value['user_id']], []).append(dict(value, id=value.get('id', key)))
+            else:
+                skipped += 1
+
+        with self._connection() as conn:
+            if conn.execute('SELECT COUNT(*) FROM users').fetchone()[0]:
+                raise ValueError(f'{self.db_path} already has users; refusing to migrate over it')
+        self.save_users(users)
+        self.save_applications(applications)
+        return {
+            'users': len(users),
+            'applications': sum(len(apps) for apps in applications.values()),
+            'skipped_applications': skipped
+        }
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Nightly precompute of recommendations for every registered user
+
+Loads the recommender once, forks a process pool that shares it, shards users with complete
+profiles across the workers and writes each user's top recommendations to a compact store
+that the dashboard reads instead of scoring on every page view.
+
+Usage:
+    python precompute_recommendations.py [--workers N] [--k 5] [--shard-size 256]
+"""
+
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from models.user import User
+from models.recommender import AIInternshipRecommender
+from models.candidate import profile_to_candidate
+from models.recommendation_store import RecommendationStore
+from models.capacity import CapacityTracker
+from models.catalog import CatalogService
+
+# Loaded once in the parent; forked workers inherit it copy-on-write
+_recommender = None
+
+
+def _load_recommender():
+    """Recommender that sees the positions already filled in the app (data/capacity.json)"""
+    catalog = CatalogService(fallback=lambda: AIInternshipRecommender._create_enhanced_sample_data(None))
+    capacity = CapacityTracker(catalog=catalog, read_only=True)
+    User(capacity=capacity)  # Seeds the counters from stored applications if the app never wrote them
+    return AIInternshipRecommender(catalog=catalog, capacity=capacity)
+
+
+def _init_worker():
+    """Build the recommender in workers that were not forked from a loaded parent"""
+    global _recommender
+    if _recommender is None:
+        _recommender = _load_recommender()
+
+
+def _recommend_shard(shard, k):
+    """Compute recommendations for one shard of (email, profile_stamp, profile) tuples"""
+    candidates = [profile_to_candidate(profile) for _, _, profile in shard]
+    pages = _recommender.get_ai_recommendations_batch(candidates, k=k)
+    return [(email, stamp, recommendations) for (email, stamp, _), recommendations in zip(shard, pages)]
+
+
+def main():
+    global _recommender
+    parser = argparse.ArgumentParser(description='Precompute recommendations for all users')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    parser.add_argument('--k', type=int, default=5, help='Recommendations stored per user')
+    parser.add_argument('--shard-size', type=int, default=256, help='Users per worker task')
+    parser.add_argument('--output', default=os.path.join('data', 'recommendations.npz'), help='Result store file')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    _recommender = _load_recommender()
+    users = User().load_users()
+    work = [(email, RecommendationStore.profile_stamp(user), user['profile'])
+            for email, user in users.items() if user.get('profile_complete') and user.get('profile')]
+    shards = [work[i:i + args.shard_size] for i in range(0, len(work), args.shard_size)]
+    load_seconds = time.perf_counter() - started
+
+    # Fork after the model is loaded so workers share its pages; fall back to per-worker loading
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+
+    compute_started = time.perf_counter()
+    results = {}
+    if args.workers <= 1 or len(shards) <= 1:
+        for shard in shards:
+            for email, stamp, recommendations in _recommend_shard(shard, args.k):
+                results[email] = (stamp, recommendations)
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers, mp_context=context, initializer=_init_worker) as pool:
+            for shard_result in pool.map(_recommend_shard, shards, [args.k] * len(shards)):
+                for email, stamp, recommendations in shard_result:
+                    results[email] = (stamp, recommendations)
+    compute_seconds = time.perf_counter() - compute_started
+
+    RecommendationStore(args.output).write(results, args.k, _recommender.serving_versions())
+    total_seconds = time.perf_counter() - started
+
+    throughput = len(results) / compute_seconds if compute_seconds > 0 else 0
+    print(f"Precomputed recommendations for {len(results)} users with {args.workers} workers")
+    print(f"Model load {load_seconds:.2f}s, scoring {compute_seconds:.2f}s, total {total_seconds:.2f}s")
+    print(f"Throughput: {throughput:.1f} users/second")
+    print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
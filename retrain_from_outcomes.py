@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Retrain the match model from real application outcomes
+
+Streams application records, joins them with applicant profiles and catalog rows into
+(features, outcome) pairs and updates the model with the events since the last checkpoint:
+new trees are fitted on the new rows only and added to the forest. --full refits from
+scratch on every outcome. The synthetic training set is left out: its columns follow
+training_data.FEATURE_COLUMNS, not the serving feature layout the outcome rows use, so the
+two cannot share one scaler and forest. Either way a new model artifact version is written,
+carrying the new checkpoint.
+
+Usage:
+    python retrain_from_outcomes.py [--trees 10] [--max-trees 200] [--full]
+"""
+
+import argparse
+import time
+
+from models.user import User
+from models.recommender import AIInternshipRecommender
+from models.outcome_training import OutcomeEvents
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Update the match model from application outcomes')
+    parser.add_argument('--trees', type=int, default=10, help='Trees fitted on the new events')
+    parser.add_argument('--max-trees', type=int, default=200, help='Forest size cap; the oldest trees are dropped')
+    parser.add_argument('--n-jobs', type=int, default=-1, help='Training threads (-1: all cores)')
+    parser.add_argument('--full', action='store_true', help='Refit from scratch on all outcomes')
+    args = parser.parse_args()
+
+    recommender = AIInternshipRecommender()
+    recommender.TRAINING_JOBS = args.n_jobs
+    user_manager = User()
+    previous = None if args.full else recommender.training_checkpoint
+
+    feature_started = time.perf_counter()
+    events = OutcomeEvents(recommender, user_manager.load_users())
+    records = events.since(user_manager.ledger, previous)
+    X_new, y_new = events.matrix(records)
+    feature_seconds = time.perf_counter() - feature_started
+    checkpoint = events.checkpoint_after(records, previous)
+    since = (previous or {}).get('watermark') or 'the beginning'
+    print(f"{len(records)} application events since {since}: {len(X_new)} training rows, {events.skipped} skipped")
+
+    train_started = time.perf_counter()
+    if args.full and len(X_new):
+        recommender.train_model(X_new, y_new, checkpoint)
+        rows = len(X_new)
+    elif not args.full and recommender.update_model(X_new, y_new, checkpoint, n_trees=args.trees, max_trees=args.max_trees):
+        rows = len(X_new)
+    else:
+        print("Nothing to learn from; model unchanged")
+        return
+    train_seconds = time.perf_counter() - train_started
+
+    mode = 'Full refit' if args.full else 'Incremental update'
+    print(f"{mode}: model version {recommender.model_version}, {len(recommender.ml_model.estimators_)} trees")
+    print(f"Features {feature_seconds:.2f}s, training {train_seconds:.2f}s")
+    print(f"Throughput: {len(records) / feature_seconds if feature_seconds > 0 else 0:,.0f} events/second joined, "
+          f"{rows / train_seconds if train_seconds > 0 else 0:,.0f} rows/second trained")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,8 +7,20 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import pytest
 from models.recommender import AIInternshipRecommender
 
+
+@pytest.fixture
+def make_recommender(tmp_path):
+    """AIInternshipRecommender factory whose model artifacts and ANN index go to tmp_path, not data/"""
+    def make(cls=AIInternshipRecommender, **kwargs):
+        kwargs.setdefault('artifact_dir', str(tmp_path / 'model'))
+        kwargs.setdefault('ann_index_path', str(tmp_path / 'ann_index.npz'))
+        return cls(**kwargs)
+    return make
+
+
 def test_ai_recommender():
     """Test the AI recommendation engine"""
     print("🤖 Testing AI-Based Smart Allocation Engine...")
@@ -61,5 +73,616 @@ def test_ai_recommender():
         import traceback
         traceback.print_exc()
 
+def _reference_score(recommender, candidate_data, internship):
+    """Per-internship scoring as done before the batched path"""
+    import numpy as np
+    combined = np.array([recommender._extract_candidate_features(candidate_data) +
+                         recommender._extract_internship_features_for_ai(internship)])
+    ai_score = recommender.ml_model.predict(recommender.scaler.transform(combined))[0]
+    rule_score = recommender._calculate_rule_based_score(candidate_data, internship)
+    final_score = (ai_score * 0.7) + (rule_score * 0.3) + internship.get('affirmative_action_priority', 0)
+    return min(100, max(0, final_score)), rule_score
+
+
+def test_batched_scoring_matches_per_row_scoring(make_recommender):
+    """The batched _ai_match_and_score path must reproduce the per-row scores"""
+    recommender = make_recommender()
+    candidates = [
+        {"skills": ["Python", "SQL"], "education": "BTech", "sector": "Information Technology",
+         "location": "Bangalore", "social_category": "SC", "district_type": "Rural"},
+        {"skills": ["Excel", "Communication"], "education": "MBA", "sector": "Finance", "location": "Mumbai"},
+        {"skills": [], "education": "", "sector": "", "location": ""},
+        # Substring and duplicate skills exercise the skill index containment relation
+        {"skills": ["R", "Machine Learning Engineering", "excel", "Excel"], "education": "BTech CSE",
+         "sector": "Tech", "location": "anywhere"},
+    ]
+
+    for candidate in candidates:
+        eligible = recommender._apply_affirmative_action_filters(candidate)
+        available = recommender._check_capacity_constraints(eligible)
+        scored = recommender._ai_match_and_score(candidate, available)
+
+        assert len(scored) == len(available)
+        for internship, result in zip(available, scored):
+            expected_score, expected_rule = _reference_score(recommender, candidate, internship)
+            assert abs(result['ai_match_score'] - expected_score) < 1e-9
+            assert result['rule_score'] == expected_rule
+
+
+def test_retrieval_relevance_matches_rule_scores(make_recommender):
+    """Inverted-index relevance ranks the catalog the same way the rule-based score does"""
+    import numpy as np
+    recommender = make_recommender(retrieval_limit=5, retrieval_min_candidates=3)
+    candidate = {"skills": ["Python", "Excel"], "education": "MBA", "sector": "Finance", "location": "Mumbai"}
+
+    rows = np.arange(len(recommender.internships_data))
+    rule_scores = recommender._rule_based_scores(candidate, rows, recommender.internships_data)
+    relevance = recommender.inverted_index.relevance(candidate)
+    assert np.allclose(np.minimum(100, relevance), rule_scores)
+
+    retrieved = recommender._retrieve_candidates(candidate)
+    assert len(retrieved) == 5
+    assert rule_scores[retrieved].min() >= np.sort(rule_scores)[-5]
+
+    # Too few matches falls back to scoring the full catalog
+    recommender.retrieval_min_candidates = 10
+    assert len(recommender._retrieve_candidates(candidate)) == len(recommender.internships_data)
+
+
+def test_paged_recommendations_are_consistent(make_recommender):
+    """Consecutive pages concatenate to the same ranking as one large page"""
+    recommender = make_recommender()
+    candidate = {"skills": ["Python", "SQL"], "education": "BTech", "sector": "Information Technology",
+                 "location": "Bangalore"}
+
+    full = [internship['id'] for internship in recommender.get_ai_recommendations(candidate, k=100)]
+    paged = []
+    for offset in range(0, len(full), 4):
+        paged += [internship['id'] for internship in recommender.get_ai_recommendations(candidate, k=4, offset=offset)]
+
+    assert paged == full
+    assert len(set(full)) == len(full)
+    assert recommender.get_ai_recommendations(candidate) == recommender.get_ai_recommendations(candidate, k=100)[:5]
+    assert not recommender.get_ai_recommendation_page(candidate, k=5, offset=len(full))['has_more']
+
+
+def test_batch_recommendations_match_single_requests(make_recommender):
+    """Chunked batch scoring returns the same pages as one request per candidate"""
+    recommender = make_recommender()
+    recommender.BATCH_CHUNK_ROWS = 30  # Force several chunks
+    candidates = [
+        {"skills": ["Python", "SQL"], "education": "BTech", "sector": "Information Technology", "location": "Bangalore"},
+        {"skills": ["Excel"], "education": "MBA", "sector": "Finance", "location": "Mumbai", "social_category": "OBC"},
+        {"skills": ["Design"], "education": "BDes", "sector": "Design", "location": "Remote"},
+    ]
+
+    chunks = []
+    score_chunk = recommender._score_batch_chunk
+    recommender._score_batch_chunk = lambda chunk, *args: (chunks.append([len(item[3]) for item in chunk]), score_chunk(chunk, *args))
+    batch = recommender.get_ai_recommendations_batch(candidates, k=5)
+    assert sum(len(chunk) for chunk in chunks) == len(candidates)
+    assert all(len(chunk) == 1 or sum(chunk) <= recommender.BATCH_CHUNK_ROWS for chunk in chunks)
+    recommender._scored_cache.clear()
+    for candidate, recommendations in zip(candidates, batch):
+        single = recommender.get_ai_recommendations(candidate, k=5)
+        assert [r['id'] for r in recommendations] == [r['id'] for r in single]
+        assert [r['ai_match_score'] for r in recommendations] == [r['ai_match_score'] for r in single]
+
+
+def test_recommendation_store_round_trip(tmp_path, make_recommender):
+    """Stored recommendations are rebuilt from the catalog and invalidated by a newer profile, catalog, model or a full posting"""
+    from models.recommendation_store import RecommendationStore
+    recommender = make_recommender()
+    candidate = {"skills": ["Python", "SQL"], "education": "BTech", "sector": "Information Technology",
+                 "location": "Bangalore"}
+    recommendations = recommender.get_ai_recommendations(candidate, k=5)
+
+    store = RecommendationStore(str(tmp_path / 'recommendations.npz'))
+    store.write({'user@example.com': ('2025-01-01T00:00:00', recommendations)}, k=5)
+
+    stored = store.get('user@example.com', '2025-01-01T00:00:00', recommender.get_internship)
+    assert [r['id'] for r in stored] == [r['id'] for r in recommendations]
+    assert all(abs(s['ai_match_score'] - r['ai_match_score']) < 1e-3 for s, r in zip(stored, recommendations))
+    assert store.get('user@example.com', '2025-02-01T00:00:00', recommender.get_internship) is None
+    assert store.get('other@example.com', '', recommender.get_internship) is None
+
+    # Results are only served for the catalog and model they were scored with, while every posting has room
+    versions = recommender.serving_versions()
+    store.write({'user@example.com': ('2025-01-01T00:00:00', recommendations)}, k=5, versions=versions)
+    read = lambda versions: store.get('user@example.com', '2025-01-01T00:00:00', recommender.get_internship,
+                                      versions, recommender.get_available_positions)
+    stored = read(versions)
+    assert [r['id'] for r in stored] == [r['id'] for r in recommendations]
+    assert stored[0]['available_positions'] == recommender.get_available_positions(recommendations[0]['id'])
+    assert read(dict(versions, model_version='retrained')) is None
+    assert read(dict(versions, catalog_checksum='edited')) is None
+
+    row = recommender.catalog_state.positions[recommendations[0]['id']]
+    quota_index = recommender.quota_index
+    quota_index.record_fill(row, delta=int(quota_index.available[row]))
+    assert read(versions) is None
+
+
+def test_recommendation_cache_keys_and_invalidation(make_recommender):
+    """Equivalent profiles share a cache entry; catalog reloads and explicit invalidation drop it"""
+    import threading
+    import time
+    recommender = make_recommender()
+    candidate = {"skills": ["Python", "SQL"], "education": "BTech", "sector": "Information Technology",
+                 "location": "Bangalore"}
+    equivalent = {"skills": ["sql", "python"], "education": "BTech", "sector": "information technology",
+                  "location": "BANGALORE", "social_category": "General", "cgpa": 7, "certifications": []}
+
+    assert recommender._scored_cache_key(candidate) == recommender._scored_cache_key(equivalent)
+    assert recommender._scored_cache_key(candidate) != recommender._scored_cache_key(dict(candidate, social_category="SC"))
+
+    recommender.get_ai_recommendations(candidate)
+    recommender.get_ai_recommendations(equivalent)
+    stats = recommender.cache_stats()
+    assert stats['misses'] == 1 and stats['hits'] == 1
+
+    recommender.invalidate_candidate(equivalent)
+    assert len(recommender._scored_cache) == 0
+
+    recommender.get_ai_recommendations(candidate)
+    old_key = recommender._scored_cache_key(candidate)
+    recommender._prepare_data()
+    assert len(recommender._scored_cache) == 0
+    assert recommender._scored_cache_key(candidate) != old_key
+
+    # Identical concurrent misses are computed once
+    calls = []
+    def slow_compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return 'ranked'
+    threads = [threading.Thread(target=recommender._scored_cache.get_or_compute, args=('key', slow_compute))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+
+
+def test_catalog_hot_reload(tmp_path, make_recommender):
+    """A changed catalog file is picked up and the recommender rebuilds its derived structures"""
+    import json
+    from models.catalog import CatalogService
+    path = tmp_path / 'internships.json'
+    internships = json.load(open(os.path.join('data', 'internships.json')))
+    path.write_text(json.dumps(internships[:10]))
+
+    catalog = CatalogService(str(path), check_interval=0)
+    recommender = make_recommender(catalog=catalog)
+    candidate = {"skills": ["Python"], "education": "BTech", "sector": "Information Technology", "location": "Delhi"}
+    recommender.get_ai_recommendations(candidate)
+    assert len(recommender.internships_data) == 10 and recommender.get_internship(internships[12]['id']) is None
+
+    # Let the check started by the request finish, so it cannot read the file mid-write
+    if recommender._reloader is not None:
+        recommender._reloader.join()
+    # Bump the mtime in case both writes land in the same timestamp tick
+    path.write_text(json.dumps(internships[2:12]))
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10**9))
+    # Requests keep reading the state they started with; the rebuild runs off the request path
+    state = recommender._current_state()
+    assert recommender.refresh_catalog() or recommender._state is not state
+    assert len(state) == 10 and state.get(internships[0]['id']) == internships[0]
+    assert recommender.get_internship(internships[11]['id']) == internships[11]
+    assert recommender.get_internship(internships[0]['id']) is None
+    assert recommender.skill_index.incidence.shape[0] == 10
+    assert len(recommender._scored_cache) == 0
+    assert catalog.snapshot().version == 2 and catalog.loads == 2
+    assert catalog.snapshot().positions[internships[2]['id']] == 0
+
+
+def test_search_matches_brute_force_cosine(make_recommender):
+    """One sparse product plus argpartition ranks like per-row cosine similarity"""
+    import numpy as np
+    from sklearn.metrics.pairwise import cosine_similarity
+    recommender = make_recommender()
+    query = 'machine learning python data'
+
+    similarities = cosine_similarity(recommender.vectorizer.transform([query]), recommender.internship_features).ravel()
+    expected = [recommender.internships_data[row]['id'] for row in np.argsort(-similarities, kind='stable')[:5]]
+    results = recommender.search_internships(query, k=5)
+    assert [r['id'] for r in results] == expected
+    assert abs(results[0]['search_score'] - similarities.max()) < 1e-4
+
+    sector = results[0]['sector']
+    filtered = recommender.search_internships(query, k=50, sector=sector.upper())
+    assert filtered and all(r['sector'] == sector for r in filtered)
+    assert recommender.search_internships('   ') == []
+
+
+def test_ann_index_recall_persistence_and_insertion(tmp_path, make_recommender):
+    """Probing every list is exact; a saved index is reloaded and grown in place"""
+    import numpy as np
+    from models.ann_index import IVFIndex
+    recommender = make_recommender()
+    matrix = recommender.internship_text_matrix
+    keys = [internship['id'] for internship in recommender.internships_data]
+    fingerprint = IVFIndex.vocabulary_fingerprint(recommender.vectorizer.vocabulary_)
+    index = IVFIndex(n_lists=8).build(matrix[:-5], keys[:-5], fingerprint)
+    index.add(matrix[-5:], np.arange(len(keys) - 5, len(keys)), keys[-5:])
+    assert len(index) == len(keys)
+
+    query = recommender.vectorizer.transform(['python machine learning data'])
+    exact = np.argsort(-index.project(matrix) @ index.project(query)[0], kind='stable')[:10]
+    rows, _ = index.search(query, 10, n_probe=8)
+    assert set(rows) == set(exact)
+    assert len(index.search(query, 10, n_probe=1)[0]) <= 10
+
+    path = str(tmp_path / 'ann_index.npz')
+    index.save(path)
+    assert IVFIndex.load(path, 'another vocabulary') is None
+    loaded = IVFIndex.load(path, fingerprint)
+    assert loaded.keys.tolist() == [str(key) for key in keys]
+    assert loaded.search(query, 10, n_probe=8)[0].tolist() == rows.tolist()
+
+    ann = make_recommender(candidate_generator='ann', ann_probes=64, ann_index_path=str(tmp_path / 'catalog.npz'))
+    candidate = {"skills": ["Python", "Machine Learning"], "education": "BTech", "sector": "Information Technology", "location": "Delhi"}
+    assert ann.get_ai_recommendations(candidate)
+
+    # Same vectorizer and catalog: the saved index is reused; an edited posting rebuilds it
+    internships = list(ann.internships_data)
+    saved = ann._load_or_build_ann_index(internships, ann.internship_text_matrix, ann.vectorizer)
+    assert saved.checksum == ann.ann_index.checksum and np.array_equal(saved.vectors, ann.ann_index.vectors)
+    internships[0] = dict(internships[0], description='Completely rewritten posting text')
+    rebuilt = ann._load_or_build_ann_index(internships, ann.internship_text_matrix, ann.vectorizer)
+    assert rebuilt.checksum != saved.checksum
+    assert not os.path.exists(str(tmp_path / 'catalog.npz.tmp'))
+
+
+def test_background_warm_up_serves_rule_based_until_model_ready(make_recommender):
+    """The constructor returns before the model is loaded; scoring is rule-based until it is"""
+    import threading
+    release = threading.Event()
+
+    class SlowModelRecommender(AIInternshipRecommender):
+        def _load_or_train_model(self):
+            release.wait(10)
+            super()._load_or_train_model()
+
+    recommender = make_recommender(SlowModelRecommender, background=True)
+    candidate = {"skills": ["Python"], "education": "BTech", "sector": "Information Technology", "location": "Delhi"}
+    assert not recommender.model_ready
+    assert recommender.warmup_status()['stage'] in ('catalog', 'model')
+    early = recommender.get_ai_recommendations(candidate)
+    assert early and all(r['ai_raw_score'] == 0 and r['ai_match_score'] == r['rule_score'] for r in early)
+    assert recommender.warmup_status()['catalog_ready']
+
+    release.set()
+    assert recommender.wait_until_ready(30)
+    status = recommender.warmup_status()
+    assert status['stage'] == 'ready' and status['model_ready'] and status['error'] is None
+    assert any(r['ai_raw_score'] != 0 for r in recommender.get_ai_recommendations(candidate))
+
+
+def test_rule_only_results_from_mid_warm_up_are_not_served_once_ready(make_recommender):
+    """A request scored while the new model is still being saved is not reused after it is ready"""
+    import threading
+    import time
+    release = threading.Event()
+
+    class SlowSaveRecommender(AIInternshipRecommender):
+        def _save_artifacts(self):
+            release.wait(10)
+            super()._save_artifacts()
+
+    recommender = make_recommender(SlowSaveRecommender, background=True)
+    candidate = {"skills": ["Python"], "education": "BTech", "sector": "Information Technology", "location": "Delhi"}
+    deadline = time.monotonic() + 30
+    while recommender.model_version is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert recommender.model_version is not None and not recommender.model_ready
+    assert all(r['ai_raw_score'] == 0 for r in recommender.get_ai_recommendations(candidate))
+
+    release.set()
+    assert recommender.wait_until_ready(30)
+    assert any(r['ai_raw_score'] != 0 for r in recommender.get_ai_recommendations(candidate))
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_failed_warm_up_is_reported_instead_of_serving(make_recommender):
+    """If the catalog stage fails, entry points raise a descriptive error and status reports it"""
+    class BrokenCatalogRecommender(AIInternshipRecommender):
+        def _prepare_data(self, internships=None, snapshot_version=None):
+            raise ValueError("corrupt catalog")
+
+    recommender = make_recommender(BrokenCatalogRecommender, background=True)
+    with pytest.raises(RuntimeError, match="warm-up failed: corrupt catalog"):
+        recommender.get_ai_recommendations({"skills": ["Python"], "education": "BTech"})
+    status = recommender.warmup_status()
+    assert status['failed'] and status['stage'] == 'failed' and not status['catalog_ready']
+    assert status['readiness'] == 'failed'
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_failed_model_stage_reports_degraded(make_recommender):
+    """A model that cannot load or train leaves rule-based serving, reported as degraded"""
+    class BrokenModelRecommender(AIInternshipRecommender):
+        def _load_or_train_model(self):
+            raise RuntimeError("unreadable model")
+
+    recommender = make_recommender(BrokenModelRecommender, background=True)
+    recommendations = recommender.get_ai_recommendations({"skills": ["Python"], "education": "BTech"})
+    assert recommendations and all(r['ai_raw_score'] == 0 for r in recommendations)
+    assert not recommender.wait_until_ready(0.5)
+    status = recommender.warmup_status()
+    assert status['catalog_ready'] and not status['model_ready'] and not status['failed']
+    assert status['stage'] == 'failed' and status['readiness'] == 'degraded'
+    assert 'unreadable model' in status['error']
+
+
+def test_model_artifacts_are_versioned_and_memory_mapped(tmp_path, make_recommender):
+    """A second boot maps the saved arrays; a changed catalog is detected by its checksum"""
+    import json
+    import numpy as np
+    from models.catalog import CatalogService
+    path = tmp_path / 'internships.json'
+    internships = json.load(open(os.path.join('data', 'internships.json')))
+    path.write_text(json.dumps(internships[:12]))
+    artifact_dir = str(tmp_path / 'model')
+    candidate = {"skills": ["Python"], "education": "BTech", "sector": "Information Technology", "location": "Delhi"}
+
+    first = make_recommender(catalog=CatalogService(str(path)), artifact_dir=artifact_dir)
+    manifest = first.artifacts.manifest()
+    assert manifest['schema_version'] == 1 and manifest['catalog_checksum'] == first._catalog_checksum
+
+    second = make_recommender(catalog=CatalogService(str(path)), artifact_dir=artifact_dir)
+    assert isinstance(second.internship_ai_features, np.memmap)
+    assert not second.internship_text_matrix.data.flags.writeable  # A view of the mapped file
+    assert second.model_version == first.model_version and second.artifacts.current_version() == manifest['version']
+    assert [r['ai_match_score'] for r in second.get_ai_recommendations(candidate)] == \
+        [r['ai_match_score'] for r in first.get_ai_recommendations(candidate)]
+
+    path.write_text(json.dumps(internships[:10]))
+    third = make_recommender(catalog=CatalogService(str(path)), artifact_dir=artifact_dir)
+    assert not isinstance(third.internship_ai_features, np.memmap)
+    assert third.model_version == first.model_version
+    assert third.artifacts.manifest()['catalog_checksum'] == third._catalog_checksum != manifest['catalog_checksum']
+    assert len(os.listdir(artifact_dir)) == 3  # Two versions plus CURRENT
+
+
+def test_unloadable_model_artifact_falls_back_and_never_retrains(tmp_path, make_recommender):
+    """A broken current version falls back to the previous one; with none loadable, boot fails instead of retraining"""
+    import json
+    from models.catalog import CatalogService
+    path = tmp_path / 'internships.json'
+    internships = json.load(open(os.path.join('data', 'internships.json')))
+    path.write_text(json.dumps(internships[:12]))
+    artifact_dir = str(tmp_path / 'model')
+
+    first = make_recommender(catalog=CatalogService(str(path)), artifact_dir=artifact_dir)
+    first.update_model(first._generate_synthetic_training_data(50)[0], first._generate_synthetic_training_data(50)[1])
+    versions = [manifest['version'] for manifest in first.artifacts.versions()]
+    assert len(versions) == 2 and versions == sorted(versions, reverse=True)  # Names sort by creation time
+
+    with open(os.path.join(artifact_dir, versions[0], 'model.joblib'), 'wb') as f:
+        f.write(b'truncated')
+    second = make_recommender(catalog=CatalogService(str(path)), artifact_dir=artifact_dir)
+    assert second.model_version == first.artifacts.manifest(versions[1])['model_version']
+
+    with open(os.path.join(artifact_dir, versions[1], 'model.joblib'), 'wb') as f:
+        f.write(b'truncated')
+    with pytest.raises(RuntimeError):
+        make_recommender(catalog=CatalogService(str(path)), artifact_dir=artifact_dir)
+    assert sorted(manifest['version'] for manifest in first.artifacts.versions()) == sorted(versions)
+
+
+def test_synthetic_training_data_is_seeded_and_columnar(tmp_path, make_recommender):
+    """Chunked generation is reproducible and round-trips through the column files"""
+    import numpy as np
+    from models.training_data import SyntheticTrainingData, FEATURE_COLUMNS
+    recommender = make_recommender()
+    generator = SyntheticTrainingData(recommender.internships_data, seed=7, chunk_rows=300)
+    X, y = generator.generate(1000)
+    assert X.shape == (1000, len(FEATURE_COLUMNS)) and X.dtype == np.float32
+    assert ((y >= 0) & (y <= 100)).all()
+    assert np.isin(X[:, 1], np.arange(1, 8)).all() and set(np.unique(X[:, 12])) <= {0, 1}
+
+    again, _ = SyntheticTrainingData(recommender.internships_data, seed=7, chunk_rows=300).generate(1000)
+    assert np.array_equal(X, again)
+
+    manifest = generator.write(str(tmp_path / 'training'), 1000)
+    assert manifest['rows'] == 1000 and (tmp_path / 'training' / 'target.npy').exists()
+    X_loaded, y_loaded = SyntheticTrainingData.load(str(tmp_path / 'training'))
+    assert np.array_equal(X_loaded, X) and np.array_equal(y_loaded, y)
+
+    recommender.train_model(X, y, n_estimators=5)
+    assert len(recommender.ml_model.estimators_) == 5 and recommender.ml_model.n_jobs is None
+    assert recommender.artifacts.manifest()['model_version'] == recommender.model_version
+
+
+def test_outcome_events_update_model_incrementally(tmp_path, make_recommender):
+    """Application records join to serving features; only events after the checkpoint are learned"""
+    import numpy as np
+    from models.application_ledger import ApplicationLedger
+    from models.outcome_training import OutcomeEvents, OUTCOME_SCORES
+    recommender = make_recommender()
+    internship = recommender.internships_data[0]
+    users = {'a@x.in': {'id': 'u1', 'profile': {'skills': 'Python, SQL', 'education': 'BTech', 'location': 'Delhi'}}}
+    applications = {'a@x.in': [
+        {'id': 'a1', 'internship_id': str(internship['id']), 'status': 'accepted', 'applied_at': '2025-01-01T10:00:00'},
+        {'id': 'a2', 'internship_id': 'missing', 'status': 'applied', 'applied_at': '2025-01-02T10:00:00'},
+    ]}
+    ledger = ApplicationLedger(applications, users)
+
+    events = OutcomeEvents(recommender, users)
+    records = events.since(ledger)
+    X, y = events.matrix(records)
+    assert [r['id'] for r in records] == ['a1', 'a2'] and events.skipped == 1
+    expected = recommender._extract_candidate_features({'skills': ['Python', 'SQL'], 'education': 'BTech', 'location': 'Delhi'})
+    assert np.allclose(X[0], np.concatenate([expected, recommender.internship_ai_features[0]]))
+    assert y.tolist() == [OUTCOME_SCORES['accepted']]
+
+    checkpoint = events.checkpoint_after(records)
+    serving_trees = recommender.ml_model.estimators_
+    assert recommender.update_model(X, y, checkpoint, n_trees=3, max_trees=52)
+    assert len(recommender.ml_model.estimators_) == 52 and len(serving_trees) == 50
+    assert recommender.artifacts.manifest()['metadata']['training_checkpoint'] == checkpoint
+
+    ledger.update('a1', {'status': 'rejected', 'updated_at': '2025-02-01T09:00:00'})
+    assert [r['id'] for r in events.since(ledger, checkpoint)] == ['a1']
+    assert events.since(ledger, events.checkpoint_after(events.since(ledger, checkpoint), checkpoint)) == []
+    assert not recommender.update_model(np.empty((0, X.shape[1])), np.empty(0))
+    reloaded = make_recommender()
+    assert reloaded.training_checkpoint == checkpoint and len(reloaded.ml_model.estimators_) == 52
+
+
+def test_full_refit_trains_on_serving_layout_rows_only(tmp_path, monkeypatch):
+    """retrain_from_outcomes --full fits the scaler on outcome rows, in the serving feature layout"""
+    import json
+    import numpy as np
+    import retrain_from_outcomes
+    from models.outcome_training import OutcomeEvents
+    from models.user import User
+    internships = json.load(open(os.path.join('data', 'internships.json')))[:12]
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('data')
+    users = {f'{i}@x.in': {'id': f'u{i}', 'profile': {'skills': ['Python'] * (i + 1), 'education': 'BTech',
+                                                       'location': 'Delhi', 'cgpa': 6 + i}} for i in range(3)}
+    applications = {email: [{'id': f'a{i}', 'internship_id': str(internships[i]['id']), 'status': status,
+                             'applied_at': f'2025-01-0{i + 1}T10:00:00'}]
+                    for i, (email, status) in enumerate(zip(users, ('accepted', 'rejected', 'applied')))}
+    for name, data in (('internships', internships), ('users', users), ('applications', applications)):
+        with open(os.path.join('data', f'{name}.json'), 'w') as f:
+            json.dump(data, f)
+
+    monkeypatch.setattr('sys.argv', ['retrain_from_outcomes.py', '--full', '--n-jobs', '1'])
+    retrain_from_outcomes.main()
+
+    recommender = AIInternshipRecommender()
+    user_manager = User()
+    events = OutcomeEvents(recommender, user_manager.load_users())
+    X, y = events.matrix(events.since(user_manager.ledger))
+    serving = np.concatenate([recommender._extract_candidate_features(users['0@x.in']['profile']),
+                              recommender.internship_ai_features[0]])
+    assert np.allclose(X[0], serving)
+    # Every training row came from the outcome events, so the scaler saw exactly their layout
+    assert np.allclose(recommender.scaler.mean_, X.mean(axis=0))
+    assert recommender.training_checkpoint['watermark'] == '2025-01-03T10:00:00'
+
+
+def test_compiled_forest_matches_sklearn(make_recommender):
+    """Flat-array traversal reproduces RandomForestRegressor.predict on scaled inputs"""
+    import numpy as np
+    from models.forest_inference import CompiledForest
+    recommender = make_recommender()
+    rng = np.random.default_rng(0)
+    candidates = np.column_stack([rng.integers(5000, 40000, 400), rng.integers(0, 10, 400), rng.integers(1, 6, 400),
+                                  rng.integers(0, 2, 400), rng.integers(0, 24, 400), rng.integers(0, 2, 400),
+                                  rng.integers(0, 5, 400), rng.uniform(5, 10, 400)])
+    internships = recommender.internship_ai_features[rng.integers(0, len(recommender.internships_data), 400)]
+    features = np.hstack([candidates, internships])
+
+    compiled = CompiledForest.from_sklearn(recommender.ml_model, recommender.scaler)
+    expected = recommender.ml_model.predict(recommender.scaler.transform(features))
+    assert len(compiled) == len(recommender.ml_model.estimators_)
+    assert np.allclose(compiled.predict(features), expected, rtol=0, atol=1e-9)
+    assert np.allclose(recommender.predict_scores(features), expected, rtol=0, atol=1e-9)
+    assert recommender.predict_scores(features[:0]).shape == (0,)
+
+
+def test_quota_index_masks_and_rural_exhaustion(make_recommender):
+    """Open reserved seats raise priority, never hide a posting with open seats"""
+    from models.quota_index import QuotaIndex, RESERVED_PRIORITY
+    internships = [
+        {'id': 1, 'opportunities': 10, 'filled_positions': 7,
+         'affirmative_action': {'rural_quota': 2, 'rural_filled': 1, 'sc_quota': 2}},
+        {'id': 2, 'opportunities': 5, 'filled_positions': 5},
+        {'id': 3, 'opportunities': 4, 'filled_positions': 0},
+    ]
+    index = QuotaIndex(internships)
+    general = {'social_category': 'General', 'district_type': 'Urban'}
+    rural = {'social_category': 'General', 'district_type': 'Rural'}
+    sc = {'social_category': 'sc', 'district_type': 'Urban'}
+
+    # Posting 1: 3 open seats, all covered by open rural and sc quotas, still open to General
+    assert index.select(general)[0].tolist() == [True, False, True]
+    assert index.select(general)[1].tolist() == [0, 0, 0]
+    assert index.select(rural)[1].tolist() == [RESERVED_PRIORITY, 0, 0]
+    assert index.select(sc)[1].tolist() == [RESERVED_PRIORITY, 0, RESERVED_PRIORITY]  # No declared quotas: flat priority
+
+    index.record_fill(0, ['rural'])
+    assert index.select(rural)[0].tolist() == [True, False, True]
+    assert index.select(rural)[1].tolist() == [0, 0, 0]  # Rural quota exhausted
+    assert index.select(sc)[1].tolist() == [RESERVED_PRIORITY, 0, RESERVED_PRIORITY]
+    assert index.available[0] == 2 and index.utilization[0] == 80
+
+    index.record_fill(0, [], delta=2)
+    assert index.select(sc)[0].tolist() == [False, False, True]  # No seats left at all
+
+    recommender = make_recommender()
+    candidate = {"skills": ["Python"], "education": "BTech", "sector": "Information Technology",
+                 "location": "Delhi", "social_category": "OBC", "district_type": "Rural"}
+    for record in recommender._available_internships(candidate):
+        row = recommender._catalog_positions[record['id']]
+        assert record['affirmative_action_priority'] == recommender.quota_index.select(candidate)[1][row]
+        assert record['available_positions'] > 0
+
+
+def test_score_records_match_dict_pipeline(make_recommender):
+    """Column-wise ScoreRecords scoring returns the same page as the per-stage dict path"""
+    from models.score_records import ScoreRecords
+    recommender = make_recommender(retrieval_limit=None)
+    candidate = {"skills": ["Python", "SQL"], "education": "BTech", "sector": "Information Technology",
+                 "location": "Bangalore", "social_category": "SC", "district_type": "Rural"}
+
+    eligible = recommender._apply_affirmative_action_filters(candidate)
+    available = recommender._check_capacity_constraints(eligible)
+    scored = recommender._ai_match_and_score(candidate, available)
+    expected = recommender._apply_diversity_adjustments(scored, candidate, limit=recommender.DIVERSITY_WINDOW)
+
+    ranked = recommender._score_and_rank(candidate)
+    assert isinstance(ranked['records'], ScoreRecords)  # The cached ranking holds arrays, not dicts
+    page = recommender._page_ranked(ranked, recommender.DIVERSITY_WINDOW, 0)
+    assert [r['id'] for r in page] == [r['id'] for r in expected]
+    for result, reference in zip(page, expected):
+        assert result == reference
+
+
+def test_feature_matrix_from_columnar_catalog_matches_dicts(make_recommender):
+    """Catalog feature matrices built from ColumnarCatalog columns equal the per-posting dict reads"""
+    import numpy as np
+    from models.columnar_catalog import ColumnarCatalog
+    recommender = make_recommender()
+    internships = [dict(internship) for internship in recommender.internships_data]
+    internships[0]['work_mode'] = 'Remote'
+    internships[1]['stipend_amount'] = 12000
+    catalog = ColumnarCatalog(internships)
+
+    expected = np.array([
+        [i.get('stipend_amount', 15000), len(i.get('skills_required', [])),
+         i.get('opportunities', 0) - i.get('filled_positions', 0), i.get('rating', 4.0),
+         1 if i.get('work_mode') == 'Remote' else 0, i.get('industry_capacity', 100)]
+        for i in internships
+    ], dtype=float)
+    assert np.array_equal(recommender._build_internship_feature_matrix(catalog), expected)
+    assert np.array_equal(recommender._build_internship_feature_matrix(internships), expected)
+    codes = recommender._build_rule_term_codes(catalog)
+    assert [codes['sector_values'][c] for c in codes['sector_codes']] == [i['sector'].lower() for i in internships]
+
+
+def test_synthetic_catalog_is_reproducible_and_servable(make_recommender):
+    """Synthetic catalogs reuse the sample layout, smaller sizes are prefixes of larger ones, and candidates can be served"""
+    from models.synthetic_catalog import SyntheticCatalog
+    sample = AIInternshipRecommender._create_enhanced_sample_data(None)
+    generator = SyntheticCatalog(sample, seed=3)
+    postings = list(generator.postings(250, chunk_rows=100))
+    assert [p['id'] for p in postings] == list(range(1, 251))
+    assert list(postings[0]) == list(sample[0])  # The sample catalog's full field layout
+    assert list(SyntheticCatalog(sample, seed=3).postings(120, chunk_rows=100)) == postings[:120]
+    assert generator.candidates(20) == SyntheticCatalog(sample, seed=3).candidates(20)
+
+    recommender = make_recommender()
+    recommender._prepare_data(postings)
+    for candidate in generator.candidates(5):
+        recommendations = recommender.get_ai_recommendations(candidate, k=3)
+        assert len(recommendations) == 3 and all(r['id'] <= 250 for r in recommendations)
+
+
 if __name__ == "__main__":
-    test_ai_recommender()
\ No newline at end of file
+    test_ai_recommender()
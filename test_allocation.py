@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script for the capacity- and quota-aware allocation engine
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from models.recommender import AIInternshipRecommender
+from models.allocation import AllocationEngine, SEAT_BUCKETS
+
+
+def _small_catalog():
+    """Two internships with few seats and reserved quotas"""
+    return [
+        {"id": 101, "title": "Backend Intern", "company": "A", "sector": "Information Technology",
+         "location": "Delhi", "skills_required": ["Python", "SQL"], "education_required": ["BTech"],
+         "description": "APIs", "opportunities": 3, "filled_positions": 0, "rating": 4.5,
+         "affirmative_action": {"sc_quota": 1, "rural_quota": 1}},
+        {"id": 102, "title": "Analyst Intern", "company": "B", "sector": "Finance",
+         "location": "Mumbai", "skills_required": ["Excel"], "education_required": ["MBA"],
+         "description": "Reports", "opportunities": 2, "filled_positions": 1, "rating": 4.0},
+    ]
+
+
+def test_allocation_respects_capacity_and_quotas(tmp_path):
+    """Seats per internship and reserved buckets are never exceeded"""
+    recommender = AIInternshipRecommender(artifact_dir=str(tmp_path / 'model'))
+    recommender._prepare_data(_small_catalog())
+
+    users = {}
+    for i in range(8):
+        users[f'user{i}@example.com'] = {
+            'id': f'u{i}',
+            'profile_complete': True,
+            'profile': {
+                'skills': ['Python', 'SQL'], 'education': 'BTech', 'sector': 'Information Technology',
+                'location': 'Delhi', 'social_category': 'SC' if i == 7 else 'General',
+                'district_type': 'Rural' if i == 6 else 'Urban'
+            }
+        }
+
+    result = AllocationEngine(recommender).run(users)
+    assignments = result['assignments']
+
+    # 3 + 1 available seats in total, so exactly four candidates are placed
+    assert len(assignments) == 4
+    assert len(result['unassigned']) == 4
+    per_internship = {}
+    for assignment in assignments:
+        per_internship[assignment['internship_id']] = per_internship.get(assignment['internship_id'], 0) + 1
+        assert assignment['seat_bucket'] in SEAT_BUCKETS
+    assert per_internship.get(101, 0) <= 3 and per_internship.get(102, 0) <= 1
+
+    # The SC and rural candidates hold the reserved seats of the contested internship
+    placed = {a['email']: a for a in assignments}
+    assert placed['user7@example.com']['internship_id'] == 101
+    assert placed['user7@example.com']['seat_bucket'] == 'sc'
+    assert placed['user6@example.com']['seat_bucket'] == 'rural'
+
+    report = result['report']
+    assert report['assigned'] == 4 and report['total_seats'] == 4
+    assert report['seat_buckets']['sc']['filled'] == 1
+
+
+def test_unfilled_reserved_seats_are_released(tmp_path):
+    """Reserved seats nobody eligible takes go back to the general pool"""
+    recommender = AIInternshipRecommender(artifact_dir=str(tmp_path / 'model'))
+    recommender._prepare_data(_small_catalog()[:1])
+
+    engine = AllocationEngine(recommender)
+    candidates = [{'skills': ['Python'], 'education': 'BTech', 'location': 'Delhi'} for _ in range(3)]
+    capacities = engine.seat_capacities()
+    indptr = np.array([0, 1, 2, 3])
+    rows = np.zeros(3, dtype=np.intp)
+    values = np.array([80.0, 70.0, 60.0])
+
+    solution = engine.solve(candidates, indptr, rows, values, capacities)
+    assert (solution['assigned_bucket'] >= 0).all()
+    assert solution['released_seats'].sum() == 2
+
+
+def test_seat_capacities_include_live_fills(tmp_path):
+    """Positions filled in the app are taken out of the allocatable seats, per bucket"""
+    import json
+    from models.capacity import CapacityTracker
+    from models.catalog import CatalogService
+    catalog_path = tmp_path / 'internships.json'
+    catalog_path.write_text(json.dumps(_small_catalog()))
+    capacity = CapacityTracker(path=str(tmp_path / 'capacity.json'))
+    recommender = AIInternshipRecommender(capacity=capacity, catalog=CatalogService(path=str(catalog_path)),
+                                          artifact_dir=str(tmp_path / 'model'))
+    engine = AllocationEngine(recommender)
+    assert engine.seat_capacities()[0].tolist() == [1, 1, 0, 0, 1]
+
+    capacity.fill('app1', 101, ['sc'])
+    assert capacity.filled(101) == {'sc': 1}
+    assert engine.seat_capacities()[0].tolist() == [1, 0, 0, 0, 1]
+
+
+def test_read_only_tracker_sees_app_fills_without_writing(tmp_path):
+    """Offline jobs read the app's counters through a read-only tracker and never rewrite them"""
+    import json
+    from models.capacity import CapacityTracker
+    from models.catalog import CatalogService
+    catalog_path = tmp_path / 'internships.json'
+    catalog_path.write_text(json.dumps(_small_catalog()))
+    catalog = CatalogService(path=str(catalog_path))
+    path = str(tmp_path / 'capacity.json')
+    app_capacity = CapacityTracker(path=path, catalog=catalog)
+    app_capacity.fill('app1', 101, ['sc'])
+    app_capacity.flush()
+    written = open(path).read()
+
+    capacity = CapacityTracker(path=path, catalog=catalog, read_only=True)
+    assert capacity.loaded and not capacity.writer and capacity.filled(101) == {'sc': 1}
+    recommender = AIInternshipRecommender(capacity=capacity, catalog=catalog, artifact_dir=str(tmp_path / 'model'))
+    assert AllocationEngine(recommender).seat_capacities()[0].tolist() == [1, 0, 0, 0, 1]
+    capacity.fill('app2', 101)
+    capacity.flush()
+    assert open(path).read() == written
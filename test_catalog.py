@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for the catalog service and the explore query engine
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from models.catalog import CatalogSnapshot
+from models.catalog_query import CatalogQuery
+
+
+def _catalog():
+    sectors = ['Information Technology', 'Finance', 'Design']
+    locations = ['Delhi', 'Mumbai', 'Remote', 'Pune']
+    return [
+        {'id': i, 'title': f'Intern {i}', 'company': f'Company {chr(ord("A") + (i * 7) % 26)}',
+         'sector': sectors[i % 3], 'location': locations[i % 4], 'duration': f'{3 + i % 4} months',
+         'stipend': f'₹{10000 + 1000 * i:,}/month', 'skills_required': ['Python'] if i % 2 else ['Excel'],
+         'rating': round(3.5 + (i % 5) * 0.3, 1), 'opportunities': 10}
+        for i in range(1, 31)
+    ]
+
+
+def test_filters_and_facets_match_a_linear_scan():
+    """Combined filters return what a scan over the catalog returns; facets exclude their own filter"""
+    internships = _catalog()
+    engine = CatalogQuery(CatalogSnapshot(internships, version=1))
+
+    page = engine.query(q='python', filters={'sector': ['finance', 'Design']}, min_stipend=15000,
+                        max_stipend=32000, sort='stipend', limit=100)
+    expected = [i for i in internships if 'Python' in i['skills_required'] and i['sector'] in ('Finance', 'Design')
+                and 15000 <= 10000 + 1000 * i['id'] <= 32000]
+    assert page['total'] == len(expected)
+    assert [i['id'] for i in page['internships']] == sorted((i['id'] for i in expected), reverse=True)
+
+    sector_counts = {facet['value']: facet['count'] for facet in page['facets']['sector']}
+    assert sector_counts['Information Technology'] == len(
+        [i for i in internships if 'Python' in i['skills_required'] and 15000 <= 10000 + 1000 * i['id'] <= 32000
+         and i['sector'] == 'Information Technology'])
+    assert sum(facet['count'] for facet in page['facets']['location']) == page['total']
+
+    with pytest.raises(ValueError):
+        engine.query(sort='popularity')
+
+
+@pytest.mark.parametrize('sort', CatalogQuery.SORTS)
+def test_cursor_pages_cover_the_full_ordering(sort):
+    """Following next_cursor visits every match exactly once, in sort order"""
+    engine = CatalogQuery(CatalogSnapshot(_catalog(), version=1))
+    full = [i['id'] for i in engine.query(filters={'location': ['Delhi', 'Remote']}, sort=sort, limit=100)['internships']]
+
+    paged, cursor = [], None
+    while True:
+        page = engine.query(filters={'location': ['Delhi', 'Remote']}, sort=sort, limit=4, cursor=cursor)
+        paged += [i['id'] for i in page['internships']]
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+    assert paged == full and len(full) == 15
+
+    # A cursor from an older snapshot resumes after the same internship
+    first = engine.query(sort=sort, limit=5)
+    reloaded = CatalogQuery(CatalogSnapshot([{'id': 0, 'title': 'New', 'company': 'Zeta'}] + _catalog(), version=2))
+    resumed = reloaded.query(sort=sort, limit=5, cursor=first['next_cursor'])
+    assert resumed['internships'][0]['id'] not in [i['id'] for i in first['internships']]
+
+
+def test_columnar_catalog_round_trips_and_scans_match_dicts():
+    """Row views equal the source dicts, untypeable fields fall back to object columns, and column scans match per-row reads"""
+    import numpy as np
+    from models.columnar_catalog import ColumnarCatalog, ObjectColumn, numeric_field, list_lengths, factorize_field
+    internships = _catalog()
+    internships[0]['rating'] = 4  # Mixed int / float column
+    internships[1]['opportunities'] = None
+    del internships[2]['skills_required']
+    internships[3]['work_mode'] = 'Remote'
+    internships.append({'id': 'odd', 'sector': ['not', 'hashable'], 'skills_required': 'not a list'})
+
+    catalog = ColumnarCatalog(internships)
+    assert len(catalog) == len(internships) and catalog.to_list() == internships
+    assert [list(row) for row in catalog] == [list(internship) for internship in internships]  # Key order kept
+    assert catalog[0]['rating'] == 4 and type(catalog[0]['rating']) is int
+    assert catalog[2].get('skills_required', 'absent') == 'absent' and 'skills_required' not in catalog[2]
+    assert catalog[-1] == internships[-1] and catalog[5].copy() == internships[5]
+    assert isinstance(catalog.column('sector'), ObjectColumn) and isinstance(catalog.column('skills_required'), ObjectColumn)
+
+    typed = ColumnarCatalog(internships[:-1])
+    for source in (typed, internships[:-1]):
+        assert np.array_equal(numeric_field(source, 'opportunities', 0),
+                              np.array([i.get('opportunities', 0) for i in internships[:-1]], dtype=float), equal_nan=True)
+        assert list_lengths(source, 'skills_required').tolist() == [len(i.get('skills_required', [])) for i in internships[:-1]]
+        values, codes = factorize_field(source, 'location', '', str.lower)
+        assert [values[code] for code in codes] == [i.get('location', '').lower() for i in internships[:-1]]
+
+    snapshot = CatalogSnapshot(internships[:-1], version=1)
+    assert snapshot.sectors == [i['sector'].lower() for i in internships[:-1]]
+    assert snapshot.skills == [[s.lower() for s in i.get('skills_required', [])] for i in internships[:-1]]
@@ -3,10 +3,10 @@
 Test script for the streamlined PM Internship recommendation system
 """
 
-from models.recommender import InternshipRecommender
+from models.recommender import AIInternshipRecommender
 
 def test_recommendations():
-    recommender = InternshipRecommender()
+    recommender = AIInternshipRecommender()
     
     # Test candidate data
     candidate_data = {
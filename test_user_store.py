@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Test script for the user store backends
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import pytest
+from models.user import User
+from models.user_store import JSONUserStore, JournalJSONUserStore, SQLiteUserStore
+
+
+@pytest.mark.parametrize('backend', User.BACKENDS)
+def test_user_api_is_backend_independent(tmp_path, monkeypatch, backend):
+    """Both backends behave the same through the User API"""
+    monkeypatch.chdir(tmp_path)
+    users = User(backend=backend)
+
+    assert users.create_user('a@example.com', 'pw', 'A')['success']
+    assert not users.create_user('a@example.com', 'pw', 'A')['success']
+    assert users.authenticate_user('a@example.com', 'pw')['success']
+    assert users.authenticate_user('a@example.com', 'bad')['error'] == 'Invalid password'
+
+    updates = []
+    users.on_profile_update(lambda email, previous, profile: updates.append((email, previous, profile)))
+    users.update_profile('a@example.com', {'skills': ['Python']})
+    assert users.get_user('a@example.com')['profile_complete']
+    users.update_profile('a@example.com', {'skills': ['SQL']})
+    assert updates == [('a@example.com', {}, {'skills': ['Python']}),
+                       ('a@example.com', {'skills': ['Python']}, {'skills': ['SQL']})]
+
+    applied = users.apply_to_internship('a@example.com', 3, 'Data Analysis Intern')
+    assert applied['success']
+    assert not users.apply_to_internship('a@example.com', 3, 'Data Analysis Intern')['success']
+    assert users.save_internship('a@example.com', 4, 'Content Writing Intern')['success']
+    assert not users.save_internship('a@example.com', 4, 'Content Writing Intern')['success']
+
+    application_id = applied['application']['id']
+    assert users.update_application_status('a@example.com', application_id, 'shortlisted')['success']
+    assert not users.update_application_status('a@example.com', 'missing', 'shortlisted')['success']
+    assert [app['status'] for app in users.get_user_applications('a@example.com')] == ['shortlisted', 'saved']
+    assert list(users.load_users()) == ['a@example.com']
+
+
+def test_json_to_sqlite_migration(tmp_path):
+    """Both applications.json shapes are imported and attached to their users"""
+    users_file, applications_file = tmp_path / 'users.json', tmp_path / 'applications.json'
+    users_file.write_text(json.dumps({'a@example.com': {'id': 'u1', 'email': 'a@example.com', 'password': 'pw'}}))
+    applications_file.write_text(json.dumps({
+        'a@example.com': [{'id': 'x1', 'internship_id': 1, 'status': 'applied'}],
+        'app-001': {'id': 'app-001', 'user_id': 'u1', 'internship_id': 2, 'status': 'interviewed'},
+        'app-002': {'id': 'app-002', 'user_id': 'nobody', 'internship_id': 3, 'status': 'applied'}
+    }))
+
+    store = SQLiteUserStore(str(tmp_path / 'users.db'))
+    counts = store.migrate_from_json(JSONUserStore(str(users_file), str(applications_file)))
+    assert counts == {'users': 1, 'applications': 2, 'skipped_applications': 1}
+    assert store.get_user('a@example.com')['id'] == 'u1'
+    assert [app['id'] for app in store.get_applications('a@example.com')] == ['x1', 'app-001']
+    assert store.find_application('a@example.com', 2)['status'] == 'interviewed'
+
+    with pytest.raises(ValueError):
+        store.migrate_from_json(JSONUserStore(str(users_file), str(applications_file)))
+
+
+def test_journal_replay_and_compaction(tmp_path):
+    """Journaled writes survive a restart, a torn last line is dropped and compaction rewrites the files"""
+    paths = dict(users_file=str(tmp_path / 'users.json'), applications_file=str(tmp_path / 'applications.json'),
+                 journal_file=str(tmp_path / 'users.journal'))
+    store = JournalJSONUserStore(**paths)
+    store.add_user('a@example.com', {'id': 'u1', 'name': 'A'})
+    store.add_application('a@example.com', {'id': 'x1', 'internship_id': 1, 'status': 'applied'})
+    store.update_application('a@example.com', 'x1', {'status': 'saved'})
+    store.close()
+    assert json.loads((tmp_path / 'users.json').read_text()) == {}
+
+    with open(paths['journal_file'], 'a') as f:
+        f.write('{"op": "user", "email": "torn')
+    store = JournalJSONUserStore(**paths)
+    assert store.get_user('a@example.com')['name'] == 'A'
+    assert [app['status'] for app in store.get_applications('a@example.com')] == ['saved']
+    store.add_user('b@example.com', {'id': 'u2', 'name': 'B'})
+
+    store.compact()
+    store.close()
+    assert set(json.loads((tmp_path / 'users.json').read_text())) == {'a@example.com', 'b@example.com'}
+    assert json.loads((tmp_path / 'applications.json').read_text())['a@example.com'][0]['status'] == 'saved'
+    assert os.path.getsize(paths['journal_file']) == 0
+    assert not os.path.exists(paths['journal_file'] + '.compacting')
+
+    # A small threshold compacts in the background as writes arrive
+    store = JournalJSONUserStore(compact_bytes=200, **paths)
+    for i in range(20):
+        store.add_user(f'user{i}@example.com', {'id': f'n{i}'})
+    store.close()
+    reopened = JournalJSONUserStore(**paths)
+    assert len(reopened.load_users()) == 22
+    reopened.close()
+
+
+@pytest.mark.parametrize('backend', User.BACKENDS)
+def test_application_ledger_indexes(tmp_path, monkeypatch, backend):
+    """Both applications.json shapes are looked up by user, internship and status"""
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('data')
+    with open('data/users.json', 'w') as f:
+        json.dump({'a@example.com': {'id': 'u1', 'email': 'a@example.com', 'password': 'pw'},
+                   'b@example.com': {'id': 'u2', 'email': 'b@example.com', 'password': 'pw'}}, f)
+    with open('data/applications.json', 'w') as f:
+        json.dump({'app-001': {'id': 'app-001', 'user_id': 'u1', 'internship_id': 1, 'status': 'interviewed',
+                               'applied_date': '2025-09-15T10:30:00'}}, f)
+    if backend == 'sqlite':
+        SQLiteUserStore('data/users.db').migrate_from_json(JSONUserStore())
+
+    users = User(backend=backend)
+    legacy = users.get_user_applications('a@example.com')
+    assert [(app['id'], app['email'], app['applied_at']) for app in legacy] == [('app-001', 'a@example.com', '2025-09-15T10:30:00')]
+
+    # Form posts send ids as strings; they collide with the catalog's integer ids
+    assert not users.apply_to_internship('a@example.com', '1', 'AI/ML Engineer Intern')['success']
+    assert users.apply_to_internship('b@example.com', '1', 'AI/ML Engineer Intern')['success']
+    assert users.save_internship('b@example.com', 2, 'Other Intern')['success']
+    assert users.count_internship_applications(1) == 2
+    assert users.count_internship_applications(1, status='applied') == 1
+    assert [app['email'] for app in users.get_internship_applications('1', status='interviewed')] == ['a@example.com']
+    assert users.ledger.status_counts() == {'interviewed': 1, 'applied': 1, 'saved': 1}
+
+    # Status transitions on the legacy record are persisted in place
+    assert users.update_application_status('a@example.com', 'app-001', 'selected')['success']
+    assert not users.update_application_status('b@example.com', 'app-001', 'selected')['success']
+    assert users.ledger.with_status('selected')[0]['id'] == 'app-001'
+    if backend == 'journal':
+        users.store.close()
+    reloaded = User(backend=backend)
+    assert reloaded.get_user_applications('a@example.com')[0]['status'] == 'selected'
+    assert reloaded.count_internship_applications(1) == 2
+
+    if backend == 'sqlite':
+        # Another worker sees applications written after both started
+        applied = users.apply_to_internship('a@example.com', 5, 'Marketing Intern')['application']
+        assert not reloaded.apply_to_internship('a@example.com', '5', 'Marketing Intern')['success']
+        assert reloaded.update_application_status('a@example.com', applied['id'], 'shortlisted')['success']
+        assert users.get_internship_applications(5)[0]['status'] == 'shortlisted'
+
+
+def test_capacity_tracker_counts_applications_and_fills(tmp_path, monkeypatch):
+    """Accepting an application fills a seat in the recommender's live capacity arrays"""
+    from models.capacity import CapacityTracker
+    from models.recommender import AIInternshipRecommender
+    internships = json.load(open(os.path.join('data', 'internships.json')))[:12]
+    internships[0].update({'opportunities': 2, 'filled_positions': 1, 'affirmative_action': {'sc_quota': 1}})
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('data')
+    with open(os.path.join('data', 'internships.json'), 'w') as f:
+        json.dump(internships, f)
+
+    capacity = CapacityTracker(flush_every=1)
+    recommender = AIInternshipRecommender(capacity=capacity)
+    users = User(capacity=capacity)
+    candidate = {'skills': ['Python'], 'education': 'BTech', 'location': 'Delhi', 'social_category': 'SC'}
+    users.create_user('a@example.com', 'pw', 'A')
+    users.update_profile('a@example.com', candidate)
+    internship_id = internships[0]['id']
+
+    application = users.apply_to_internship('a@example.com', str(internship_id), 'Intern')['application']
+    assert capacity.applications(internship_id) == 1 and capacity.filled(internship_id) == {}
+    general_mask, general_priority = recommender.quota_index.select({'social_category': 'General'})
+    assert general_mask[0] and general_priority[0] == 0  # The reserved SC seat only ranks SC candidates first
+    assert recommender.quota_index.select(candidate)[1][0] > 0
+
+    users.update_application_status('a@example.com', application['id'], 'accepted')
+    assert capacity.filled(internship_id) == {'sc': 1}
+    assert recommender.quota_index.available[0] == 0
+    # The model's available-positions feature follows the live count, not the catalog's
+    import numpy as np
+    assert recommender.internship_ai_features[0, recommender.AVAILABLE_FEATURE] == 1
+    assert recommender._internship_feature_rows(np.array([0, 1]), None)[0, recommender.AVAILABLE_FEATURE] == 0
+    assert internship_id not in [r['id'] for r in recommender._available_internships(candidate)]
+
+    reloaded = CapacityTracker()
+    assert reloaded.loaded and reloaded.filled(internship_id) == {'sc': 1} and reloaded.applications(internship_id) == 1
+    assert AIInternshipRecommender(capacity=reloaded).quota_index.available[0] == 0
+
+    users.update_application_status('a@example.com', application['id'], 'withdrawn')
+    assert capacity.filled(internship_id) == {'sc': 0} and recommender.quota_index.available[0] == 1
+    assert internship_id in [r['id'] for r in recommender._available_internships(candidate)]
+
+
+def test_capacity_seeded_before_recommender_uses_catalog_quotas(tmp_path, monkeypatch):
+    """Seeding needs no recommender: reserved fills take their bucket from the catalog's quotas"""
+    from models.capacity import CapacityTracker
+    from models.catalog import CatalogService
+    from models.recommender import AIInternshipRecommender
+    internships = json.load(open(os.path.join('data', 'internships.json')))[:12]
+    internships[0].update({'opportunities': 3, 'filled_positions': 0, 'affirmative_action': {'sc_quota': 1}})
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('data')
+    with open(os.path.join('data', 'internships.json'), 'w') as f:
+        json.dump(internships, f)
+    internship_id = internships[0]['id']
+    applications = [{'id': f'app{i}', 'email': f'{i}@example.com', 'internship_id': str(internship_id), 'status': 'accepted'}
+                    for i in range(2)]
+    profiles = {f'{i}@example.com': {'profile': {'social_category': 'SC'}} for i in range(2)}
+
+    catalog = CatalogService()
+    capacity = CapacityTracker(catalog=catalog)
+    capacity.seed(applications, profiles)
+    assert capacity.filled(internship_id) == {'sc': 1, 'general': 1}  # One SC seat, then general
+
+    recommender = AIInternshipRecommender(capacity=capacity, catalog=catalog)
+    assert recommender.quota_index.available[0] == 1 and recommender.quota_index.open_seats(0, 'sc') == 0
+
+    # A second tracker on the same file reads it but leaves flushing to the owner
+    assert capacity.writer and not CapacityTracker().writer
+
+
+def test_capacity_flush_failure_keeps_changes_pending(tmp_path, monkeypatch):
+    """A failed write leaves the changes marked unsaved, and the next flush writes them"""
+    from models import capacity as capacity_module
+    from models.capacity import CapacityTracker
+    path = tmp_path / 'capacity.json'
+    capacity = CapacityTracker(path=str(path), flush_every=100)
+    capacity.record_application(1)
+    capacity.flush()
+    assert json.loads(path.read_text())['applications'] == {'1': 1}
+
+    capacity.record_application(1)
+    real_replace = capacity_module.os.replace
+    def failing_replace(src, dst):
+        raise OSError('disk full')
+    monkeypatch.setattr(capacity_module.os, 'replace', failing_replace)
+    capacity.flush()
+    assert json.loads(path.read_text())['applications'] == {'1': 1} and capacity._dirty == 1
+
+    monkeypatch.setattr(capacity_module.os, 'replace', real_replace)
+    capacity.flush()
+    assert json.loads(path.read_text())['applications'] == {'1': 2} and capacity._dirty == 0
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Train the match model on a large synthetic training set
+
+Generates N candidate x internship rows in vectorized, seeded chunks into a columnar dataset
+directory (one .npy per column), then fits the RandomForest on all cores and publishes it as
+a new model artifact. An existing dataset with the same size and seed is reused.
+
+Usage:
+    python train_model.py [--rows 1000000] [--seed 42] [--n-jobs -1] [--max-samples 0.1] [--min-samples-leaf 20]
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+
+from models.recommender import AIInternshipRecommender
+from models.training_data import SyntheticTrainingData
+
+
+def peak_memory_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def dataset_matches(path: str, rows: int, seed: int, chunk_rows: int) -> bool:
+    try:
+        with open(os.path.join(path, 'manifest.json'), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return (manifest.get('rows'), manifest.get('seed'), manifest.get('chunk_rows')) == (rows, seed, chunk_rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic training data and retrain the match model')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Synthetic training rows')
+    parser.add_argument('--seed', type=int, default=AIInternshipRecommender.TRAINING_SEED, help='Generator seed')
+    parser.add_argument('--chunk-rows', type=int, default=1_000_000, help='Rows generated per chunk')
+    parser.add_argument('--dataset', default=os.path.join('data', 'training'), help='Columnar dataset directory')
+    parser.add_argument('--regenerate', action='store_true', help='Regenerate the dataset even if it matches')
+    parser.add_argument('--n-jobs', type=int, default=-1, help='Training processes/threads (-1: all cores)')
+    parser.add_argument('--n-estimators', type=int, default=50, help='Trees in the forest')
+    parser.add_argument('--max-samples', type=float, default=None, help='Fraction of rows bootstrapped per tree')
+    parser.add_argument('--min-samples-leaf', type=int, default=20,
+                        help='Smallest leaf; bounds tree size (and the artifact) on large training sets')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    recommender = AIInternshipRecommender()
+    load_seconds = time.perf_counter() - started
+
+    generate_started = time.perf_counter()
+    if args.regenerate or not dataset_matches(args.dataset, args.rows, args.seed, args.chunk_rows):
+        generator = SyntheticTrainingData(recommender.internships_data, seed=args.seed, chunk_rows=args.chunk_rows)
+        generator.write(args.dataset, args.rows)
+        action = 'Generated'
+    else:
+        action = 'Reused'
+    X_train, y_train = SyntheticTrainingData.load(args.dataset)
+    generate_seconds = time.perf_counter() - generate_started
+    print(f"{action} {len(X_train):,} training rows in {args.dataset} ({generate_seconds:.2f}s)")
+
+    recommender.TRAINING_JOBS = args.n_jobs
+    train_started = time.perf_counter()
+    recommender.train_model(X_train, y_train, n_estimators=args.n_estimators, max_samples=args.max_samples,
+                            min_samples_leaf=args.min_samples_leaf)
+    train_seconds = time.perf_counter() - train_started
+
+    total_seconds = time.perf_counter() - started
+    rows_per_second = len(X_train) / train_seconds if train_seconds > 0 else 0
+    print(f"Trained {args.n_estimators} trees with n_jobs={args.n_jobs}: model version {recommender.model_version}")
+    print(f"Model load {load_seconds:.2f}s, data {generate_seconds:.2f}s, training {train_seconds:.2f}s, total {total_seconds:.2f}s")
+    print(f"Training throughput: {rows_per_second:,.0f} rows/second")
+    print(f"Peak memory: {peak_memory_mb():.0f} MB")
+
+
+if __name__ == '__main__':
+    main()